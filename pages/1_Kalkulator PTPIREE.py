@@ -1,8 +1,16 @@
 import streamlit as st
-import pandas as pd
 import datetime
-import io
+import os
+import zipfile
+from src.core.config import PROJECT_ROOT, get_config_value
 from src.ui.components import setup_page, success_box, display_footer
+from src.ptpiree import (
+    ingest_files, ingest_stream, get_channel, get_profile_cache, downsample_minmax, ProfileStore,
+    list_directory, list_subdirectories, iter_directory, list_zip, iter_zip
+)
+from src.ptpiree.export import build_summary_workbook, build_profiles_workbook, SUMMARY_TITLES
+from src.core.shared import XLSX_MIME
+from src.ptpiree.archive import save_parsed, load_parsed, archive_points
 
 # Konfiguracja strony
 setup_page()
@@ -17,280 +25,264 @@ if "uploader_key" not in st.session_state:
     st.session_state.uploader_key = 0
 
 # Dodanie zmiennej do przechowywania profili
-if "file_profiles" not in st.session_state:
-    st.session_state.file_profiles = {}
+if "profile_store" not in st.session_state:
+    st.session_state.profile_store = ProfileStore()
 
 st.markdown("""<div style='text-align: center; padding: 1rem; border-radius: 5px; margin-bottom: 2rem;'><h1>Kalkulator PTPIRE</h1><p>Narzędzie do analizy plików pomiarowych</p></div>""", unsafe_allow_html=True)
 
 st.subheader("Wgraj pliki PTPIRE")
 
-uploaded_files = st.file_uploader("Wybierz pliki tekstowe", type="dat", accept_multiple_files=True, key=f"uploader_{st.session_state.uploader_key}")
+SOURCE_UPLOAD = "Pliki z komputera"
+SOURCE_ZIP = "Archiwum ZIP"
+SOURCE_DIRECTORY = "Katalog na serwerze"
+SOURCE_ARCHIVE = "Archiwum profili"
+source = st.radio("Źródło plików", [SOURCE_UPLOAD, SOURCE_ZIP, SOURCE_DIRECTORY, SOURCE_ARCHIVE], horizontal=True, key="ptpiree_source")
+
+uploaded_files = []
+if source == SOURCE_UPLOAD:
+    uploaded_files = st.file_uploader("Wybierz pliki tekstowe", type="dat", accept_multiple_files=True, key=f"uploader_{st.session_state.uploader_key}")
+elif source == SOURCE_ZIP:
+    archive_file = st.file_uploader("Wybierz archiwum ZIP z plikami .dat", type="zip", key=f"archive_{st.session_state.uploader_key}")
+elif source == SOURCE_DIRECTORY:
+    # Wybór ograniczony do katalogu wejściowego zamontowanego na serwerze i jego podkatalogów
+    input_root = get_config_value("PTPIREE_INPUT_DIR", os.path.join(PROJECT_ROOT, "input"))
+    input_dir = st.selectbox(f"Katalog z plikami .dat (względem {input_root})", list_subdirectories(input_root))
+else:
+    # Profile zapisane wcześniej są odczytywane z archiwum bez ponownego parsowania plików .dat
+    archive_point_options = archive_points()
+    archive_selected_points = st.multiselect("Punkty pomiarowe (puste oznacza wszystkie)", archive_point_options)
+    archive_range = st.date_input("Zakres dat profili", value=())
+
+with st.expander("Ustawienia przetwarzania"):
+    max_workers = os.cpu_count() or 1
+    workers = st.number_input(
+        "Liczba procesów przetwarzających pliki",
+        min_value=1,
+        max_value=max_workers,
+        value=min(get_config_value("PTPIREE_WORKERS", 1), max_workers),
+        help="Dla dużych paczek plików parsowanie jest rozdzielane na kilka procesów."
+    )
+    incremental = st.toggle(
+        "Tryb przyrostowy",
+        key="incremental_mode",
+        help="Kolejne wgrane paczki plików są dołączane do już przetworzonych danych. "
+             "Pliki o identycznej zawartości są pomijane."
+    )
+    chart_points = st.number_input(
+        "Maksymalna liczba punktów wykresu profilu",
+        min_value=0,
+        value=get_config_value("PTPIREE_CHART_POINTS", 200),
+        step=50,
+        help="Długie profile są pokazywane w uproszczeniu z zachowaniem wartości minimalnych "
+             "i maksymalnych. 0 oznacza wyświetlanie wszystkich wartości."
+    )
+    archive_enabled = st.toggle(
+        "Zapisuj profile w archiwum",
+        key="archive_mode",
+        help="Sparsowane profile są zapisywane w archiwum Parquet na serwerze "
+             "i mogą być później wczytane bez ponownego wgrywania plików."
+    )
 
 def update_key():
     st.session_state.uploader_key += 1
     # Reset profili przy czyszczeniu danych
-    st.session_state.file_profiles = {}
-
-def group_files_by_name(files):
-    grouped_files = {}
-    for file in files:
-        name = file.name.split("_2")[0]
-        if name not in grouped_files:
-            grouped_files[name] = []
-        grouped_files[name].append(file)
-    return grouped_files
-
-def get_profile_from_file(file):
-    content = file.read().decode("utf-8")
-    lines = content.split("\n")
-    profile = []
-    for line in lines[6:-2]:
-        try:
-            profile.append(float(line.strip()[:-2]))
-        except ValueError:
-            continue
-    return profile
+    st.session_state.profile_store = ProfileStore()
 
-def get_profile_date(file):
-    content = file.read().decode("utf-8")
-    lines = content.split("\n")
-    try:
-        profile_date = lines[4].strip()
-    except (IndexError, ValueError):
-        profile_date = None
-    return profile_date
+# --- JEDNOKROTNY ODCZYT I PARSOWANIE PLIKÓW ---
+files_to_parse = [(f.name, f.getvalue()) for f in uploaded_files if get_channel(f.name) in ("CP", "CO")]
+progress_bar = st.empty()
 
-def convert_to_hourly(profile):
-    hourly_profile = []
-    for i in range(0, len(profile), 4):
-        hourly_sum = sum(profile[i:i+4])
-        hourly_profile.append(hourly_sum)
-    return hourly_profile
+def update_progress(done, total):
+    progress_bar.progress(done / total, text=f"Przetworzono {done} z {total} plików")
 
-# --- ROZDZIELENIE PLIKÓW NA DWIE GRUPY ---
-cp_files = [f for f in uploaded_files if '_CP_' in f.name and '_CPP_' not in f.name]
-co_files = [f for f in uploaded_files if '_CO_' in f.name and '_CPP_' not in f.name]
+# Pliki o niezmienionej zawartości są pobierane z pamięci podręcznej bez ponownego parsowania
+parsed_files = ingest_files(files_to_parse, workers=workers, progress_callback=update_progress, cache=get_profile_cache())
+progress_bar.empty()
 
-def process_files(files):
-    grouped_files = group_files_by_name(files)
-    data = {"Lp": [], "Nazwa": [], "Data": [], "Suma": [], "Pliki": [], "Profil": []}
-    lp = 0
-    for name, files in grouped_files.items():
-        total_sum = 0
-        counter = 0
-        profile = []
-        lp += 1
-        for uploaded_file in files:
-            uploaded_file.seek(0)
-            file_profile = get_profile_from_file(uploaded_file)
-            uploaded_file.seek(0)
-            profile_date = get_profile_date(uploaded_file)
-            if len(file_profile) > 25:
-                file_profile = convert_to_hourly(file_profile)
-            file_key = f"{name}_{counter+1}"
-            st.session_state.file_profiles[file_key] = {
-                "profile": file_profile,
-                "date": profile_date
-            }
-            total_sum += sum(file_profile)
-            profile.extend(file_profile)
-            counter += 1
-        data["Lp"].append(lp)
-        data["Nazwa"].append(name)
-        data["Data"].append(profile_date)
-        data["Suma"].append(total_sum)
-        data["Pliki"].append(counter)
-        data["Profil"].append(profile)
-    return pd.DataFrame(data)
+# Pliki ze źródła strumieniowego są parsowane paczkami i dołączane do magazynu
+def ingest_source(source_files, store, total):
+    added = ingest_stream(
+        source_files,
+        store,
+        skip_duplicates=incremental,
+        workers=workers,
+        progress_callback=update_progress,
+        total=total,
+        cache=get_profile_cache(),
+        batch_callback=save_parsed if archive_enabled else None
+    )
+    progress_bar.empty()
+    return added
 
 # --- PRZETWARZANIE DANYCH DLA OBU GRUP ---
-df_cp = process_files(cp_files)
-df_co = process_files(co_files)
+if source != SOURCE_UPLOAD:
+    # Pliki z archiwum lub katalogu są odczytywane paczkami i od razu dołączane do magazynu
+    if source == SOURCE_ZIP:
+        source_ready = archive_file is not None
+    elif source == SOURCE_DIRECTORY:
+        source_ready = input_dir is not None
+    else:
+        source_ready = bool(archive_point_options)
+    if st.button("Wczytaj pliki", disabled=not source_ready):
+        store = st.session_state.profile_store if incremental else ProfileStore()
+        if source == SOURCE_ARCHIVE:
+            date_from = archive_range[0] if len(archive_range) > 0 else None
+            date_to = archive_range[1] if len(archive_range) > 1 else date_from
+            archived_files = load_parsed(
+                points=archive_selected_points or None,
+                channels=("CP", "CO"),
+                date_from=date_from,
+                date_to=date_to
+            )
+            total = len(archived_files)
+            added = store.append(archived_files, skip_duplicates=incremental)
+        elif source == SOURCE_ZIP:
+            with zipfile.ZipFile(archive_file) as archive:
+                members = list_zip(archive, channels=("CP", "CO"))
+                total = len(members)
+                added = ingest_source(iter_zip(archive, members), store, total)
+        else:
+            paths = list_directory(os.path.join(input_root, input_dir), channels=("CP", "CO"))
+            total = len(paths)
+            added = ingest_source(iter_directory(paths), store, total)
+        st.session_state.profile_store = store
+        st.session_state.source_loads = st.session_state.get("source_loads", 0) + 1
+        success_box(f"Wczytano {added} plików z {total} znalezionych.")
+    st.session_state.df_cp = st.session_state.profile_store.summary("CP")
+    st.session_state.df_co = st.session_state.profile_store.summary("CO")
+    batch_signature = ("source", st.session_state.get("source_loads", 0), len(st.session_state.profile_store))
+    st.session_state.batch_signature = batch_signature
+elif incremental:
+    # Nowa paczka jest dołączana do magazynu, a pole wgrywania czyszczone na kolejną paczkę
+    if parsed_files:
+        added = st.session_state.profile_store.append(parsed_files)
+        if archive_enabled:
+            save_parsed(parsed_files)
+        st.session_state.incremental_message = (
+            f"Dołączono {added} nowych plików, pominięto {len(parsed_files) - added} duplikatów."
+        )
+        st.session_state.uploader_key += 1
+        st.rerun()
+    if "incremental_message" in st.session_state:
+        success_box(st.session_state.pop("incremental_message"))
+    # Agregaty grup są aktualizowane przy dołączaniu, więc zestawienie nie przelicza profili
+    st.session_state.df_cp = st.session_state.profile_store.summary("CP")
+    st.session_state.df_co = st.session_state.profile_store.summary("CO")
+    # Magazyn tylko przyrasta, więc liczba plików wyznacza aktualność eksportów
+    batch_signature = ("incremental", len(st.session_state.profile_store))
+    st.session_state.batch_signature = batch_signature
+else:
+    # Magazyn profili i agregaty są przeliczane tylko wtedy, gdy zmienił się zestaw wgranych plików.
+    # Puste pole wgrywania (np. po wyłączeniu trybu przyrostowego lub powrocie z innego źródła)
+    # nie zastępuje wczytanych wcześniej danych - do ich usunięcia służy przycisk czyszczenia.
+    upload_signature = tuple((f.name, f.content_hash) for f in parsed_files)
+    if parsed_files and st.session_state.get("batch_signature") != upload_signature:
+        st.session_state.profile_store = ProfileStore.from_parsed(parsed_files)
+        if archive_enabled:
+            save_parsed(parsed_files)
+        st.session_state.df_cp = st.session_state.profile_store.summary("CP")
+        st.session_state.df_co = st.session_state.profile_store.summary("CO")
+        st.session_state.batch_signature = upload_signature
+    elif "batch_signature" not in st.session_state:
+        st.session_state.df_cp = st.session_state.profile_store.summary("CP")
+        st.session_state.df_co = st.session_state.profile_store.summary("CO")
+        st.session_state.batch_signature = upload_signature
+    batch_signature = st.session_state.batch_signature
+profile_store = st.session_state.profile_store
+df_cp = st.session_state.df_cp
+df_co = st.session_state.df_co
 
 # --- WYŚWIETLANIE TABEL ---
-if not df_cp.empty:
-    st.markdown("<h3 style='text-align:center;'>Energia czynna pobrana</h3>", unsafe_allow_html=True)
+def display_summary(df, channel):
+    df_display = df.assign(Profil=[
+        downsample_minmax(profile_store.group_profile(channel, name), chart_points).tolist() for name in df["Nazwa"]
+    ])
     st.dataframe(
-        df_cp.style.format({"Suma": "{:.3f}"}),
+        df_display.style.format({"Suma": "{:.3f}"}),
         column_config={
             "Profil": st.column_config.BarChartColumn(
                 "Profil",
                 y_min=0,
-                y_max=df_cp["Profil"].apply(lambda x: max(x)).max() if not df_cp.empty else 0
+                y_max=profile_store.channel_max(channel)
             )
         },
         use_container_width=True,
         hide_index=True
     )
 
+if not df_cp.empty:
+    st.markdown("<h3 style='text-align:center;'>Energia czynna pobrana</h3>", unsafe_allow_html=True)
+    display_summary(df_cp, "CP")
+
 if not df_co.empty:
     st.markdown("<h3 style='text-align:center;'>Energia czynna oddana</h3>", unsafe_allow_html=True)
-    st.dataframe(
-        df_co.style.format({"Suma": "{:.3f}"}),
-        column_config={
-            "Profil": st.column_config.BarChartColumn(
-                "Profil",
-                y_min=0,
-                y_max=df_co["Profil"].apply(lambda x: max(x)).max() if not df_co.empty else 0
-            )
-        },
-        use_container_width=True,
-        hide_index=True
+    display_summary(df_co, "CO")
+
+if len(profile_store.unmapped):
+    st.warning(
+        f"Liczba wartości w {len(profile_store.unmapped)} plikach nie odpowiada długości doby "
+        "(23, 24 lub 25 godzin z uwzględnieniem zmiany czasu). Sprawdź poniższe pliki."
+    )
+    st.dataframe(profile_store.unmapped_report(), use_container_width=True, hide_index=True)
+
+# Plik jest generowany dopiero po kliknięciu "Przygotuj" i używany ponownie,
+# dopóki nie zmieni się zestaw wgranych plików
+def lazy_download_button(export_key, label, file_prefix, build):
+    exports = st.session_state.setdefault("exports", {})
+    export = exports.get(export_key)
+    if export is None or export["signature"] != batch_signature:
+        if not st.button(label.replace("Pobierz", "Przygotuj", 1), key=f"prepare-{export_key}"):
+            return
+        with st.spinner("Generowanie pliku..."):
+            now = datetime.datetime.now()
+            export = {
+                "signature": batch_signature,
+                "data": build(),
+                "file_name": f"{file_prefix}_{now.strftime('%Y%m%d_%H%M%S')}.xlsx"
+            }
+        exports[export_key] = export
+    st.download_button(
+        label,
+        export["data"],
+        export["file_name"],
+        XLSX_MIME,
+        key=f"download-{export_key}"
     )
 
 # --- EKSPORT DO EXCELA DLA ENERGII CZYNNEJ POBRANEJ (CP) ---
 if not df_cp.empty:
-    df_to_excel_cp = df_cp.copy().drop('Profil', axis=1)
-    output_cp = io.BytesIO()
-    with pd.ExcelWriter(output_cp, engine='openpyxl') as writer:
-        writer.sheets['Sheet1'] = writer.book.create_sheet('Sheet1')
-        cell = writer.sheets['Sheet1'].cell(row=1, column=2, value="Raport ilości plików PTPiREE - Energia czynna pobrana")
-        from openpyxl.styles import Font, numbers
-        cell.font = Font(size=14, bold=True)
-        df_to_excel_cp.to_excel(writer, sheet_name='Sheet1', index=False, startrow=2)
-        ws = writer.sheets['Sheet1']
-        suma_col = None
-        for idx, col in enumerate(df_to_excel_cp.columns, 1):
-            if col == 'Suma':
-                suma_col = idx
-                break
-        if suma_col:
-            for row in range(4, len(df_to_excel_cp) + 4):
-                cell = ws.cell(row=row, column=suma_col)
-                cell.number_format = '0.000'
-            last_row = len(df_to_excel_cp) + 5
-            ws.cell(row=last_row, column=2, value="Ilość plików sumarycznie")
-            total_files_cell = ws.cell(row=last_row, column=3, value=int(df_to_excel_cp['Pliki'].sum()))
-            total_files_cell.number_format = '0'
-            ws.cell(row=last_row + 1, column=2, value="Całkowity wolumen")
-            total_sum_cell = ws.cell(row=last_row + 1, column=3, value=float(df_to_excel_cp['Suma'].sum()))
-            total_sum_cell.number_format = '0.000'
-            ws.cell(row=last_row + 2, column=2, value="Data wykonania raportu")
-            date_cell = ws.cell(row=last_row + 2, column=3, value=datetime.datetime.now())
-            date_cell.number_format = 'YYYY-MM-DD HH:MM:SS'
-    now = datetime.datetime.now()
-    output_cp.seek(0)
-    st.download_button(
+    lazy_download_button(
+        "excel-cp",
         "Pobierz plik xlsx (Energia czynna pobrana)",
-        output_cp,
-        f"ptpire_CP_{now.strftime('%Y%m%d_%H%M%S')}.xlsx",
-        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        key='download-excel-cp'
+        "ptpire_CP",
+        lambda: build_summary_workbook(df_cp, SUMMARY_TITLES["CP"])
     )
 
 # --- EKSPORT DO EXCELA DLA ENERGII CZYNNEJ ODDANEJ (CO) ---
 if not df_co.empty:
-    df_to_excel_co = df_co.copy().drop('Profil', axis=1)
-    output_co = io.BytesIO()
-    with pd.ExcelWriter(output_co, engine='openpyxl') as writer:
-        writer.sheets['Sheet1'] = writer.book.create_sheet('Sheet1')
-        cell = writer.sheets['Sheet1'].cell(row=1, column=2, value="Raport ilości plików PTPiREE - Energia czynna oddana")
-        from openpyxl.styles import Font, numbers
-        cell.font = Font(size=14, bold=True)
-        df_to_excel_co.to_excel(writer, sheet_name='Sheet1', index=False, startrow=2)
-        ws = writer.sheets['Sheet1']
-        suma_col = None
-        for idx, col in enumerate(df_to_excel_co.columns, 1):
-            if col == 'Suma':
-                suma_col = idx
-                break
-        if suma_col:
-            for row in range(4, len(df_to_excel_co) + 4):
-                cell = ws.cell(row=row, column=suma_col)
-                cell.number_format = '0.000'
-            last_row = len(df_to_excel_co) + 5
-            ws.cell(row=last_row, column=2, value="Ilość plików sumarycznie")
-            total_files_cell = ws.cell(row=last_row, column=3, value=int(df_to_excel_co['Pliki'].sum()))
-            total_files_cell.number_format = '0'
-            ws.cell(row=last_row + 1, column=2, value="Całkowity wolumen")
-            total_sum_cell = ws.cell(row=last_row + 1, column=3, value=float(df_to_excel_co['Suma'].sum()))
-            total_sum_cell.number_format = '0.000'
-            ws.cell(row=last_row + 2, column=2, value="Data wykonania raportu")
-            date_cell = ws.cell(row=last_row + 2, column=3, value=datetime.datetime.now())
-            date_cell.number_format = 'YYYY-MM-DD HH:MM:SS'
-    now = datetime.datetime.now()
-    output_co.seek(0)
-    st.download_button(
+    lazy_download_button(
+        "excel-co",
         "Pobierz plik xlsx (Energia czynna oddana)",
-        output_co,
-        f"ptpire_CO_{now.strftime('%Y%m%d_%H%M%S')}.xlsx",
-        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        key='download-excel-co'
+        "ptpire_CO",
+        lambda: build_summary_workbook(df_co, SUMMARY_TITLES["CO"])
     )
 
 # Dodawanie przycisku do eksportu profili
-if st.session_state.file_profiles:
-    # Tworzenie danych do eksportu profili
-    profiles_output = io.BytesIO()
-    
-    with pd.ExcelWriter(profiles_output, engine='openpyxl') as writer:
-        # Przygotuj dane profili do zapisu
-        for group_name, files in group_files_by_name(uploaded_files).items():
-            # Pomiń grupy i pliki z '_CPP_'
-            if '_CPP_' in group_name:
-                continue
-            all_profiles_data = []
-            max_length = 0
-            for file in files:
-                if '_CPP_' in file.name:
-                    continue
-                file_key = f"{group_name}_{files.index(file)+1}"
-                if file_key not in st.session_state.file_profiles:
-                    continue
-                profile = st.session_state.file_profiles[file_key]["profile"]
-                max_length = max(max_length, len(profile))
-            for file in files:
-                if '_CPP_' in file.name:
-                    continue
-                file_key = f"{group_name}_{files.index(file)+1}"
-                if file_key not in st.session_state.file_profiles:
-                    continue
-                profile = st.session_state.file_profiles[file_key]["profile"]
-                profile_date = st.session_state.file_profiles[file_key]["date"]
-                padded_profile = profile + [None] * (max_length - len(profile))
-                row_data = {"Nazwa pliku": file_key, "Data profilu": profile_date}
-                for i, value in enumerate(padded_profile):
-                    row_data[f"{i+1}"] = value
-                all_profiles_data.append(row_data)
-            if not all_profiles_data:
-                continue
-            profiles_df = pd.DataFrame(all_profiles_data)
-            # Sortowanie po kolumnie "Data profilu"
-            # Konwersja kolumny na datetime
-            profiles_df["Data profilu"] = pd.to_datetime(profiles_df["Data profilu"], format="%d-%m-%Y", errors="coerce")
-            profiles_df = profiles_df.sort_values(by="Data profilu", ascending=True, na_position='last')
-            # Zamiana na tekstowy format daty
-            profiles_df["Data profilu"] = profiles_df["Data profilu"].dt.strftime("%d-%m-%Y")
-
-            profiles_df.to_excel(writer, sheet_name=group_name, index=False, startrow=2)
-            ws = writer.sheets[group_name]
-            ws.cell(row=1, column=1, value=f"Profile plików PTPiREE - {group_name}")
-            for row in range(4, len(profiles_df) + 4):
-                for col in range(2, max_length + 3):
-                    cell = ws.cell(row=row, column=col)
-                    cell.number_format = '0.000'
-            ws.cell(row=len(profiles_df) + 5, column=1, value="Data wygenerowania")
-            date_cell = ws.cell(row=len(profiles_df) + 5, column=2, value=datetime.datetime.now())
-            date_cell.number_format = 'YYYY-MM-DD HH:MM:SS'
-    
-    now = datetime.datetime.now()
-    profiles_output.seek(0)
-    
-    st.download_button(
+if len(profile_store):
+    lazy_download_button(
+        "profiles",
         "Pobierz profile jako xlsx",
-        profiles_output,
-        f"ptpire_profiles_{now.strftime('%Y%m%d_%H%M%S')}.xlsx",
-        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        key='download-profiles'
+        "ptpire_profiles",
+        lambda: build_profiles_workbook(profile_store)
     )
     
     # Dodaj przycisk do czyszczenia wszystkich kontrolek i stanu
     if st.button("Wyczyść wszystkie dane", type="primary"):
         for key in list(st.session_state.keys()):
             del st.session_state[key]
-        # Zwiększ klucz uploadu, wyczyść file_profiles i uploaded_files
+        # Zwiększ klucz uploadu, wyczyść magazyn profili i uploaded_files
         st.session_state.uploader_key = st.session_state.get('uploader_key', 0) + 1
-        st.session_state.file_profiles = {}
+        st.session_state.profile_store = ProfileStore()
         st.session_state[f'uploader_{st.session_state.uploader_key}'] = []
         st.rerun()
 # Wyświetl stopkę
@@ -1,7 +1,14 @@
 import streamlit as st
 import pandas as pd
-from workalendar.europe import Poland
-from datetime import datetime, timedelta
+import datetime
+import hashlib
+import os
+from src.core.config import get_config_value
+from src.zones import (
+    BREAKDOWN_PERIODS, TARIFS, compare_tariffs, get_tariffs, load_profiles, summarize_profiles, zone_breakdown
+)
+from src.core.shared import XLSX_MIME
+from src.zones.export import build_workbook
 
 with st.sidebar:
     st.logo(
@@ -20,200 +27,53 @@ st.markdown("""
 
 pd.options.mode.copy_on_write = True
 
-TARIFS = [
-    'ENERGA_A23_B23_C23',
-    'ENERGA_B22_C22a',
-    'ENERGA_C22b',
-    'TAURON_A23_B23_C23_C13_G13',
-    'TAURON_B22_C22a',
-    'TAURON_C22b',
-    'PGE_A23_B23_C23',
-    'PGE_B22_C22a',
-    'PGE_C22b',
-    'ENEA_A23_B23',
-    'ENEA_B22_C22a',
-    'ENEA_B12',
-    'ENEA_C22b',
-    'PGE_ENERGETYKA_KOLEJOWA_B23',
-    'PGE_ENERGETYKA_KOLEJOWA_B22_C22',
-    'PGE_ENERGETYKA_KOLEJOWA_C22b',
-    'ARCELORMITTAL_B23',
-    'ARCELORMITTAL_C22a',
-    'ARCELORMITTAL_C22b'
-]
-
-TARIFS_WITH_HOLIDAYS = [
-    'ENERGA_A23_B23_C23',
-    'TAURON_A23_B23_C23_C13_G13',
-    'PGE_A23_B23_C23',
-    'ENEA_A23_B23',
-    'PGE_ENERGETYKA_KOLEJOWA_B23',
-    'ARCELORMITTAL_B23',
-]
-
-def find_holidays(start_date, end_date):
-    cal = Poland()
-    start_year = start_date.year
-    end_year = end_date.year
-
-    if start_year == end_year:
-        holidays = cal.holidays(start_year)
-    if end_year - start_year == 1:
-        holidays = cal.holidays(start_year) + cal.holidays(end_year)
-    if end_year - start_year > 1:
-        holidays = cal.holidays(start_year)
-        for year in range(start_year + 1, end_year):
-            holidays += cal.holidays(year)
-        holidays += cal.holidays(end_year)
-
-    current_date = start_date
-    while current_date <= end_date:
-        if current_date.weekday() == 5:
-            holidays.append((current_date, 'Sobota'))
-        elif current_date.weekday() == 6:
-            holidays.append((current_date, 'Niedziela'))
-        current_date += timedelta(days=1)
-    return holidays
-
-def create_zone_dataframe(start_date, end_date, zone_name, zones):
-    date_range = pd.date_range(start=start_date, end=end_date, freq='h')
-    df = pd.DataFrame(date_range, columns=['Timestamp'])
-
-    start_date = pd.to_datetime(start_date)
-    end_date = pd.to_datetime(end_date)
-    end_date += timedelta(days=1)
-
-    holidays = find_holidays(start_date, end_date)
-    
-    zone_df = None
-    for zone in zones:
-        if zone_name in zone:
-            zone_df = zone[zone_name]
-            break
-    
-    if zone_df is None:
-        raise ValueError(f"Zone '{zone_name}' not found in zones.")
-    
-    zone_data = []
-    for timestamp in df['Timestamp']:
-        month = timestamp.month
-        hour = timestamp.hour
-        zone_value = zone_df.iloc[hour-1, month]
-        
-        if zone_name in TARIFS_WITH_HOLIDAYS:
-            for holiday in holidays:
-                if holiday[0] == timestamp.date():
-                    zone_value = "S3"
-                    break
-        
-        zone_data.append(zone_value)
-    
-    df['Zone'] = zone_data
-    return df
+MODE_SINGLE = "Jeden profil"
+MODE_BATCH = "Wiele profili"
+mode = st.radio("Tryb obliczeń", [MODE_SINGLE, MODE_BATCH], horizontal=True)
 
-uploaded_file = st.file_uploader("Wgraj plik xls z profilem", type=['xls', 'xlsx'])
+uploaded_file = None
+if mode == MODE_SINGLE:
+    uploaded_file = st.file_uploader("Wgraj plik xls z profilem", type=['xls', 'xlsx'])
 
 if uploaded_file is not None:
-    # Wczytanie profilu
-    profil = pd.read_excel(uploaded_file)
-    profil = profil.drop(columns=['P,O,B'])
-    profil = profil.drop(columns=['Unnamed: 27'])
-    profil = profil.transpose()
-    profil.reset_index(drop=True, inplace=True)
-    profil = profil.iloc[:, :-3]
-    profil.columns = profil.iloc[0]
-    profil = profil[1:]
-    profil.columns = ['Time' if pd.isna(col) else col for col in profil.columns]
-    profil.columns = profil.columns.astype(str)
-    
-    for col in profil.columns:
-        if len(col) > 10:
-            date = col[0:10]
-            month = date[5:7]
-            day = date[8:10]
-            year = date[0:4]
-            date = day + '.' + month + '.' + year
-            profil.rename(columns={col: date}, inplace=True)
-
-    # Wczytanie stref
-    zones = []
-    xls = pd.ExcelFile('./input/strefy_new.xlsx')
-    for sheet_name in xls.sheet_names:
-        a = pd.read_excel(xls, sheet_name=sheet_name)
-        zones.append({sheet_name:a})
-
-    # Wybór taryfy
-    selected_tariff = st.selectbox("Wybierz OSD i grupę taryfową:", TARIFS)
-    
+    # Wczytanie profilu (kolejne uruchomienia skryptu korzystają z pamięci podręcznej)
+    profile_workbook = load_profiles(uploaded_file.getvalue())
+    profile = profile_workbook.sheet(0)
+    st.caption(
+        f"Profil wczytano w {profile_workbook.read_seconds:.2f} s"
+        + (" (pamięć podręczna)" if profile_workbook.cached else "")
+    )
+
+    # Definicje stref są wczytywane raz i odświeżane tylko po zmianie pliku
+    tariffs = get_tariffs()
+
+    # Wybór taryfy lub porównanie wszystkich taryf
+    compare_mode = st.toggle("Porównaj wszystkie taryfy", help="Oblicza strefy wszystkich taryf dla wgranego profilu.")
+    selected_tariff = None if compare_mode else st.selectbox("Wybierz OSD i grupę taryfową:", TARIFS)
+
+    # Złączenie z profilem i kalendarz dni wolnych są wspólne dla wszystkich taryf
+    timestamps = profile.timestamps()
+    values = profile.hourly_values(timestamps)
+    ecp_value = profile.extra_value
+
+    if compare_mode:
+        comparison = pd.DataFrame(compare_tariffs(timestamps, values, ecp_value, tariffs, TARIFS))
+        st.subheader("Zużycie energii w strefach dla wszystkich taryf:")
+        st.dataframe(
+            comparison,
+            column_config={
+                column: st.column_config.NumberColumn(column, format="%.2f")
+                for column in comparison.columns if column != 'Taryfa'
+            },
+            use_container_width=True,
+            hide_index=True
+        )
+
     if selected_tariff:
-        start_date = profil.columns[1]
-        end_date = profil.columns[-1]
-
-        start_date = datetime.strptime(start_date, '%d.%m.%Y')
-        start_date = start_date.strftime('%Y-%m-%d')
-        end_date = datetime.strptime(end_date, '%d.%m.%Y')
-        end_date += timedelta(days=1)
-        end_date = end_date.strftime('%Y-%m-%d')
-
-        zone_df = create_zone_dataframe(start_date, end_date, selected_tariff, zones)
-        zone_df['ECP'] = None
-
-        for i, row in zone_df.iterrows():
-            timestamp = row['Timestamp']
-            hour = timestamp.hour
-            day = timestamp.day
-            month = timestamp.month
-            year = timestamp.year
-            if hour == 0:
-                hour = 24
-            if hour < 10:
-                hour = f"0{hour}:00"
-            else:
-                hour = f"{hour}:00"
-            if day < 10:
-                day = f"0{day}"
-            if month < 10:
-                month = f"0{month}"
-            date = f"{day}.{month}.{year}"
-
-            try:
-                ecp_value = profil.loc[profil['Time'] == hour, date].values[0]
-            except:
-                ecp_value = None
-                
-            zone_df.at[i, 'ECP'] = ecp_value
-
-        last_row = profil.iloc[-1]
-        non_nan_values = last_row.dropna().tolist()
-        ecp_value = non_nan_values[-1]
-
-        s1_zone_df = zone_df[zone_df['Zone'] == 'S1']
-        s2_zone_df = zone_df[zone_df['Zone'] == 'S2']
-        s3_zone_df = zone_df[zone_df['Zone'] == 'S3']
-
-        s1_zone_df['ECP'] = pd.to_numeric(s1_zone_df['ECP'], errors='coerce')
-        s2_zone_df['ECP'] = pd.to_numeric(s2_zone_df['ECP'], errors='coerce')
-        s3_zone_df['ECP'] = pd.to_numeric(s3_zone_df['ECP'], errors='coerce')
-
-        total_ecp_sum = round(zone_df['ECP'].apply(pd.to_numeric, errors='coerce').sum() + ecp_value, 2)
-        s1_ecp_sum = round(s1_zone_df['ECP'].sum(), 2)
-        
-        if selected_tariff in TARIFS_WITH_HOLIDAYS:
-            s3_ecp_sum = round(s3_zone_df['ECP'].sum() + ecp_value, 2)
-        else:
-            s3_ecp_sum = 0
-            
-        if selected_tariff not in TARIFS_WITH_HOLIDAYS:
-            s2_ecp_sum = round(s2_zone_df['ECP'].sum() + ecp_value, 2)
-        else:
-            s2_ecp_sum = round(s2_zone_df['ECP'].sum(), 2)
-
-        s1_percent = round(s1_ecp_sum / total_ecp_sum * 100, 2)
-        s2_percent = round(s2_ecp_sum / total_ecp_sum * 100, 2)
-        try:
-            s3_percent = round(s3_ecp_sum / total_ecp_sum * 100, 2)
-        except:
-            s3_percent = 0
+        result = compare_tariffs(timestamps, values, ecp_value, tariffs, [selected_tariff])[0]
+        s1_ecp_sum, s2_ecp_sum, s3_ecp_sum = result['S1'], result['S2'], result['S3']
+        total_ecp_sum = result['Suma']
+        s1_percent, s2_percent, s3_percent = result['S1 %'], result['S2 %'], result['S3 %']
 
         # Wyświetlenie wyników
         col1, col2 = st.columns(2)
@@ -236,3 +96,98 @@ if uploaded_file is not None:
             )])
             
             st.plotly_chart(fig)
+
+    # Podział wyników na miesiące i dni (do rozliczeń miesięcznych dłuższych okresów)
+    if st.toggle("Podział na miesiące i dni", help="Oblicza sumy stref w kolejnych miesiącach i dniach profilu."):
+        breakdown_tariffs = TARIFS if compare_mode else [selected_tariff]
+        breakdowns = {
+            title: zone_breakdown(
+                timestamps, values, ecp_value, tariffs, breakdown_tariffs, freq, profile.extra_date
+            )
+            for freq, title in BREAKDOWN_PERIODS.items()
+        }
+        for tab, (title, breakdown) in zip(st.tabs(list(breakdowns)), breakdowns.items()):
+            with tab:
+                st.dataframe(
+                    breakdown,
+                    column_config={
+                        column: st.column_config.NumberColumn(column, format="%.2f")
+                        for column in breakdown.columns if column not in ('Taryfa', 'Okres')
+                    },
+                    use_container_width=True,
+                    hide_index=True
+                )
+        # Plik jest generowany dopiero po kliknięciu "Przygotuj" i używany ponownie,
+        # dopóki nie zmieni się wgrany profil ani wybrane taryfy
+        breakdown_signature = (
+            hashlib.blake2b(uploaded_file.getvalue(), digest_size=16).hexdigest(),
+            tuple(breakdown_tariffs)
+        )
+        breakdown_export = st.session_state.get("zone_breakdown_export")
+        if breakdown_export is None or breakdown_export["signature"] != breakdown_signature:
+            breakdown_export = None
+            if st.button("Przygotuj podział jako xlsx"):
+                with st.spinner("Generowanie pliku..."):
+                    breakdown_export = {
+                        "signature": breakdown_signature,
+                        "data": build_workbook(breakdowns),
+                        "file_name": f"strefy_okresy_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+                    }
+                st.session_state.zone_breakdown_export = breakdown_export
+        if breakdown_export is not None:
+            st.download_button(
+                "Pobierz podział jako xlsx",
+                breakdown_export["data"],
+                breakdown_export["file_name"],
+                XLSX_MIME
+            )
+
+if mode == MODE_BATCH:
+    batch_files = st.file_uploader(
+        "Wgraj pliki xls z profilami (każdy plik lub arkusz to osobny punkt)",
+        type=['xls', 'xlsx'],
+        accept_multiple_files=True
+    )
+    batch_tariffs = st.multiselect("Wybierz OSD i grupy taryfowe:", TARIFS, default=TARIFS[:1])
+
+    if batch_files and batch_tariffs and st.button("Oblicz strefy"):
+        progress_bar = st.progress(0.0)
+
+        def update_progress(done, total):
+            progress_bar.progress(done / total, text=f"Przetworzono {done} z {total} plików")
+
+        # Pliki są przetwarzane równolegle; definicje stref i kalendarz są współdzielone
+        batch_result, batch_errors, _ = summarize_profiles(
+            [(f.name, f.getvalue()) for f in batch_files],
+            get_tariffs(),
+            batch_tariffs,
+            workers=min(get_config_value("ZONES_WORKERS", 1), os.cpu_count() or 1, len(batch_files)),
+            progress_callback=update_progress
+        )
+        progress_bar.empty()
+        st.session_state.zone_batch = {
+            "result": batch_result,
+            "errors": batch_errors,
+            "data": build_workbook({"Strefy": batch_result}),
+            "file_name": f"strefy_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+        }
+
+    zone_batch = st.session_state.get("zone_batch")
+    if zone_batch:
+        for point, error in zone_batch["errors"]:
+            st.warning(f"Nie udało się obliczyć stref dla {point}: {error}")
+        st.dataframe(
+            zone_batch["result"],
+            column_config={
+                column: st.column_config.NumberColumn(column, format="%.2f")
+                for column in zone_batch["result"].columns if column not in ('Punkt', 'Taryfa')
+            },
+            use_container_width=True,
+            hide_index=True
+        )
+        st.download_button(
+            "Pobierz wyniki jako xlsx",
+            zone_batch["data"],
+            zone_batch["file_name"],
+            XLSX_MIME
+        )
@@ -7,6 +7,9 @@ from dotenv import load_dotenv
 # Ładowanie zmiennych środowiskowych z pliku .env
 load_dotenv()
 
+# Katalog główny projektu (domyślne ścieżki nie zależą od katalogu bieżącego)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 # Konfiguracja aplikacji
 CONFIG = {
     "VERSION": "1.0.0",
@@ -20,6 +23,17 @@ CONFIG = {
     "MSSQL_DATABASE": os.getenv("MSSQL_DATABASE", "master"),
     "MSSQL_USERNAME": os.getenv("MSSQL_USERNAME", "sa"),
     "MSSQL_PASSWORD": os.getenv("MSSQL_PASSWORD", ""),
+    "PTPIREE_WORKERS": int(os.getenv("PTPIREE_WORKERS", os.cpu_count() or 1)),
+    "PTPIREE_CACHE_MB": int(os.getenv("PTPIREE_CACHE_MB", 256)),
+    "PTPIREE_INPUT_DIR": os.getenv("PTPIREE_INPUT_DIR", os.path.join(PROJECT_ROOT, "input")),
+    "PTPIREE_ARCHIVE_DIR": os.getenv("PTPIREE_ARCHIVE_DIR", os.path.join(PROJECT_ROOT, "data", "ptpiree")),
+    "PTPIREE_CHART_POINTS": int(os.getenv("PTPIREE_CHART_POINTS", 200)),
+    "ZONES_FILE": os.getenv("ZONES_FILE", os.path.join(PROJECT_ROOT, "input", "strefy_new.xlsx")),
+    "ZONES_WEEKENDS_S3": os.getenv("ZONES_WEEKENDS_S3", "False").lower() in ("true", "1", "t"),
+    "ZONES_WORKERS": int(os.getenv("ZONES_WORKERS", os.cpu_count() or 1)),
+    "ZONES_CACHE_DIR": os.getenv("ZONES_CACHE_DIR", os.path.join(PROJECT_ROOT, "data", "zones")),
+    "ZONES_CACHE_MB": int(os.getenv("ZONES_CACHE_MB", 256)),
+    "ZONES_CACHE_DAYS": int(os.getenv("ZONES_CACHE_DAYS", 7)),
 }
 
 def get_config():
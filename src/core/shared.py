@@ -0,0 +1,90 @@
+"""
+Moduł zawierający elementy wspólne kalkulatorów PTPiREE i stref: współdzieloną pulę procesów i typ MIME plików xlsx
+"""
+import atexit
+import multiprocessing
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterator, Optional
+
+# Typ MIME plików xlsx
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Pula procesów współdzielona przez wszystkie sesje Streamlit (jedna naraz)
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_workers = 0
+# Liczba wypożyczeń każdej puli; pula zastąpiona inną jest zamykana po ostatnim zwrocie
+_leases: Dict[ProcessPoolExecutor, int] = {}
+_executor_lock = threading.Lock()
+
+
+@contextmanager
+def process_pool(workers: int) -> Iterator[ProcessPoolExecutor]:
+    """
+    Wypożycza współdzieloną pulę procesów o podanej liczbie procesów roboczych.
+
+    Pula jest tworzona raz i używana ponownie, aby nie płacić kosztu
+    uruchamiania procesów przy każdym przeliczeniu strony. Prośba o inną
+    liczbę procesów zastępuje pulę nową, a poprzednia jest zamykana, gdy
+    zakończą się korzystające z niej obliczenia. Uszkodzona pula
+    (BrokenProcessPool) jest odrzucana, więc kolejne wywołanie utworzy nową.
+
+    Args:
+        workers: Liczba procesów roboczych
+
+    Returns:
+        Menedżer kontekstu zwracający pulę procesów
+    """
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers:
+            _retire(_executor)
+            _executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            _executor_workers = workers
+        executor = _executor
+        _leases[executor] = _leases.get(executor, 0) + 1
+    try:
+        yield executor
+    except BrokenProcessPool:
+        with _executor_lock:
+            _retire(executor)
+        raise
+    finally:
+        with _executor_lock:
+            _leases[executor] -= 1
+            if executor is not _executor and not _leases[executor]:
+                del _leases[executor]
+                executor.shutdown(wait=False)
+
+
+def _retire(executor: Optional[ProcessPoolExecutor]) -> None:
+    """
+    Odłącza pulę od współdzielonego miejsca; nieużywana pula jest od razu zamykana.
+
+    Wywoływane pod blokadą _executor_lock.
+
+    Args:
+        executor: Pula procesów (None nic nie robi)
+    """
+    global _executor
+    if executor is None:
+        return
+    if executor is _executor:
+        _executor = None
+    if not _leases.get(executor):
+        _leases.pop(executor, None)
+        executor.shutdown(wait=False)
+
+
+@atexit.register
+def _shutdown_pools() -> None:
+    """Zamyka pule procesów przy zakończeniu procesu serwera."""
+    with _executor_lock:
+        executors = set(_leases) | ({_executor} if _executor is not None else set())
+        for executor in executors:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -1,4 +1,4 @@
-from .database import get_documents, get_documents_for_user, get_invoice_details, fetch_dict_data, fetch_comments, add_comment, update_comment, delete_comment, accept_document, get_attachment, get_accounts, get_dimensions, get_job_tasks, get_budget_positions, get_all_pending_invoices
+from .database import get_documents, get_documents_for_user, get_invoice_details, fetch_dict_data, fetch_companies_data, fetch_comments, add_comment, update_comment, delete_comment, accept_document, get_attachment, get_accounts, get_dimensions, get_job_tasks, get_budget_positions, get_all_pending_invoices
 from .user_db import verify_user, add_user, get_all_users, delete_user, update_user
 
 __all__ = [
@@ -6,6 +6,7 @@ __all__ = [
     'get_documents_for_user',
     'get_invoice_details', 
     'fetch_dict_data',
+    'fetch_companies_data',
     'fetch_comments',
     'add_comment',
     'update_comment',
@@ -8,6 +8,7 @@ from src.utils.constants import COMPANIES as COMPANIES_TUPLES
 import zlib
 import io
 import zipfile
+from .pool import ConnectionPool, PoolTimeout
 
 # Ładowanie zmiennych środowiskowych
 load_dotenv()
@@ -19,17 +20,41 @@ DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_NAME = os.getenv("DB_NAME")
 ADMIN_MAIL = os.getenv("ADMIN_MAIL")
 
+# Konfiguracja puli połączeń
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_MAX_IDLE = float(os.getenv("DB_POOL_MAX_IDLE", 300))
+DB_POOL_HEALTH_CHECK = float(os.getenv("DB_POOL_HEALTH_CHECK", 30))
+
 # Flaga określająca, czy połączenie z SQL Server jest dostępne
 SQL_SERVER_AVAILABLE = True
 
 # Ciąg połączenia do bazy danych
 connection_string = f'DRIVER={{ODBC Driver 18 for SQL Server}};SERVER={DB_SERVER};DATABASE={DB_NAME};UID={DB_USER};PWD={DB_PASSWORD}; TrustServerCertificate=yes; Encrypt=yes;'
 
+# Pula połączeń współdzielona przez wszystkie funkcje modułu i wszystkie sesje aplikacji
+_pool = ConnectionPool(
+    lambda: pyodbc.connect(connection_string),
+    size=DB_POOL_SIZE,
+    timeout=DB_POOL_TIMEOUT,
+    max_idle=DB_POOL_MAX_IDLE,
+    health_check_after=DB_POOL_HEALTH_CHECK
+)
+
 def get_connection():
-    """Tworzy i zwraca połączenie do bazy danych."""
+    """
+    Wypożycza połączenie z puli połączeń do bazy danych.
+
+    Wywołanie close() na zwróconym połączeniu oddaje je do puli, więc kolejne
+    zapytania nie nawiązują ponownie połączenia (TLS i logowanie).
+    """
     global SQL_SERVER_AVAILABLE
     try:
-        return pyodbc.connect(connection_string)
+        return _pool.acquire()
+    except PoolTimeout as e:
+        # Wszystkie połączenia są zajęte - serwer jest dostępny, więc flaga nie jest zmieniana
+        print(f"Błąd połączenia z bazą danych SQL Server: {str(e)}")
+        return None
     except Exception as e:
         print(f"Błąd połączenia z bazą danych SQL Server: {str(e)}")
         SQL_SERVER_AVAILABLE = False
@@ -107,6 +132,72 @@ def fetch_dict_data(company: str = None, table: str = None, fields: str = None,
     finally:
         conn.close()
 
+def fetch_companies_data(table: str, fields: str, condition: str = None, companies: List[str] = None) -> List[Dict[str, Any]]:
+    """
+    Pobiera dane z tabeli wszystkich firm jednym zapytaniem (UNION ALL).
+
+    Każdy wiersz jest oznaczony kodem firmy w kluczu 'company', a wyniki
+    są ułożone w kolejności firm, tak jak przy osobnych zapytaniach dla
+    każdej firmy. Jeśli zapytanie zbiorcze się nie powiedzie (np. brak
+    tabeli jednej z firm), dane są pobierane osobno dla każdej firmy.
+
+    Args:
+        table: Nazwa tabeli (bez kodu firmy)
+        fields: Pola do pobrania
+        condition: Warunek WHERE stosowany w każdej firmie
+        companies: Kody firm (domyślnie wszystkie firmy z COMPANIES)
+
+    Returns:
+        Lista słowników z danymi i kodem firmy
+    """
+    if companies is None:
+        companies = [company_code for company_code, _ in COMPANIES_TUPLES]
+    if not companies:
+        return []
+
+    where = f' WHERE {condition}' if condition is not None else ''
+    selects = []
+    for order, company_code in enumerate(companies):
+        company_literal = company_code.replace("'", "''")
+        selects.append(
+            f"SELECT {fields.strip()}, N'{company_literal}' AS [company], {order} AS [company_order] "
+            f"FROM [dbo].[{company_code}${table}]{where}"
+        )
+    # Kolumna company_order zachowuje kolejność firm z osobnych zapytań
+    SQL_QUERY = '\nUNION ALL\n'.join(selects) + '\nORDER BY [company_order]'
+
+    if os.environ.get('DEBUG_MODE') == 'True':
+        print(f"Wykonywane zapytanie SQL: {SQL_QUERY}")
+
+    conn = get_connection()
+    if not conn:
+        return []
+
+    try:
+        cursor = conn.cursor()
+        cursor.execute(SQL_QUERY)
+        columns = [column[0] for column in cursor.description]
+        results = []
+        for row in cursor.fetchall():
+            doc = dict(zip(columns, row))
+            del doc['company_order']
+            results.append(doc)
+        cursor.close()
+        return results
+    except Exception as e:
+        if os.environ.get('DEBUG_MODE') == 'True':
+            print(f"Zapytanie zbiorcze nie powiodło się, pobieranie osobno dla każdej firmy: {str(e)}")
+    finally:
+        conn.close()
+
+    results = []
+    for company_code in companies:
+        result = fetch_dict_data(company=company_code, fields=fields, table=table, condition=condition)
+        for doc in result:
+            doc['company'] = company_code
+        results.extend(result)
+    return results
+
 def get_documents(company: str) -> List[Dict[str, Any]]:
     """
     Pobiera listę dokumentów dla danej firmy.
@@ -264,20 +355,12 @@ def get_documents_for_user(user: str) -> List[Dict[str, Any]]:
       ,[Vendor Bank Account Code]
     '''
     
-    results = []
-    for company_code, _ in COMPANIES_TUPLES:
-        result = fetch_dict_data(
-            company=company_code, 
-            fields=fields, 
-            table='Log Incoming Document$b64d2b42-739a-4647-b44a-fd892d64fff6', 
-            condition=f'[Send to] = \'ESV\\{user}\' AND [Accepted] !=1'
-        )
-        if result:
-            for doc in result:
-                doc['company'] = company_code
-            results.extend(result)
-    
-    return results
+    # Dokumenty wszystkich firm są pobierane jednym zapytaniem
+    return fetch_companies_data(
+        fields=fields,
+        table='Log Incoming Document$b64d2b42-739a-4647-b44a-fd892d64fff6',
+        condition=f'[Send to] = \'ESV\\{user}\' AND [Accepted] !=1'
+    )
 
 def get_all_pending_invoices() -> List[Dict[str, Any]]:
     """
@@ -350,20 +433,12 @@ def get_all_pending_invoices() -> List[Dict[str, Any]]:
       ,[Vendor Bank Account Code]
     '''
     
-    results = []
-    for company_code, _ in COMPANIES_TUPLES:
-        result = fetch_dict_data(
-            company=company_code, 
-            fields=fields, 
-            table='Log Incoming Document$b64d2b42-739a-4647-b44a-fd892d64fff6', 
-            condition='[Accepted] !=1'
-        )
-        if result:
-            for doc in result:
-                doc['company'] = company_code
-            results.extend(result)
-    
-    return results
+    # Faktury wszystkich firm są pobierane jednym zapytaniem
+    return fetch_companies_data(
+        fields=fields,
+        table='Log Incoming Document$b64d2b42-739a-4647-b44a-fd892d64fff6',
+        condition='[Accepted] !=1'
+    )
 
 def fetch_comments(company: str, document_no: str) -> List[Dict[str, Any]]:
     """
@@ -884,15 +959,17 @@ def get_dimensions(company: str, dimension_code: str = None) -> List[Dict[str, A
             if not conn:
                 return []
                 
-            cursor = conn.cursor()
-            cursor.execute(SQL_QUERY)
-            columns = [column[0] for column in cursor.description]
-            results = []
-            data = cursor.fetchall()
-            for row in data:
-                results.append(dict(zip(columns, row)))
-            cursor.close()
-            conn.close()
+            try:
+                cursor = conn.cursor()
+                cursor.execute(SQL_QUERY)
+                columns = [column[0] for column in cursor.description]
+                results = []
+                data = cursor.fetchall()
+                for row in data:
+                    results.append(dict(zip(columns, row)))
+                cursor.close()
+            finally:
+                conn.close()
             
             if not results:
                 # Jeśli nie znaleziono wyników, spróbuj alternatywnych nazw
@@ -935,15 +1012,17 @@ def get_dimensions(company: str, dimension_code: str = None) -> List[Dict[str, A
             if not conn:
                 return []
                 
-            cursor = conn.cursor()
-            cursor.execute(SQL_QUERY)
-            columns = [column[0] for column in cursor.description]
-            results = []
-            data = cursor.fetchall()
-            for row in data:
-                results.append(dict(zip(columns, row)))
-            cursor.close()
-            conn.close()
+            try:
+                cursor = conn.cursor()
+                cursor.execute(SQL_QUERY)
+                columns = [column[0] for column in cursor.description]
+                results = []
+                data = cursor.fetchall()
+                for row in data:
+                    results.append(dict(zip(columns, row)))
+                cursor.close()
+            finally:
+                conn.close()
             
             
             return results
@@ -972,15 +1051,17 @@ def get_dimensions(company: str, dimension_code: str = None) -> List[Dict[str, A
             if not conn:
                 return []
                 
-            cursor = conn.cursor()
-            cursor.execute(SQL_QUERY)
-            columns = [column[0] for column in cursor.description]
-            results = []
-            data = cursor.fetchall()
-            for row in data:
-                results.append(dict(zip(columns, row)))
-            cursor.close()
-            conn.close()
+            try:
+                cursor = conn.cursor()
+                cursor.execute(SQL_QUERY)
+                columns = [column[0] for column in cursor.description]
+                results = []
+                data = cursor.fetchall()
+                for row in data:
+                    results.append(dict(zip(columns, row)))
+                cursor.close()
+            finally:
+                conn.close()
             
             if not results:
                 # Jeśli nie znaleziono wyników, spróbuj alternatywnych nazw
@@ -1024,15 +1105,17 @@ def get_dimensions(company: str, dimension_code: str = None) -> List[Dict[str, A
             if not conn:
                 return []
                 
-            cursor = conn.cursor()
-            cursor.execute(SQL_QUERY)
-            columns = [column[0] for column in cursor.description]
-            results = []
-            data = cursor.fetchall()
-            for row in data:
-                results.append(dict(zip(columns, row)))
-            cursor.close()
-            conn.close()
+            try:
+                cursor = conn.cursor()
+                cursor.execute(SQL_QUERY)
+                columns = [column[0] for column in cursor.description]
+                results = []
+                data = cursor.fetchall()
+                for row in data:
+                    results.append(dict(zip(columns, row)))
+                cursor.close()
+            finally:
+                conn.close()
             
             if not results:
                 # Jeśli nie znaleziono wyników, spróbuj alternatywnych nazw
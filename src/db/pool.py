@@ -0,0 +1,200 @@
+"""
+Moduł zawierający pulę połączeń do bazy danych SQL Server współdzieloną przez wątki aplikacji
+"""
+import threading
+import time
+from typing import Any, Callable, List, Tuple
+
+
+class PoolTimeout(Exception):
+    """Wyjątek zgłaszany, gdy w puli nie zwolniło się połączenie w wyznaczonym czasie."""
+
+
+class PooledConnection:
+    """
+    Połączenie wypożyczone z puli.
+
+    Udostępnia metody połączenia pyodbc (cursor, commit, rollback), a close()
+    zwraca połączenie do puli zamiast je zamykać, więc istniejący kod
+    `conn = get_connection() ... finally: conn.close()` korzysta z puli bez zmian.
+    """
+
+    def __init__(self, pool: "ConnectionPool", connection: Any):
+        self._pool = pool
+        self._connection = connection
+
+    def __getattr__(self, name: str) -> Any:
+        if self._connection is None:
+            raise AttributeError(f"Połączenie zostało już zwrócone do puli ({name})")
+        return getattr(self._connection, name)
+
+    def close(self) -> None:
+        """Zwraca połączenie do puli (kolejne wywołania nic nie robią)."""
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            self._pool.release(connection)
+
+    def __enter__(self) -> "PooledConnection":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __del__(self):
+        # Połączenie porzucone bez close() (np. po wyjątku) nie zajmuje miejsca w puli na stałe
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """
+    Pula połączeń o ograniczonym rozmiarze, bezpieczna dla wielu wątków.
+
+    - połączenia są tworzone dopiero, gdy są potrzebne, i używane ponownie,
+    - połączenie nieużywane dłużej niż health_check_after sekund jest
+      sprawdzane zapytaniem SELECT 1 przed wypożyczeniem, a uszkodzone
+      jest zamykane i zastępowane nowym,
+    - połączenia nieużywane dłużej niż max_idle sekund są zamykane,
+    - przy zwrocie do puli niezatwierdzona transakcja jest wycofywana;
+      połączenie, którego nie da się wycofać (zerwane), jest odrzucane.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        size: int = 5,
+        timeout: float = 30.0,
+        max_idle: float = 300.0,
+        health_check_after: float = 30.0
+    ):
+        """
+        Inicjalizuje pustą pulę.
+
+        Args:
+            connect: Funkcja tworząca nowe połączenie
+            size: Maksymalna liczba otwartych połączeń
+            timeout: Maksymalny czas oczekiwania na wolne połączenie w sekundach
+            max_idle: Czas bezczynności, po którym połączenie jest zamykane
+            health_check_after: Czas bezczynności, po którym połączenie jest sprawdzane przed użyciem
+        """
+        self._connect = connect
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.health_check_after = health_check_after
+        # Wolne połączenia z czasem zwrotu; ostatnio zwrócone na końcu
+        self._idle: List[Tuple[Any, float]] = []
+        self._in_use = 0
+        self._condition = threading.Condition()
+
+    @staticmethod
+    def _close_quietly(connection: Any) -> None:
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _is_alive(connection: Any) -> bool:
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute("SELECT 1")
+                cursor.fetchall()
+            finally:
+                cursor.close()
+            return True
+        except Exception:
+            return False
+
+    def _evict_idle(self, now: float) -> List[Any]:
+        """
+        Usuwa z puli połączenia bezczynne dłużej niż max_idle (wywoływane pod blokadą).
+
+        Returns:
+            Usunięte połączenia do zamknięcia poza blokadą
+        """
+        expired = [connection for connection, released in self._idle if now - released > self.max_idle]
+        if expired:
+            self._idle = [(connection, released) for connection, released in self._idle if now - released <= self.max_idle]
+        return expired
+
+    def acquire(self) -> PooledConnection:
+        """
+        Wypożycza połączenie z puli, w razie potrzeby tworząc nowe.
+
+        Returns:
+            Obiekt PooledConnection
+
+        Raises:
+            PoolTimeout: Gdy wszystkie połączenia są zajęte dłużej niż timeout
+        """
+        deadline = time.monotonic() + self.timeout
+        while True:
+            with self._condition:
+                while not self._idle and self._in_use >= self.size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeout(f"Brak wolnego połączenia w puli ({self.size}) po {self.timeout} s")
+                    self._condition.wait(remaining)
+                now = time.monotonic()
+                expired = self._evict_idle(now)
+                connection, released = self._idle.pop() if self._idle else (None, now)
+                self._in_use += 1
+
+            for expired_connection in expired:
+                self._close_quietly(expired_connection)
+            if connection is None:
+                try:
+                    return PooledConnection(self, self._connect())
+                except Exception:
+                    self._discard()
+                    raise
+            if now - released <= self.health_check_after or self._is_alive(connection):
+                return PooledConnection(self, connection)
+            # Zerwane połączenie jest zamykane, a pętla bierze kolejne lub tworzy nowe
+            self._close_quietly(connection)
+            self._discard()
+
+    def release(self, connection: Any) -> None:
+        """
+        Zwraca połączenie do puli, wycofując niezatwierdzoną transakcję.
+
+        Args:
+            connection: Połączenie wypożyczone przez acquire
+        """
+        try:
+            connection.rollback()
+        except Exception:
+            self._close_quietly(connection)
+            self._discard()
+            return
+        with self._condition:
+            self._in_use -= 1
+            self._idle.append((connection, time.monotonic()))
+            self._condition.notify()
+
+    def _discard(self) -> None:
+        """Zwalnia miejsce po połączeniu, które zostało zamknięte zamiast zwrócone."""
+        with self._condition:
+            self._in_use -= 1
+            self._condition.notify()
+
+    def close(self) -> None:
+        """Zamyka wszystkie wolne połączenia (wypożyczone są zamykane przy zwrocie)."""
+        with self._condition:
+            idle, self._idle = self._idle, []
+        for connection, _ in idle:
+            self._close_quietly(connection)
+
+    def stats(self) -> dict:
+        """
+        Zwraca liczbę połączeń wolnych i wypożyczonych.
+
+        Returns:
+            Słownik z kluczami idle, in_use i size
+        """
+        with self._condition:
+            return {"idle": len(self._idle), "in_use": self._in_use, "size": self.size}
@@ -0,0 +1,34 @@
+"""
+Pakiet zawierający logikę kalkulatora PTPiREE.
+"""
+from .parser import ParsedFile, build_parsed_file, parse_dat, parse_dat_batch, parse_file, parse_files, get_group_name, get_channel
+from .aggregation import downsample_minmax, expected_hours, matrix_to_hourly
+from .cache import ProfileCache, content_hash, get_profile_cache
+from .ingest import ingest_files, ingest_stream
+from .store import ProfileStore
+from .sources import list_directory, list_subdirectories, iter_directory, list_zip, iter_zip
+
+__all__ = [
+    'ParsedFile',
+    'build_parsed_file',
+    'parse_dat',
+    'parse_dat_batch',
+    'parse_file',
+    'parse_files',
+    'get_group_name',
+    'get_channel',
+    'downsample_minmax',
+    'expected_hours',
+    'matrix_to_hourly',
+    'ProfileCache',
+    'content_hash',
+    'get_profile_cache',
+    'ingest_files',
+    'ingest_stream',
+    'ProfileStore',
+    'list_directory',
+    'list_subdirectories',
+    'iter_directory',
+    'list_zip',
+    'iter_zip'
+]
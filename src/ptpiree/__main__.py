@@ -0,0 +1,8 @@
+"""
+Punkt wejścia przetwarzania wsadowego PTPiREE (python -m src.ptpiree)
+"""
+import sys
+from .cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+Moduł zawierający funkcje agregacji profili PTPiREE
+"""
+import datetime
+import numpy as np
+from typing import Sequence, Tuple
+
+# Maksymalna liczba wartości profilu traktowanego jako godzinowy
+MAX_HOURLY_LENGTH = 25
+
+# Liczba interwałów piętnastominutowych w godzinie
+INTERVALS_PER_HOUR = 4
+
+# Obsługiwane długości profili dobowych (doba 23-, 24- i 25-godzinna)
+HOURLY_LENGTHS = (23, 24, 25)
+QUARTER_HOUR_LENGTHS = (92, 96, 100)
+
+
+def _last_sunday(year: int, month: int) -> datetime.date:
+    """
+    Zwraca datę ostatniej niedzieli miesiąca (dla marca i października).
+    """
+    last_day = datetime.date(year, month, 31)
+    return last_day - datetime.timedelta(days=(last_day.weekday() + 1) % 7)
+
+
+def expected_hours(dates: np.ndarray) -> np.ndarray:
+    """
+    Zwraca oczekiwaną liczbę godzin doby z uwzględnieniem zmiany czasu.
+
+    Doba zmiany czasu na letni (ostatnia niedziela marca) ma 23 godziny,
+    a doba zmiany czasu na zimowy (ostatnia niedziela października) 25 godzin.
+
+    Args:
+        dates: Tablica dat (datetime64[D]), NaT dla nieznanych dat
+
+    Returns:
+        Tablica liczby godzin (0 dla nieznanych dat)
+    """
+    dates = np.asarray(dates, dtype='datetime64[D]')
+    hours = np.where(np.isnat(dates), 0, 24)
+    known = dates[~np.isnat(dates)]
+    if known.size == 0:
+        return hours
+    years = np.unique(known.astype('datetime64[Y]').astype(int) + 1970)
+    spring = np.array([_last_sunday(year, 3) for year in years], dtype='datetime64[D]')
+    autumn = np.array([_last_sunday(year, 10) for year in years], dtype='datetime64[D]')
+    hours[np.isin(dates, spring)] = 23
+    hours[np.isin(dates, autumn)] = 25
+    return hours
+
+
+def matrix_to_hourly(
+    matrix: np.ndarray,
+    lengths: np.ndarray,
+    dates: np.ndarray = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Przelicza macierz profili piętnastominutowych na godzinowe jedną operacją.
+
+    Profile o długości do 25 wartości są traktowane jako godzinowe. Dłuższe
+    profile są sumowane w grupach po 4 wartości (92, 96 i 100 interwałów
+    daje 23, 24 i 25 godzin). Profile o nieobsługiwanej długości lub
+    o liczbie godzin innej niż wynika z daty (zmiana czasu) są zgłaszane.
+
+    Args:
+        matrix: Macierz profili (plik x interwał) uzupełniona wartościami NaN
+        lengths: Rzeczywiste długości profili
+        dates: Daty profili (datetime64[D], opcjonalnie)
+
+    Returns:
+        Krotka (macierz godzinowa, liczby godzin, maska profili niezmapowanych)
+    """
+    lengths = np.asarray(lengths)
+    n_files, width = matrix.shape
+    quarter = lengths > MAX_HOURLY_LENGTH
+    hours = np.where(quarter, -(-lengths // INTERVALS_PER_HOUR), lengths)
+    out_width = int(hours.max()) if n_files else 0
+    hourly = np.full((n_files, out_width), np.nan, dtype=matrix.dtype)
+
+    hourly_rows = np.flatnonzero(~quarter)
+    copy_width = min(width, out_width)
+    hourly[hourly_rows, :copy_width] = matrix[hourly_rows, :copy_width]
+
+    quarter_rows = np.flatnonzero(quarter)
+    if quarter_rows.size:
+        blocks = -(-width // INTERVALS_PER_HOUR)
+        padded = np.full((quarter_rows.size, blocks * INTERVALS_PER_HOUR), np.nan, dtype=matrix.dtype)
+        padded[:, :width] = matrix[quarter_rows]
+        sums = np.nansum(padded.reshape(quarter_rows.size, blocks, INTERVALS_PER_HOUR), axis=2)
+        sums[np.arange(blocks) >= hours[quarter_rows, None]] = np.nan
+        hourly[quarter_rows, :blocks] = sums
+
+    mapped = np.isin(lengths, HOURLY_LENGTHS + QUARTER_HOUR_LENGTHS)
+    if dates is not None:
+        expected = expected_hours(dates)
+        mapped &= (expected == 0) | (hours == expected)
+    return hourly, hours, ~mapped
+
+
+def downsample_minmax(values: Sequence[float], max_points: int) -> np.ndarray:
+    """
+    Zmniejsza liczbę punktów profilu, zachowując minimum i maksimum każdego przedziału.
+
+    Profil jest dzielony na przedziały o równej długości, a z każdego przedziału
+    zostają dwie wartości: najmniejsza i największa, w kolejności występowania.
+    Kształt wykresu (w tym wartości szczytowe) jest zachowany, a liczba punktów
+    nie przekracza max_points. Przy max_points równym 1 zostaje tylko wartość
+    największa.
+
+    Args:
+        values: Wartości profilu
+        max_points: Maksymalna liczba punktów (0 oznacza brak ograniczenia)
+
+    Returns:
+        Tablica wartości po zmniejszeniu liczby punktów
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n_values = len(values)
+    if max_points <= 0 or n_values <= max_points:
+        return values
+    if max_points == 1:
+        return values[[np.argmax(values)]]
+
+    size = -(-n_values // (max_points // 2))
+    buckets = -(-n_values // size)
+    blocks = np.full((buckets, size), np.nan)
+    blocks.reshape(-1)[:n_values] = values
+
+    missing = np.isnan(blocks)
+    low = np.argmin(np.where(missing, np.inf, blocks), axis=1)
+    high = np.argmax(np.where(missing, -np.inf, blocks), axis=1)
+    rows = np.arange(buckets)
+    low_first = low <= high
+    first = np.where(low_first, blocks[rows, low], blocks[rows, high])
+    second = np.where(low_first, blocks[rows, high], blocks[rows, low])
+    return np.column_stack([first, second]).reshape(-1)
@@ -0,0 +1,337 @@
+"""
+Moduł zawierający trwałe archiwum sparsowanych profili PTPiREE (Parquet)
+"""
+import datetime
+import os
+import threading
+import urllib.parse
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from src.core.config import PROJECT_ROOT, get_config_value
+from .parser import ParsedFile, build_parsed_file
+
+# Schemat wierszy archiwum (jeden wiersz na plik, wartości jako lista)
+ARCHIVE_SCHEMA = pa.schema([
+    ("name", pa.string()),
+    ("channel", pa.string()),
+    ("date_label", pa.string()),
+    ("date", pa.date32()),
+    ("content_hash", pa.string()),
+    ("values", pa.list_(pa.float64())),
+    ("point", pa.string()),
+    ("month", pa.string())
+])
+
+# Podział archiwum na katalogi: punkt pomiarowy i miesiąc profilu
+PARTITIONING = ds.partitioning(
+    pa.schema([("point", pa.string()), ("month", pa.string())]),
+    flavor="hive"
+)
+
+# Schemat pliku partycji (kolumny podziału są zapisane w ścieżce katalogu)
+PARTITION_SCHEMA = pa.schema([field for field in ARCHIVE_SCHEMA if field.name not in PARTITIONING.schema.names])
+
+# Wartość partycji miesiąca dla plików bez poprawnej daty
+UNKNOWN_MONTH = "brak"
+
+# Każda partycja jest przechowywana w jednym pliku, przepisywanym przy dopisywaniu profili.
+# Pliki z prefiksem "." (blokada, plik tymczasowy) są pomijane przy odczycie archiwum.
+PARTITION_FILE = "part-0.parquet"
+TEMP_FILE = ".part-0.parquet.tmp"
+LOCK_FILE = ".lock"
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Zapis z kilku wątków jednego procesu jest wykonywany po kolei, a z kilku procesów chroni go plik blokady
+_write_lock = threading.Lock()
+
+# Lista punktów archiwum wraz z kluczem (katalog, data modyfikacji katalogu)
+_points: List[str] = []
+_points_key: Optional[Tuple[str, int]] = None
+_points_lock = threading.Lock()
+
+
+def get_archive_dir() -> str:
+    """
+    Zwraca katalog archiwum profili.
+
+    Returns:
+        Ścieżka katalogu PTPIREE_ARCHIVE_DIR (domyślnie data/ptpiree w katalogu projektu)
+    """
+    return get_config_value("PTPIREE_ARCHIVE_DIR", os.path.join(PROJECT_ROOT, "data", "ptpiree"))
+
+
+def _dataset(root: str) -> Optional[ds.Dataset]:
+    """
+    Otwiera archiwum jako zbiór danych Arrow.
+
+    Args:
+        root: Katalog archiwum
+
+    Returns:
+        Zbiór danych lub None, jeśli archiwum jest puste
+    """
+    if not os.path.isdir(root):
+        return None
+    dataset = ds.dataset(root, schema=ARCHIVE_SCHEMA, format="parquet", partitioning=PARTITIONING)
+    if not dataset.files:
+        return None
+    return dataset
+
+
+@contextmanager
+def _archive_lock(root: str) -> Iterator[None]:
+    """
+    Blokuje archiwum do zapisu na wyłączność, również względem innych procesów.
+
+    Args:
+        root: Katalog archiwum
+
+    Returns:
+        Menedżer kontekstu utrzymujący blokadę
+    """
+    os.makedirs(root, exist_ok=True)
+    with _write_lock, open(os.path.join(root, LOCK_FILE), "a+b") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        else:
+            handle.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _partition_dir(root: str, point: str, month: str) -> str:
+    """
+    Zwraca katalog partycji punktu i miesiąca (nazwy kodowane jak w ds.write_dataset).
+
+    Args:
+        root: Katalog archiwum
+        point: Punkt pomiarowy
+        month: Miesiąc profilu (RRRR-MM lub UNKNOWN_MONTH)
+
+    Returns:
+        Ścieżka katalogu partycji
+    """
+    directory, _ = PARTITIONING.format((ds.field("point") == point) & (ds.field("month") == month))
+    return os.path.join(root, *directory.split("/"))
+
+
+def _write_partition(directory: str, new_rows: pa.Table) -> int:
+    """
+    Dopisuje profile do partycji, pomijając pliki już w niej zapisane.
+
+    Partycja jest zapisywana ponownie jako jeden plik: nowy plik powstaje
+    obok i zastępuje poprzedni dopiero po zapisaniu, a pozostałe pliki
+    partycji (np. z wcześniejszych zapisów) są usuwane.
+
+    Args:
+        directory: Katalog partycji
+        new_rows: Wiersze do dopisania (schemat PARTITION_SCHEMA)
+
+    Returns:
+        Liczba dopisanych plików
+    """
+    old_files = []
+    if os.path.isdir(directory):
+        old_files = [
+            entry.path for entry in os.scandir(directory)
+            if entry.is_file() and not entry.name.startswith((".", "_"))
+        ]
+    existing = ds.dataset(old_files, schema=PARTITION_SCHEMA, format="parquet").to_table() if old_files else None
+
+    known = set(existing.column("content_hash").drop_null().to_pylist()) if existing is not None else set()
+    keep = []
+    for i, content_hash in enumerate(new_rows.column("content_hash").to_pylist()):
+        if content_hash not in known:
+            known.add(content_hash)
+            keep.append(i)
+    if not keep:
+        return 0
+
+    table = new_rows.take(keep)
+    if existing is not None:
+        table = pa.concat_tables([existing, table])
+    os.makedirs(directory, exist_ok=True)
+    temp_path = os.path.join(directory, TEMP_FILE)
+    target = os.path.join(directory, PARTITION_FILE)
+    pq.write_table(table, temp_path)
+    os.replace(temp_path, target)
+    for path in old_files:
+        if path != target:
+            os.remove(path)
+    return len(keep)
+
+
+def _to_table(parsed_files: Sequence[ParsedFile]) -> pa.Table:
+    """
+    Zamienia listę sparsowanych plików na tabelę Arrow.
+
+    Args:
+        parsed_files: Lista obiektów ParsedFile
+
+    Returns:
+        Tabela zgodna ze schematem ARCHIVE_SCHEMA
+    """
+    date_labels = [f.date for f in parsed_files]
+    dates = pd.to_datetime(pd.Series(date_labels, dtype=object), format="%d-%m-%Y", errors="coerce")
+    months = dates.dt.strftime("%Y-%m").fillna(UNKNOWN_MONTH)
+
+    lengths = np.fromiter((len(f.values) for f in parsed_files), dtype=np.int32, count=len(parsed_files))
+    offsets = np.zeros(len(parsed_files) + 1, dtype=np.int32)
+    np.cumsum(lengths, out=offsets[1:])
+    flat = np.concatenate([f.values for f in parsed_files]) if parsed_files else np.empty(0)
+
+    return pa.table({
+        "name": [f.name for f in parsed_files],
+        "channel": [f.channel for f in parsed_files],
+        "date_label": date_labels,
+        "date": pa.array(dates.dt.date.where(dates.notna(), None), type=pa.date32()),
+        "content_hash": [f.content_hash for f in parsed_files],
+        "values": pa.ListArray.from_arrays(pa.array(offsets), pa.array(flat, type=pa.float64())),
+        "point": [f.point for f in parsed_files],
+        "month": months.tolist()
+    }, schema=ARCHIVE_SCHEMA)
+
+
+def save_parsed(parsed_files: Sequence[ParsedFile], root: Optional[str] = None) -> int:
+    """
+    Zapisuje sparsowane pliki w archiwum, pomijając pliki już zapisane.
+
+    Odczytywane i zapisywane są tylko partycje (punkt, miesiąc) zapisywanych
+    plików, więc koszt zapisu nie rośnie z wielkością archiwum. Pliki
+    bez skrótu zawartości nie są zapisywane, bo nie można ich później
+    odróżnić od duplikatów.
+
+    Args:
+        parsed_files: Lista obiektów ParsedFile
+        root: Katalog archiwum (domyślnie PTPIREE_ARCHIVE_DIR)
+
+    Returns:
+        Liczba zapisanych plików
+    """
+    root = root or get_archive_dir()
+    parsed_files = [f for f in parsed_files if f.content_hash is not None]
+    if not parsed_files:
+        return 0
+
+    table = _to_table(parsed_files)
+    partitions: Dict[Tuple[str, str], List[int]] = {}
+    for i, key in enumerate(zip(table.column("point").to_pylist(), table.column("month").to_pylist())):
+        partitions.setdefault(key, []).append(i)
+
+    saved = 0
+    with _archive_lock(root):
+        for (point, month), rows in partitions.items():
+            new_rows = table.take(rows).select(PARTITION_SCHEMA.names)
+            saved += _write_partition(_partition_dir(root, point, month), new_rows)
+    return saved
+
+
+def archive_points(root: Optional[str] = None) -> List[str]:
+    """
+    Zwraca punkty pomiarowe zapisane w archiwum.
+
+    Punkty są odczytywane z nazw katalogów archiwum, a lista jest
+    wyznaczana ponownie tylko po zmianie daty modyfikacji katalogu
+    (czyli po dodaniu nowego punktu).
+
+    Args:
+        root: Katalog archiwum (domyślnie PTPIREE_ARCHIVE_DIR)
+
+    Returns:
+        Posortowana lista nazw punktów
+    """
+    global _points, _points_key
+    root = root or get_archive_dir()
+    if not os.path.isdir(root):
+        return []
+    key = (os.path.abspath(root), os.stat(root).st_mtime_ns)
+    with _points_lock:
+        if key != _points_key:
+            _points = sorted(
+                urllib.parse.unquote(entry.name[len("point="):]) for entry in os.scandir(root)
+                if entry.is_dir() and entry.name.startswith("point=")
+            )
+            _points_key = key
+        return list(_points)
+
+
+def load_parsed(
+    root: Optional[str] = None,
+    points: Optional[Sequence[str]] = None,
+    channels: Optional[Sequence[str]] = None,
+    date_from: Optional[datetime.date] = None,
+    date_to: Optional[datetime.date] = None
+) -> List[ParsedFile]:
+    """
+    Odczytuje pliki z archiwum, filtrując je po punkcie, kanale i dacie profilu.
+
+    Filtry punktu i daty zawężają odczyt do pasujących katalogów archiwum,
+    więc odczytywane są tylko potrzebne kolumny i partycje.
+
+    Args:
+        root: Katalog archiwum (domyślnie PTPIREE_ARCHIVE_DIR)
+        points: Punkty pomiarowe (None oznacza wszystkie)
+        channels: Kanały (None oznacza wszystkie)
+        date_from: Najwcześniejsza data profilu (włącznie)
+        date_to: Najpóźniejsza data profilu (włącznie)
+
+    Returns:
+        Lista obiektów ParsedFile posortowana po dacie profilu i nazwie pliku
+    """
+    dataset = _dataset(root or get_archive_dir())
+    if dataset is None:
+        return []
+
+    conditions = []
+    if points is not None:
+        conditions.append(ds.field("point").isin(list(points)))
+    if channels is not None:
+        conditions.append(ds.field("channel").isin(list(channels)))
+    if date_from is not None:
+        conditions.append(ds.field("month") >= date_from.strftime("%Y-%m"))
+        conditions.append(ds.field("date") >= date_from)
+    if date_to is not None:
+        conditions.append(ds.field("month") <= date_to.strftime("%Y-%m"))
+        conditions.append(ds.field("date") <= date_to)
+    condition = None
+    for expression in conditions:
+        condition = expression if condition is None else condition & expression
+
+    table = dataset.to_table(columns=["name", "date_label", "date", "content_hash", "values"], filter=condition)
+    if table.num_rows == 0:
+        return []
+    table = table.sort_by([("date", "ascending"), ("name", "ascending")])
+    values_column = table.column("values").combine_chunks()
+    values = values_column.flatten().to_numpy(zero_copy_only=False)
+    offsets = values_column.offsets.to_numpy()
+    offsets = offsets - offsets[0]
+    return [
+        build_parsed_file(name, date_label, values[offsets[i]:offsets[i + 1]], content_hash)
+        for i, (name, date_label, content_hash) in enumerate(zip(
+            table.column("name").to_pylist(),
+            table.column("date_label").to_pylist(),
+            table.column("content_hash").to_pylist()
+        ))
+    ]
@@ -0,0 +1,113 @@
+"""
+Moduł zawierający pamięć podręczną sparsowanych profili PTPiREE
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+from src.core.config import get_config_value
+from .parser import ParsedFile
+
+# Przybliżony narzut pamięci pojedynczego wpisu (obiekt, klucz, metadane)
+ENTRY_OVERHEAD_BYTES = 512
+
+
+def content_hash(data: bytes) -> str:
+    """
+    Zwraca skrót zawartości pliku używany jako klucz pamięci podręcznej.
+
+    Args:
+        data: Zawartość pliku
+
+    Returns:
+        Skrót zawartości w postaci szesnastkowej
+    """
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class ProfileCache:
+    """
+    Pamięć podręczna LRU sparsowanych plików z limitem zajmowanej pamięci.
+    """
+
+    def __init__(self, max_bytes: int):
+        """
+        Inicjalizuje pustą pamięć podręczną.
+
+        Args:
+            max_bytes: Maksymalny rozmiar przechowywanych profili w bajtach
+        """
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self._entries: "OrderedDict[str, ParsedFile]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _entry_size(parsed_file: ParsedFile) -> int:
+        return parsed_file.values.nbytes + ENTRY_OVERHEAD_BYTES
+
+    def get(self, key: str) -> Optional[ParsedFile]:
+        """
+        Zwraca wpis dla podanego skrótu i oznacza go jako ostatnio użyty.
+
+        Args:
+            key: Skrót zawartości pliku
+
+        Returns:
+            Obiekt ParsedFile lub None, jeśli wpisu nie ma w pamięci
+        """
+        with self._lock:
+            parsed_file = self._entries.get(key)
+            if parsed_file is not None:
+                self._entries.move_to_end(key)
+            return parsed_file
+
+    def put(self, key: str, parsed_file: ParsedFile) -> None:
+        """
+        Zapisuje wpis i usuwa najdawniej używane wpisy po przekroczeniu limitu.
+
+        Args:
+            key: Skrót zawartości pliku
+            parsed_file: Sparsowany plik
+        """
+        size = self._entry_size(parsed_file)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.size_bytes -= self._entry_size(self._entries.pop(key))
+            self._entries[key] = parsed_file
+            self.size_bytes += size
+            while self.size_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size_bytes -= self._entry_size(evicted)
+
+    def clear(self) -> None:
+        """
+        Usuwa wszystkie wpisy.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Pamięć podręczna współdzielona przez wszystkie sesje w procesie
+_profile_cache: Optional[ProfileCache] = None
+_profile_cache_lock = threading.Lock()
+
+
+def get_profile_cache() -> ProfileCache:
+    """
+    Zwraca współdzieloną pamięć podręczną profili.
+
+    Returns:
+        Obiekt ProfileCache o rozmiarze PTPIREE_CACHE_MB
+    """
+    global _profile_cache
+    with _profile_cache_lock:
+        if _profile_cache is None:
+            _profile_cache = ProfileCache(get_config_value("PTPIREE_CACHE_MB", 256) * 1024 * 1024)
+        return _profile_cache
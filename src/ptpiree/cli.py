@@ -0,0 +1,165 @@
+"""
+Moduł zawierający wsadowe uruchamianie kalkulatora PTPiREE z linii poleceń
+
+Przykład:
+    python -m src.ptpiree input/2024-03 --output wyniki --workers 8
+"""
+import argparse
+import datetime
+import os
+import sys
+import zipfile
+from typing import List, Optional
+from src.core.config import get_config_value
+from .export import SUMMARY_TITLES, build_profiles_workbook, build_summary_workbook
+from .ingest import DEFAULT_BATCH_SIZE, ingest_stream
+from .sources import iter_directory, iter_zip, list_directory, list_zip
+from .store import ProfileStore
+
+# Kanały uwzględniane w raportach (CPP jest pomijany, tak jak w aplikacji)
+REPORT_CHANNELS = ("CP", "CO")
+
+
+def load_store(
+    input_path: str,
+    workers: int = 1,
+    recursive: bool = True,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    archive: bool = False,
+    verbose: bool = False
+) -> ProfileStore:
+    """
+    Wczytuje pliki CP i CO z katalogu lub archiwum ZIP do magazynu profili.
+
+    Args:
+        input_path: Katalog z plikami .dat lub archiwum ZIP
+        workers: Liczba procesów roboczych
+        recursive: Czy przeszukiwać podkatalogi
+        batch_size: Liczba plików w jednej paczce
+        archive: Czy zapisywać sparsowane profile w archiwum Parquet
+        verbose: Czy wypisywać postęp na standardowe wyjście błędów
+
+    Returns:
+        Obiekt ProfileStore
+    """
+    def report(done, total):
+        print(f"Przetworzono {done} z {total} plików", file=sys.stderr)
+
+    batch_callback = None
+    if archive:
+        from .archive import save_parsed
+        batch_callback = save_parsed
+
+    store = ProfileStore()
+    if zipfile.is_zipfile(input_path):
+        with zipfile.ZipFile(input_path) as source:
+            members = list_zip(source, channels=REPORT_CHANNELS)
+            ingest_stream(
+                iter_zip(source, members), store, batch_size=batch_size, skip_duplicates=False,
+                workers=workers, progress_callback=report if verbose else None, total=len(members),
+                batch_callback=batch_callback
+            )
+    else:
+        paths = list_directory(input_path, channels=REPORT_CHANNELS, recursive=recursive)
+        ingest_stream(
+            iter_directory(paths), store, batch_size=batch_size, skip_duplicates=False,
+            workers=workers, progress_callback=report if verbose else None, total=len(paths),
+            batch_callback=batch_callback
+        )
+    return store
+
+
+def write_reports(store: ProfileStore, output_dir: str, profiles: bool = True) -> List[str]:
+    """
+    Zapisuje raporty zbiorcze CP i CO oraz plik z profilami.
+
+    Nazwy plików odpowiadają nazwom plików pobieranych z aplikacji.
+
+    Args:
+        store: Magazyn profili
+        output_dir: Katalog wynikowy
+        profiles: Czy zapisać plik z profilami
+
+    Returns:
+        Lista ścieżek zapisanych plików
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+    written = []
+
+    def write(file_prefix, data):
+        path = os.path.join(output_dir, f"{file_prefix}_{timestamp}.xlsx")
+        with open(path, "wb") as f:
+            f.write(data)
+        written.append(path)
+
+    for channel in REPORT_CHANNELS:
+        df = store.summary(channel)
+        if not df.empty:
+            write(f"ptpire_{channel}", build_summary_workbook(df, SUMMARY_TITLES[channel]))
+    if profiles and len(store):
+        write("ptpire_profiles", build_profiles_workbook(store))
+    return written
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Tworzy parser argumentów linii poleceń.
+
+    Returns:
+        Obiekt ArgumentParser
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m src.ptpiree",
+        description="Wsadowe przetwarzanie plików PTPiREE: raporty CP i CO oraz plik z profilami."
+    )
+    parser.add_argument("input", help="Katalog z plikami .dat lub archiwum ZIP")
+    parser.add_argument("-o", "--output", default=".", help="Katalog wynikowy (domyślnie bieżący)")
+    parser.add_argument(
+        "-w", "--workers", type=int, default=get_config_value("PTPIREE_WORKERS", 1),
+        help="Liczba procesów przetwarzających pliki (domyślnie PTPIREE_WORKERS)"
+    )
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Liczba plików w jednej paczce")
+    parser.add_argument("--no-recursive", action="store_true", help="Nie przeszukuj podkatalogów")
+    parser.add_argument("--no-profiles", action="store_true", help="Nie zapisuj pliku z profilami")
+    parser.add_argument("--archive", action="store_true", help="Zapisz sparsowane profile w archiwum Parquet")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Nie wypisuj postępu")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Uruchamia przetwarzanie wsadowe.
+
+    Args:
+        argv: Argumenty linii poleceń (domyślnie sys.argv)
+
+    Returns:
+        Kod wyjścia procesu
+    """
+    args = build_parser().parse_args(argv)
+    if not os.path.exists(args.input):
+        print(f"Nie znaleziono: {args.input}", file=sys.stderr)
+        return 2
+
+    store = load_store(
+        args.input,
+        workers=max(1, args.workers),
+        recursive=not args.no_recursive,
+        batch_size=args.batch_size,
+        archive=args.archive,
+        verbose=not args.quiet
+    )
+    if not len(store):
+        print("Nie znaleziono plików CP ani CO.", file=sys.stderr)
+        return 1
+
+    for path in write_reports(store, args.output, profiles=not args.no_profiles):
+        print(path)
+    if len(store.unmapped) and not args.quiet:
+        print(
+            f"Liczba wartości w {len(store.unmapped)} plikach nie odpowiada długości doby:",
+            file=sys.stderr
+        )
+        print(store.unmapped_report().to_string(index=False), file=sys.stderr)
+    return 0
@@ -0,0 +1,169 @@
+"""
+Moduł zawierający eksport wyników kalkulatora PTPiREE do plików Excel
+"""
+import collections
+import datetime
+import io
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, Side
+from typing import Iterable, List, Optional
+from .store import ProfileStore
+
+# Formaty liczbowe komórek
+VALUE_FORMAT = '0.000'
+COUNT_FORMAT = '0'
+DATETIME_FORMAT = 'YYYY-MM-DD HH:MM:SS'
+
+# Tytuły raportów zbiorczych dla kanałów
+SUMMARY_TITLES = {
+    "CP": "Raport ilości plików PTPiREE - Energia czynna pobrana",
+    "CO": "Raport ilości plików PTPiREE - Energia czynna oddana"
+}
+
+# Styl nagłówka tabeli (taki sam, jak nadaje pandas.DataFrame.to_excel)
+_THIN = Side(style='thin')
+HEADER_FONT = Font(bold=True)
+HEADER_BORDER = Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THIN)
+HEADER_ALIGNMENT = Alignment(horizontal='center', vertical='top')
+
+
+def _cell(ws, value, number_format: Optional[str] = None, font: Optional[Font] = None) -> WriteOnlyCell:
+    """
+    Tworzy komórkę arkusza w trybie tylko do zapisu.
+
+    Args:
+        ws: Arkusz w trybie tylko do zapisu
+        value: Wartość komórki
+        number_format: Format liczbowy (opcjonalnie)
+        font: Czcionka (opcjonalnie)
+
+    Returns:
+        Komórka WriteOnlyCell
+    """
+    cell = WriteOnlyCell(ws, value=value)
+    if number_format:
+        cell.number_format = number_format
+    if font:
+        cell.font = font
+    return cell
+
+
+def _header_row(ws, columns: Iterable[str]) -> List[WriteOnlyCell]:
+    """
+    Tworzy wiersz nagłówka tabeli.
+
+    Args:
+        ws: Arkusz w trybie tylko do zapisu
+        columns: Nazwy kolumn
+
+    Returns:
+        Lista komórek nagłówka
+    """
+    cells = []
+    for column in columns:
+        cell = _cell(ws, column, font=HEADER_FONT)
+        cell.border = HEADER_BORDER
+        cell.alignment = HEADER_ALIGNMENT
+        cells.append(cell)
+    return cells
+
+
+def _formatted_cells(ws, values: Iterable, number_format: str) -> List[WriteOnlyCell]:
+    """
+    Tworzy osobną komórkę z formatem liczbowym dla każdej wartości.
+
+    Args:
+        ws: Arkusz w trybie tylko do zapisu
+        values: Wartości komórek
+        number_format: Format liczbowy
+
+    Returns:
+        Lista komórek
+    """
+    return [_cell(ws, value, number_format) for value in values]
+
+
+def _to_bytes(wb: Workbook) -> bytes:
+    output = io.BytesIO()
+    wb.save(output)
+    return output.getvalue()
+
+
+def build_summary_workbook(df: pd.DataFrame, title: str) -> bytes:
+    """
+    Tworzy raport zbiorczy (ilość plików i wolumen dla każdej grupy).
+
+    Args:
+        df: Tabela zbiorcza z kolumnami Lp, Nazwa, Data, Suma, Pliki i opcjonalnie Profil
+        title: Tytuł raportu zapisywany w pierwszym wierszu
+
+    Returns:
+        Zawartość pliku xlsx
+    """
+    df_to_excel = df.drop(columns=['Profil'], errors='ignore')
+    columns = list(df_to_excel.columns)
+    suma_idx = columns.index('Suma') if 'Suma' in columns else None
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('Sheet1')
+    ws.append([None, _cell(ws, title, font=Font(size=14, bold=True))])
+    ws.append([])
+    ws.append(_header_row(ws, columns))
+    rows = df_to_excel.astype(object).where(df_to_excel.notna(), None).values.tolist()
+    for row in rows:
+        if suma_idx is not None:
+            row[suma_idx] = _cell(ws, row[suma_idx], VALUE_FORMAT)
+        ws.append(row)
+
+    if suma_idx is not None:
+        ws.append([])
+        ws.append([None, "Ilość plików sumarycznie", _cell(ws, int(df_to_excel['Pliki'].sum()), COUNT_FORMAT)])
+        ws.append([None, "Całkowity wolumen", _cell(ws, float(df_to_excel['Suma'].sum()), VALUE_FORMAT)])
+        ws.append([None, "Data wykonania raportu", _cell(ws, datetime.datetime.now(), DATETIME_FORMAT)])
+    return _to_bytes(wb)
+
+
+def build_profiles_workbook(store: ProfileStore) -> bytes:
+    """
+    Tworzy plik z profilami wszystkich plików, z osobnym arkuszem dla każdej grupy.
+
+    Arkusze są zapisywane strumieniowo, więc zużycie pamięci nie rośnie
+    z liczbą plików.
+
+    Args:
+        store: Magazyn profili
+
+    Returns:
+        Zawartość pliku xlsx
+    """
+    wb = Workbook(write_only=True)
+    # Nazwy arkuszy muszą być unikalne, więc nazwa grupy występująca w kilku kanałach jest uzupełniana kodem kanału
+    name_counts = collections.Counter(store.groups)
+    for group_name, channel in zip(store.groups, store.group_channels):
+        rows = store.group_rows(channel, group_name)
+        if rows.size == 0:
+            continue
+        max_length = int(store.lengths[rows].max())
+
+        # Sortowanie po dacie profilu (pliki bez poprawnej daty na końcu)
+        dates = store.dates[rows]
+        order = rows[np.argsort(dates, kind='stable')]
+        date_labels = pd.Series(store.dates[order]).dt.strftime("%d-%m-%Y").tolist()
+
+        sheet_name = f"{group_name} {channel}" if name_counts[group_name] > 1 else group_name
+        ws = wb.create_sheet(sheet_name)
+        ws.append([f"Profile plików PTPiREE - {sheet_name}"])
+        ws.append([])
+        ws.append(_header_row(ws, ["Nazwa pliku", "Data profilu"] + [f"{i+1}" for i in range(max_length)]))
+        for row, date_label in zip(order, date_labels):
+            profile = store.profile(row).tolist()
+            padded_profile = profile + [None] * (max_length - len(profile))
+            date_label = date_label if isinstance(date_label, str) else None
+            ws.append([store.file_key(row)] + _formatted_cells(ws, [date_label] + padded_profile, VALUE_FORMAT))
+
+        ws.append([])
+        ws.append(["Data wygenerowania", _cell(ws, datetime.datetime.now(), DATETIME_FORMAT)])
+    return _to_bytes(wb)
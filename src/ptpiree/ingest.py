@@ -0,0 +1,164 @@
+"""
+Moduł zawierający równoległe wczytywanie paczek plików PTPiREE
+"""
+import itertools
+from concurrent.futures import as_completed
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+from src.core.shared import process_pool
+from .cache import ProfileCache, content_hash
+from .parser import ParsedFile, build_parsed_file, parse_files
+from .store import ProfileStore
+
+# Liczba plików przekazywanych do procesu roboczego w jednym zadaniu
+DEFAULT_CHUNK_SIZE = 200
+
+# Liczba plików odczytywanych ze źródła strumieniowego przed dołączeniem do magazynu
+DEFAULT_BATCH_SIZE = 2000
+
+def _ingest_chunk(files: Sequence[Tuple[str, bytes]]) -> List[ParsedFile]:
+    """
+    Parsuje porcję plików w procesie roboczym.
+
+    Args:
+        files: Lista krotek (nazwa pliku, zawartość pliku)
+
+    Returns:
+        Lista obiektów ParsedFile
+    """
+    return parse_files(files)
+
+
+def _ingest_parallel(
+    files: Sequence[Tuple[str, bytes]],
+    workers: int,
+    chunk_size: int,
+    progress_callback: Optional[Callable[[int, int], None]]
+) -> List[ParsedFile]:
+    """
+    Przetwarza pliki porcjami w bieżącym procesie lub w puli procesów.
+
+    Args:
+        files: Lista krotek (nazwa pliku, zawartość pliku)
+        workers: Liczba procesów roboczych
+        chunk_size: Liczba plików w jednym zadaniu
+        progress_callback: Funkcja raportująca postęp
+
+    Returns:
+        Lista obiektów ParsedFile w kolejności wejściowej
+    """
+    total = len(files)
+    chunks = [files[i:i + chunk_size] for i in range(0, total, chunk_size)]
+    results: List[List[ParsedFile]] = [[] for _ in chunks]
+    done = 0
+
+    if workers <= 1 or len(chunks) <= 1:
+        for idx, chunk in enumerate(chunks):
+            results[idx] = _ingest_chunk(chunk)
+            done += len(chunk)
+            if progress_callback:
+                progress_callback(done, total)
+    else:
+        with process_pool(workers) as executor:
+            futures = {executor.submit(_ingest_chunk, chunk): idx for idx, chunk in enumerate(chunks)}
+            for future in as_completed(futures):
+                idx = futures[future]
+                results[idx] = future.result()
+                done += len(chunks[idx])
+                if progress_callback:
+                    progress_callback(done, total)
+
+    return [parsed_file for chunk_result in results for parsed_file in chunk_result]
+
+
+def ingest_files(
+    files: Sequence[Tuple[str, bytes]],
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    cache: Optional[ProfileCache] = None
+) -> List[ParsedFile]:
+    """
+    Wczytuje paczkę plików PTPiREE, opcjonalnie w wielu procesach.
+
+    Pliki, których zawartość jest już w pamięci podręcznej, nie są parsowane
+    ponownie, a postęp jest raportowany tylko dla plików faktycznie parsowanych.
+
+    Args:
+        files: Lista krotek (nazwa pliku, zawartość pliku)
+        workers: Liczba procesów roboczych (1 oznacza przetwarzanie w bieżącym procesie)
+        chunk_size: Liczba plików w jednym zadaniu
+        progress_callback: Funkcja wywoływana z (liczba przetworzonych plików, liczba plików do przetworzenia)
+        cache: Pamięć podręczna sparsowanych plików (opcjonalnie)
+
+    Returns:
+        Lista obiektów ParsedFile w kolejności wejściowej
+    """
+    hashes = [content_hash(data) for _, data in files]
+    results: List[Optional[ParsedFile]] = [None] * len(files)
+    missing = []
+    for i, (name, _) in enumerate(files):
+        cached = cache.get(hashes[i]) if cache is not None else None
+        if cached is None:
+            missing.append(i)
+        else:
+            results[i] = build_parsed_file(name, cached.date, cached.values, hashes[i])
+
+    parsed_files = _ingest_parallel([files[i] for i in missing], workers, chunk_size, progress_callback)
+    for i, parsed_file in zip(missing, parsed_files):
+        parsed_file.content_hash = hashes[i]
+        if cache is not None:
+            cache.put(hashes[i], parsed_file)
+        results[i] = parsed_file
+
+    return results
+
+
+def ingest_stream(
+    files: Iterable[Tuple[str, bytes]],
+    store: ProfileStore,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    skip_duplicates: bool = True,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    total: Optional[int] = None,
+    cache: Optional[ProfileCache] = None,
+    batch_callback: Optional[Callable[[List[ParsedFile]], None]] = None
+) -> int:
+    """
+    Wczytuje pliki ze źródła strumieniowego (archiwum ZIP, katalog) do magazynu profili.
+
+    Pliki są pobierane ze źródła paczkami, a zawartość paczki jest zwalniana
+    po dołączeniu jej profili do magazynu, więc w pamięci nie są trzymane
+    zawartości wszystkich plików naraz.
+
+    Args:
+        files: Iterator krotek (nazwa pliku, zawartość pliku)
+        store: Magazyn, do którego dołączane są profile
+        batch_size: Liczba plików w jednej paczce
+        skip_duplicates: Czy pomijać pliki o zawartości już obecnej w magazynie
+        workers: Liczba procesów roboczych
+        chunk_size: Liczba plików w jednym zadaniu procesu roboczego
+        progress_callback: Funkcja wywoływana z (liczba odczytanych plików, liczba wszystkich plików)
+        total: Liczba wszystkich plików źródła (do raportowania postępu)
+        cache: Pamięć podręczna sparsowanych plików (opcjonalnie)
+        batch_callback: Funkcja wywoływana z listą sparsowanych plików każdej paczki (np. zapis w archiwum)
+
+    Returns:
+        Liczba plików dołączonych do magazynu
+    """
+    iterator = iter(files)
+    done = 0
+    added = 0
+    while True:
+        batch = list(itertools.islice(iterator, batch_size))
+        if not batch:
+            break
+        parsed_files = ingest_files(batch, workers=workers, chunk_size=chunk_size, cache=cache)
+        added += store.append(parsed_files, skip_duplicates=skip_duplicates)
+        if batch_callback:
+            batch_callback(parsed_files)
+        done += len(batch)
+        if progress_callback:
+            progress_callback(done, total if total is not None else done)
+    return added
@@ -0,0 +1,233 @@
+"""
+Moduł zawierający parser plików pomiarowych PTPiREE (.dat)
+"""
+import numpy as np
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+# Liczba linii nagłówka poprzedzających wartości pomiarowe
+HEADER_LINES = 6
+
+# Numer linii nagłówka zawierającej datę profilu
+DATE_LINE = 4
+
+# Liczba linii na końcu pliku, które nie zawierają wartości
+FOOTER_LINES = 2
+
+# Długość znacznika statusu na końcu każdej linii z wartością
+STATUS_SUFFIX_LENGTH = 2
+
+# Znaczniki kanałów pomiarowych w nazwach plików (CPP sprawdzany jako pierwszy)
+CHANNELS = ('CPP', 'CP', 'CO')
+
+
+@dataclass
+class ParsedFile:
+    """
+    Wynik jednokrotnego odczytu pliku PTPiREE: metadane i wartości profilu.
+    """
+    name: str
+    group: str
+    point: str
+    channel: Optional[str]
+    date: Optional[str]
+    values: np.ndarray
+    content_hash: Optional[str] = None
+
+
+def get_group_name(file_name: str) -> str:
+    """
+    Zwraca nazwę grupy pliku (część nazwy przed datą).
+
+    Args:
+        file_name: Nazwa pliku
+
+    Returns:
+        Nazwa grupy
+    """
+    return file_name.split("_2")[0]
+
+
+def get_channel(file_name: str) -> Optional[str]:
+    """
+    Zwraca kanał pomiarowy (CP, CO lub CPP) zapisany w nazwie pliku.
+
+    Args:
+        file_name: Nazwa pliku
+
+    Returns:
+        Kod kanału lub None, jeśli nazwa nie zawiera znacznika kanału
+    """
+    for channel in CHANNELS:
+        if f"_{channel}_" in file_name:
+            return channel
+    return None
+
+
+def build_parsed_file(name: str, date: Optional[str], values: np.ndarray, content_hash: Optional[str] = None) -> ParsedFile:
+    """
+    Tworzy obiekt ParsedFile, wyznaczając metadane z nazwy pliku.
+
+    Args:
+        name: Nazwa pliku
+        date: Data profilu z nagłówka
+        values: Wartości profilu
+        content_hash: Skrót zawartości pliku (opcjonalnie)
+
+    Returns:
+        Obiekt ParsedFile
+    """
+    group = get_group_name(name)
+    channel = get_channel(name)
+    point = group.split(f"_{channel}")[0] if channel else group
+    return ParsedFile(
+        name=name,
+        group=group,
+        point=point,
+        channel=channel,
+        date=date,
+        values=values,
+        content_hash=content_hash
+    )
+
+
+def _split_content(data: bytes) -> Tuple[Optional[str], List[bytes]]:
+    """
+    Dzieli zawartość pliku na linie jeden raz i wycina datę oraz wartości.
+
+    Args:
+        data: Zawartość pliku .dat
+
+    Returns:
+        Krotka (data profilu, lista niepustych tekstów wartości bez znacznika statusu)
+    """
+    lines = data.split(b"\n")
+    try:
+        profile_date = lines[DATE_LINE].decode("utf-8").strip()
+    except IndexError:
+        profile_date = None
+    tokens = [line.strip()[:-STATUS_SUFFIX_LENGTH].strip() for line in lines[HEADER_LINES:-FOOTER_LINES]]
+    return profile_date, [token for token in tokens if token]
+
+
+def _to_float_array(tokens: List[bytes]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Konwertuje listę tekstów na tablicę liczb jedną operacją NumPy.
+
+    Jeśli którykolwiek tekst nie jest liczbą, każdy tekst jest konwertowany
+    osobno funkcją float() (ta sama reguła co przy konwersji NumPy), a
+    niepoprawne są odrzucane. Wynik pliku nie zależy więc od tego, czy
+    w tej samej paczce był plik z uszkodzoną linią.
+
+    Args:
+        tokens: Lista tekstów wartości
+
+    Returns:
+        Krotka (tablica wartości, maska zachowanych tekstów)
+    """
+    raw = np.array(tokens, dtype=np.bytes_)
+    keep = np.ones(len(tokens), dtype=bool)
+    try:
+        return raw.astype(np.float64), keep
+    except ValueError:
+        values = []
+        keep = np.zeros(len(tokens), dtype=bool)
+        for i, token in enumerate(tokens):
+            try:
+                values.append(float(token))
+            except ValueError:
+                continue
+            keep[i] = True
+        return np.array(values, dtype=np.float64), keep
+
+
+def _parse_batch(buffers: Sequence[bytes]) -> Tuple[List[Optional[str]], np.ndarray, np.ndarray]:
+    """
+    Parsuje paczkę plików .dat, zwracając daty profili i wartości.
+
+    Args:
+        buffers: Zawartości plików .dat
+
+    Returns:
+        Krotka (daty profili, wartości wszystkich plików, przesunięcia początków plików)
+    """
+    dates = []
+    tokens = []
+    counts = np.zeros(len(buffers), dtype=np.int64)
+    for i, data in enumerate(buffers):
+        profile_date, file_tokens = _split_content(data)
+        dates.append(profile_date)
+        counts[i] = len(file_tokens)
+        tokens.extend(file_tokens)
+
+    values, keep = _to_float_array(tokens)
+    if not keep.all():
+        # Przeliczenie liczby wartości plików po odrzuceniu niepoprawnych linii
+        file_ids = np.repeat(np.arange(len(buffers)), counts)
+        counts = np.bincount(file_ids[keep], minlength=len(buffers))
+
+    offsets = np.zeros(len(buffers) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return dates, values, offsets
+
+
+def parse_dat_batch(buffers: Sequence[bytes]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Parsuje paczkę plików .dat do jednej tablicy NumPy.
+
+    Wartości wszystkich plików są zapisane jedna za drugą, a profil
+    i-tego pliku to values[offsets[i]:offsets[i + 1]].
+
+    Args:
+        buffers: Zawartości plików .dat
+
+    Returns:
+        Krotka (wartości wszystkich plików, przesunięcia początków plików)
+    """
+    _, values, offsets = _parse_batch(buffers)
+    return values, offsets
+
+
+def parse_dat(data: bytes) -> np.ndarray:
+    """
+    Parsuje pojedynczy plik .dat.
+
+    Args:
+        data: Zawartość pliku .dat
+
+    Returns:
+        Tablica wartości profilu
+    """
+    values, _ = parse_dat_batch([data])
+    return values
+
+
+def parse_files(files: Sequence[Tuple[str, bytes]]) -> List[ParsedFile]:
+    """
+    Parsuje paczkę plików, odczytując każdy plik dokładnie raz.
+
+    Args:
+        files: Lista krotek (nazwa pliku, zawartość pliku)
+
+    Returns:
+        Lista obiektów ParsedFile w kolejności wejściowej
+    """
+    dates, values, offsets = _parse_batch([data for _, data in files])
+    return [
+        build_parsed_file(name, dates[i], values[offsets[i]:offsets[i + 1]])
+        for i, (name, _) in enumerate(files)
+    ]
+
+
+def parse_file(name: str, data: bytes) -> ParsedFile:
+    """
+    Parsuje pojedynczy plik PTPiREE.
+
+    Args:
+        name: Nazwa pliku
+        data: Zawartość pliku
+
+    Returns:
+        Obiekt ParsedFile
+    """
+    return parse_files([(name, data)])[0]
@@ -0,0 +1,113 @@
+"""
+Moduł zawierający źródła plików PTPiREE: archiwa ZIP i katalogi na serwerze
+"""
+import os
+import zipfile
+from pathlib import Path, PurePosixPath
+from typing import Iterator, List, Optional, Sequence, Tuple
+from .parser import get_channel
+
+# Rozszerzenie plików pomiarowych PTPiREE
+DAT_SUFFIX = ".dat"
+
+
+def _accepts(file_name: str, channels: Optional[Sequence[str]]) -> bool:
+    """
+    Sprawdza, czy plik jest plikiem .dat z jednego z wybranych kanałów.
+
+    Args:
+        file_name: Nazwa pliku
+        channels: Akceptowane kanały (None oznacza wszystkie)
+
+    Returns:
+        True, jeśli plik ma zostać wczytany
+    """
+    if not file_name.lower().endswith(DAT_SUFFIX):
+        return False
+    return channels is None or get_channel(file_name) in channels
+
+
+def list_subdirectories(root: str) -> List[str]:
+    """
+    Zwraca katalog główny i jego podkatalogi (ścieżki względne, posortowane).
+
+    Args:
+        root: Katalog główny z plikami
+
+    Returns:
+        Lista ścieżek względnych ("." oznacza katalog główny)
+    """
+    if not os.path.isdir(root):
+        return []
+    subdirectories = [
+        os.path.relpath(path, root)
+        for path, _, _ in os.walk(root)
+    ]
+    return sorted(subdirectories)
+
+
+def list_directory(path: str, channels: Optional[Sequence[str]] = None, recursive: bool = True) -> List[str]:
+    """
+    Zwraca ścieżki plików .dat w katalogu bez odczytywania ich zawartości.
+
+    Args:
+        path: Katalog z plikami
+        channels: Akceptowane kanały (None oznacza wszystkie)
+        recursive: Czy przeszukiwać podkatalogi
+
+    Returns:
+        Posortowana lista ścieżek plików
+    """
+    directory = Path(path)
+    candidates = directory.rglob("*") if recursive else directory.iterdir()
+    return sorted(
+        str(candidate) for candidate in candidates
+        if candidate.is_file() and _accepts(candidate.name, channels)
+    )
+
+
+def iter_directory(paths: Sequence[str]) -> Iterator[Tuple[str, bytes]]:
+    """
+    Odczytuje pliki kolejno, nie trzymając w pamięci zawartości wszystkich plików.
+
+    Args:
+        paths: Ścieżki plików
+
+    Returns:
+        Generator krotek (nazwa pliku, zawartość pliku)
+    """
+    for path in paths:
+        with open(path, "rb") as f:
+            yield os.path.basename(path), f.read()
+
+
+def list_zip(archive: zipfile.ZipFile, channels: Optional[Sequence[str]] = None) -> List[zipfile.ZipInfo]:
+    """
+    Zwraca pliki .dat zapisane w archiwum ZIP bez ich rozpakowywania.
+
+    Args:
+        archive: Otwarte archiwum ZIP
+        channels: Akceptowane kanały (None oznacza wszystkie)
+
+    Returns:
+        Lista opisów plików archiwum
+    """
+    return [
+        member for member in archive.infolist()
+        if not member.is_dir() and _accepts(PurePosixPath(member.filename).name, channels)
+    ]
+
+
+def iter_zip(archive: zipfile.ZipFile, members: Sequence[zipfile.ZipInfo]) -> Iterator[Tuple[str, bytes]]:
+    """
+    Rozpakowuje pliki archiwum kolejno, jeden plik na raz.
+
+    Args:
+        archive: Otwarte archiwum ZIP
+        members: Opisy plików do odczytania
+
+    Returns:
+        Generator krotek (nazwa pliku, zawartość pliku)
+    """
+    for member in members:
+        yield PurePosixPath(member.filename).name, archive.read(member)
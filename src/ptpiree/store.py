@@ -0,0 +1,346 @@
+"""
+Moduł zawierający kolumnowy magazyn profili PTPiREE
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+from .aggregation import expected_hours, matrix_to_hourly
+from .parser import ParsedFile
+
+
+def _grow(array: np.ndarray, size: int, fill) -> np.ndarray:
+    """
+    Wydłuża tablicę agregatów do podanego rozmiaru, uzupełniając ją wartością fill.
+    """
+    if len(array) >= size:
+        return array
+    return np.concatenate([array, np.full(size - len(array), fill, dtype=array.dtype)])
+
+
+def _stack_rows(matrix: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """
+    Dołącza wiersze do macierzy profili, wyrównując szerokość wartościami NaN.
+    """
+    if len(matrix) == 0:
+        return rows
+    width = max(matrix.shape[1], rows.shape[1])
+    stacked = np.full((len(matrix) + len(rows), width), np.nan, dtype=matrix.dtype)
+    stacked[:len(matrix), :matrix.shape[1]] = matrix
+    stacked[len(matrix):, :rows.shape[1]] = rows
+    return stacked
+
+
+class ProfileStore:
+    """
+    Kolumnowy magazyn profili: macierz wartości (plik x interwał) z indeksem grup i dat.
+
+    Grupa jest wyznaczana przez kanał i nazwę grupy, więc pliki CP i CO
+    o tej samej części nazwy przed datą należą do osobnych grup.
+
+    Profile krótsze niż najdłuższy profil są uzupełniane wartościami NaN,
+    a rzeczywista długość każdego profilu jest zapisana w tablicy lengths.
+    Liczba wartości w plikach źródłowych jest zapisana w tablicy source_lengths,
+    a pliki, których nie udało się dopasować do doby, w tablicy unmapped.
+    """
+
+    def __init__(self, dtype=np.float64, hourly: bool = True):
+        """
+        Inicjalizuje pusty magazyn.
+
+        Args:
+            dtype: Typ wartości macierzy profili (np.float64 lub np.float32)
+            hourly: Czy przeliczać dołączane profile piętnastominutowe na godzinowe
+        """
+        self.dtype = np.dtype(dtype)
+        self.hourly = hourly
+        self.matrix = np.empty((0, 0), dtype=self.dtype)
+        self.lengths = np.empty(0, dtype=np.int32)
+        self.source_lengths = np.empty(0, dtype=np.int32)
+        self.unmapped = np.empty(0, dtype=np.int64)
+        self.group_codes = np.empty(0, dtype=np.int32)
+        self.ordinals = np.empty(0, dtype=np.int32)
+        self.dates = np.empty(0, dtype='datetime64[D]')
+        self.date_labels: List[Optional[str]] = []
+        self.names: List[str] = []
+        self.hashes: List[Optional[str]] = []
+        self.groups: List[str] = []
+        self.group_channels: List[Optional[str]] = []
+        self._group_index: Dict[Tuple[Optional[str], str], int] = {}
+        self._group_sizes: List[int] = []
+        self._hash_set: Set[str] = set()
+        # Indeks wierszy uporządkowanych według grup, budowany przy pierwszym użyciu
+        self._group_order: Optional[np.ndarray] = None
+        self._group_starts: Optional[np.ndarray] = None
+        # Agregaty grup aktualizowane przyrostowo przy dołączaniu plików
+        self.group_sums = np.empty(0, dtype=np.float64)
+        self.group_counts = np.empty(0, dtype=np.int64)
+        self.group_last_rows = np.empty(0, dtype=np.int64)
+        self.group_max = np.empty(0, dtype=np.float64)
+
+    @classmethod
+    def from_parsed(cls, parsed_files: Sequence[ParsedFile], dtype=np.float64, hourly: bool = True) -> 'ProfileStore':
+        """
+        Tworzy magazyn z listy sparsowanych plików.
+
+        Args:
+            parsed_files: Lista obiektów ParsedFile
+            dtype: Typ wartości macierzy profili
+            hourly: Czy przeliczyć profile piętnastominutowe na godzinowe
+
+        Returns:
+            Obiekt ProfileStore
+        """
+        store = cls(dtype=dtype, hourly=hourly)
+        store.append(parsed_files, skip_duplicates=False)
+        return store
+
+    def append(self, parsed_files: Sequence[ParsedFile], skip_duplicates: bool = True) -> int:
+        """
+        Dołącza pliki do magazynu, aktualizując agregaty grup tylko o nowe pliki.
+
+        Pliki o skrócie zawartości już obecnym w magazynie (lub powtórzonym
+        w dołączanej paczce) są pomijane, jeśli skip_duplicates jest ustawione.
+
+        Args:
+            parsed_files: Lista obiektów ParsedFile
+            skip_duplicates: Czy pomijać pliki o znanym skrócie zawartości
+
+        Returns:
+            Liczba dołączonych plików
+        """
+        new_files = []
+        for parsed_file in parsed_files:
+            if parsed_file.content_hash is not None:
+                if skip_duplicates and parsed_file.content_hash in self._hash_set:
+                    continue
+                self._hash_set.add(parsed_file.content_hash)
+            new_files.append(parsed_file)
+
+        n_files = len(new_files)
+        if n_files == 0:
+            return 0
+        offset = len(self)
+        lengths = np.fromiter((len(f.values) for f in new_files), dtype=np.int32, count=n_files)
+        width = int(lengths.max())
+
+        matrix = np.full((n_files, width), np.nan, dtype=self.dtype)
+        group_codes = np.empty(n_files, dtype=np.int32)
+        ordinals = np.empty(n_files, dtype=np.int32)
+        for row, parsed_file in enumerate(new_files):
+            matrix[row, :lengths[row]] = parsed_file.values
+            key = (parsed_file.channel, parsed_file.group)
+            code = self._group_index.get(key)
+            if code is None:
+                code = len(self.groups)
+                self._group_index[key] = code
+                self.groups.append(parsed_file.group)
+                self.group_channels.append(parsed_file.channel)
+                self._group_sizes.append(0)
+            self._group_sizes[code] += 1
+            group_codes[row] = code
+            ordinals[row] = self._group_sizes[code]
+
+        date_labels = [f.date for f in new_files]
+        dates = pd.to_datetime(
+            pd.Series(date_labels, dtype=object), format="%d-%m-%Y", errors="coerce"
+        ).values.astype('datetime64[D]')
+        source_lengths = lengths
+        if self.hourly:
+            matrix, lengths, unmapped = matrix_to_hourly(matrix, lengths, dates)
+            self.unmapped = np.concatenate([self.unmapped, offset + np.flatnonzero(unmapped)])
+
+        self._update_aggregates(matrix, group_codes, offset)
+        self._group_order = None
+        self._group_starts = None
+        self.matrix = _stack_rows(self.matrix, matrix)
+        self.lengths = np.concatenate([self.lengths, lengths.astype(np.int32)])
+        self.source_lengths = np.concatenate([self.source_lengths, source_lengths])
+        self.group_codes = np.concatenate([self.group_codes, group_codes])
+        self.ordinals = np.concatenate([self.ordinals, ordinals])
+        self.dates = np.concatenate([self.dates, dates])
+        self.date_labels.extend(date_labels)
+        self.names.extend(f.name for f in new_files)
+        self.hashes.extend(f.content_hash for f in new_files)
+        return n_files
+
+    def _update_aggregates(self, matrix: np.ndarray, group_codes: np.ndarray, offset: int):
+        """
+        Dodaje wartości nowych wierszy do agregatów grup (suma, liczba plików, ostatni plik, maksimum).
+
+        Args:
+            matrix: Macierz profili nowych plików
+            group_codes: Kody grup nowych plików
+            offset: Numer wiersza magazynu, od którego zaczynają się nowe pliki
+        """
+        n_groups = len(self.groups)
+        n_files = len(matrix)
+        row_sums = np.nansum(matrix, axis=1, dtype=np.float64)
+        self.group_sums = _grow(self.group_sums, n_groups, 0.0)
+        self.group_sums += np.bincount(group_codes, weights=row_sums, minlength=n_groups)
+        self.group_counts = _grow(self.group_counts, n_groups, 0)
+        self.group_counts += np.bincount(group_codes, minlength=n_groups)
+        # Data grupy to data ostatniego pliku grupy
+        self.group_last_rows = _grow(self.group_last_rows, n_groups, 0)
+        np.maximum.at(self.group_last_rows, group_codes, offset + np.arange(n_files))
+
+        row_max = np.full(n_files, -np.inf)
+        valid = ~np.isnan(matrix).all(axis=1)
+        if valid.any():
+            row_max[valid] = np.nanmax(matrix[valid], axis=1)
+        self.group_max = _grow(self.group_max, n_groups, -np.inf)
+        np.maximum.at(self.group_max, group_codes, row_max)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def contains(self, content_hash: Optional[str]) -> bool:
+        """
+        Sprawdza, czy plik o podanym skrócie zawartości jest już w magazynie.
+
+        Args:
+            content_hash: Skrót zawartości pliku
+
+        Returns:
+            True, jeśli plik był już dołączony
+        """
+        return content_hash in self._hash_set
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Rozmiar tablic magazynu w bajtach.
+        """
+        return (self.matrix.nbytes + self.lengths.nbytes + self.group_codes.nbytes
+                + self.ordinals.nbytes + self.dates.nbytes)
+
+    def file_key(self, row: int) -> str:
+        """
+        Zwraca klucz pliku w postaci <grupa>_<numer kolejny w grupie>.
+
+        Args:
+            row: Numer wiersza w magazynie
+
+        Returns:
+            Klucz pliku
+        """
+        return f"{self.groups[self.group_codes[row]]}_{self.ordinals[row]}"
+
+    def _build_group_index(self):
+        """
+        Buduje indeks wierszy posortowanych stabilnie według kodu grupy.
+
+        Wiersze grupy o kodzie c to _group_order[_group_starts[c]:_group_starts[c + 1]],
+        więc pobranie wierszy grupy nie wymaga przeglądania całego magazynu.
+        """
+        self._group_order = np.argsort(self.group_codes, kind='stable')
+        self._group_starts = np.zeros(len(self.groups) + 1, dtype=np.int64)
+        np.cumsum(self.group_counts, out=self._group_starts[1:])
+
+    def group_rows(self, channel: Optional[str], group: str) -> np.ndarray:
+        """
+        Zwraca numery wierszy plików należących do grupy (w kolejności wgrania).
+
+        Args:
+            channel: Kod kanału grupy
+            group: Nazwa grupy
+
+        Returns:
+            Tablica numerów wierszy
+        """
+        code = self._group_index.get((channel, group))
+        if code is None:
+            return np.empty(0, dtype=np.int64)
+        if self._group_order is None:
+            self._build_group_index()
+        return self._group_order[self._group_starts[code]:self._group_starts[code + 1]]
+
+    def profile(self, row: int) -> np.ndarray:
+        """
+        Zwraca profil pojedynczego pliku (bez uzupełnienia NaN).
+
+        Args:
+            row: Numer wiersza w magazynie
+
+        Returns:
+            Widok wartości profilu
+        """
+        return self.matrix[row, :self.lengths[row]]
+
+    def group_profile(self, channel: Optional[str], group: str) -> np.ndarray:
+        """
+        Zwraca połączone profile wszystkich plików grupy.
+
+        Args:
+            channel: Kod kanału grupy
+            group: Nazwa grupy
+
+        Returns:
+            Tablica wartości profilu grupy
+        """
+        rows = self.group_rows(channel, group)
+        block = self.matrix[rows]
+        mask = np.arange(self.matrix.shape[1]) < self.lengths[rows, None]
+        return block[mask]
+
+    def channel_groups(self, channel: str) -> List[str]:
+        """
+        Zwraca nazwy grup danego kanału w kolejności pierwszego wystąpienia.
+
+        Args:
+            channel: Kod kanału (CP lub CO)
+
+        Returns:
+            Lista nazw grup
+        """
+        return [group for group, group_channel in zip(self.groups, self.group_channels) if group_channel == channel]
+
+    def channel_max(self, channel: str) -> float:
+        """
+        Zwraca największą wartość profili danego kanału.
+
+        Args:
+            channel: Kod kanału (CP lub CO)
+
+        Returns:
+            Największa wartość lub 0, jeśli kanał nie ma wartości
+        """
+        codes = [self._group_index[(channel, group)] for group in self.channel_groups(channel)]
+        values = self.group_max[codes]
+        if values.size == 0 or np.isneginf(values).all():
+            return 0
+        return float(values.max())
+
+    def unmapped_report(self) -> pd.DataFrame:
+        """
+        Zwraca listę plików, których nie udało się dopasować do długości doby.
+
+        Returns:
+            DataFrame z kolumnami Nazwa pliku, Data profilu, Liczba wartości, Oczekiwana liczba godzin
+        """
+        rows = self.unmapped
+        return pd.DataFrame({
+            "Nazwa pliku": [self.names[row] for row in rows],
+            "Data profilu": [self.date_labels[row] for row in rows],
+            "Liczba wartości": self.source_lengths[rows],
+            "Oczekiwana liczba godzin": expected_hours(self.dates[rows])
+        })
+
+    def summary(self, channel: str) -> pd.DataFrame:
+        """
+        Zwraca tabelę zbiorczą grup danego kanału.
+
+        Args:
+            channel: Kod kanału (CP lub CO)
+
+        Returns:
+            DataFrame z kolumnami Lp, Nazwa, Data, Suma, Pliki
+        """
+        groups = self.channel_groups(channel)
+        codes = [self._group_index[(channel, group)] for group in groups]
+        return pd.DataFrame({
+            "Lp": list(range(1, len(groups) + 1)),
+            "Nazwa": groups,
+            "Data": [self.date_labels[self.group_last_rows[code]] for code in codes],
+            "Suma": [float(self.group_sums[code]) for code in codes],
+            "Pliki": [int(self.group_counts[code]) for code in codes]
+        })
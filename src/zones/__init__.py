@@ -0,0 +1,54 @@
+"""
+Pakiet zawierający logikę kalkulatora stref taryfowych.
+"""
+from .engine import TARIFS, TARIFS_WITH_HOLIDAYS, ZONE_LABELS, zone_table, assign_zones, assign_zones_batch, zone_labels, create_zone_dataframe
+from .profile import profile_labels, hour_numbers, prepare_profile, read_profile, profile_timestamps, melt_profile, join_profile
+from .summary import BREAKDOWN_COLUMNS, BREAKDOWN_PERIODS, extra_hour_value, profile_values, zone_sums, summarize, compare_tariffs, zone_breakdown
+from .reader import ProfileSeries, ProfileWorkbook, parse_rows, load_profiles, load_profile
+from .batch import BATCH_BREAKDOWN_COLUMNS, BATCH_COLUMNS, summarize_workbook, summarize_profiles
+from .tariffs import read_tariffs, get_zones_file, get_tariffs
+from .holidays import DAY_TYPES, year_day_types, day_types, is_day_off, is_holiday, day_calendar
+
+__all__ = [
+    'TARIFS',
+    'TARIFS_WITH_HOLIDAYS',
+    'ZONE_LABELS',
+    'zone_table',
+    'assign_zones',
+    'assign_zones_batch',
+    'zone_labels',
+    'create_zone_dataframe',
+    'profile_labels',
+    'hour_numbers',
+    'prepare_profile',
+    'read_profile',
+    'profile_timestamps',
+    'melt_profile',
+    'join_profile',
+    'extra_hour_value',
+    'profile_values',
+    'zone_sums',
+    'summarize',
+    'compare_tariffs',
+    'BREAKDOWN_COLUMNS',
+    'BREAKDOWN_PERIODS',
+    'zone_breakdown',
+    'ProfileSeries',
+    'ProfileWorkbook',
+    'parse_rows',
+    'load_profiles',
+    'load_profile',
+    'BATCH_COLUMNS',
+    'BATCH_BREAKDOWN_COLUMNS',
+    'summarize_workbook',
+    'summarize_profiles',
+    'read_tariffs',
+    'get_zones_file',
+    'get_tariffs',
+    'DAY_TYPES',
+    'year_day_types',
+    'day_types',
+    'is_day_off',
+    'is_holiday',
+    'day_calendar'
+]
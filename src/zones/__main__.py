@@ -0,0 +1,8 @@
+"""
+Punkt wejścia obliczeń stref taryfowych (python -m src.zones)
+"""
+import sys
+from .cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
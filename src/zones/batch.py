@@ -0,0 +1,137 @@
+"""
+Moduł zawierający obliczanie stref dla wielu profili (wiele plików lub arkuszy)
+"""
+import numpy as np
+import pandas as pd
+from concurrent.futures import as_completed
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from src.core.shared import process_pool
+from .reader import PROFILE_ERRORS, load_profiles
+from .summary import BREAKDOWN_COLUMNS, compare_tariffs, zone_breakdown
+
+# Kolumny tabeli wyników dla wielu profili
+BATCH_COLUMNS = ['Punkt', 'Taryfa', 'S1', 'S2', 'S3', 'Suma', 'S1 %', 'S2 %', 'S3 %']
+
+# Kolumny tabel sum stref w okresach dla wielu profili
+BATCH_BREAKDOWN_COLUMNS = ['Punkt'] + BREAKDOWN_COLUMNS
+
+def summarize_workbook(
+    name: str,
+    data: bytes,
+    tariffs: Dict[str, np.ndarray],
+    names: Sequence[str],
+    freqs: Sequence[str] = ()
+) -> Tuple[List[Dict], List[Tuple[str, str]], Dict[str, List[Dict]]]:
+    """
+    Oblicza strefy wszystkich arkuszy jednego pliku z profilami.
+
+    Każdy arkusz jest osobnym punktem. Punkt pliku z jednym arkuszem nazywa
+    się tak jak plik, a w pliku z wieloma arkuszami "plik / arkusz".
+    Sumy stref w okresach są obliczane z tego samego wczytanego profilu;
+    arkusz, dla którego nie udało się ich obliczyć, jest w nich pomijany.
+
+    Args:
+        name: Nazwa pliku
+        data: Zawartość pliku xls/xlsx
+        tariffs: Słownik {nazwa taryfy: tablica kodów stref}
+        names: Nazwy obliczanych taryf
+        freqs: Okresy sum stref ('M' - miesiące, 'D' - dni), domyślnie brak
+
+    Returns:
+        Krotka (wiersze wyników, lista błędów (punkt, opis błędu), {okres: wiersze sum stref w okresach})
+    """
+    rows = []
+    errors = []
+    breakdowns: Dict[str, List[Dict]] = {freq: [] for freq in freqs}
+    try:
+        workbook = load_profiles(data)
+    except PROFILE_ERRORS as e:
+        return rows, [(name, str(e))], breakdowns
+
+    for sheet_name in workbook.sheet_names:
+        point = f"{name} / {sheet_name}" if len(workbook.sheet_names) > 1 else name
+        if sheet_name in workbook.errors:
+            errors.append((point, workbook.errors[sheet_name]))
+            continue
+        profile = workbook.profiles[sheet_name]
+        try:
+            timestamps = profile.timestamps()
+            values = profile.hourly_values(timestamps)
+            results = compare_tariffs(timestamps, values, profile.extra_value, tariffs, names)
+        except PROFILE_ERRORS as e:
+            errors.append((point, str(e)))
+            continue
+        rows.extend({'Punkt': point, **result} for result in results)
+        for freq in freqs:
+            try:
+                breakdown = zone_breakdown(
+                    timestamps, values, profile.extra_value, tariffs, names, freq, profile.extra_date
+                )
+            except PROFILE_ERRORS:
+                continue
+            breakdowns[freq].extend(breakdown.assign(Punkt=point)[BATCH_BREAKDOWN_COLUMNS].to_dict('records'))
+    return rows, errors, breakdowns
+
+
+def summarize_profiles(
+    files: Sequence[Tuple[str, bytes]],
+    tariffs: Dict[str, np.ndarray],
+    names: Sequence[str],
+    workers: int = 1,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    freqs: Sequence[str] = ()
+) -> Tuple[pd.DataFrame, List[Tuple[str, str]], Dict[str, pd.DataFrame]]:
+    """
+    Oblicza strefy wielu plików z profilami, opcjonalnie w wielu procesach.
+
+    Definicje stref są przekazywane do procesów roboczych raz na plik,
+    a kalendarz dni wolnych jest obliczany raz w każdym procesie. Sumy
+    stref w okresach są obliczane w tych samych zadaniach, więc każdy
+    plik jest wczytywany tylko raz.
+
+    Args:
+        files: Lista krotek (nazwa pliku, zawartość pliku)
+        tariffs: Słownik {nazwa taryfy: tablica kodów stref}
+        names: Nazwy obliczanych taryf
+        workers: Liczba procesów roboczych (1 oznacza obliczenia w bieżącym procesie)
+        progress_callback: Funkcja wywoływana z (liczba przetworzonych plików, liczba plików)
+        freqs: Okresy sum stref ('M' - miesiące, 'D' - dni), domyślnie brak
+
+    Returns:
+        Krotka (tabela wyników z kolumnami BATCH_COLUMNS, lista błędów (punkt, opis błędu),
+        {okres: tabela z kolumnami BATCH_BREAKDOWN_COLUMNS})
+    """
+    tariffs = {name: tariffs[name] for name in names}
+    freqs = list(dict.fromkeys(freqs))
+    total = len(files)
+    results: List[Tuple[List[Dict], List[Tuple[str, str]], Dict[str, List[Dict]]]] = [([], [], {})] * total
+    done = 0
+
+    if workers <= 1 or total <= 1:
+        for idx, (name, data) in enumerate(files):
+            results[idx] = summarize_workbook(name, data, tariffs, names, freqs)
+            done += 1
+            if progress_callback:
+                progress_callback(done, total)
+    else:
+        with process_pool(workers) as executor:
+            futures = {
+                executor.submit(summarize_workbook, name, data, tariffs, names, freqs): idx
+                for idx, (name, data) in enumerate(files)
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+                done += 1
+                if progress_callback:
+                    progress_callback(done, total)
+
+    rows = [row for file_rows, _, _ in results for row in file_rows]
+    errors = [error for _, file_errors, _ in results for error in file_errors]
+    breakdowns = {
+        freq: pd.DataFrame(
+            [row for _, _, file_breakdowns in results for row in file_breakdowns[freq]],
+            columns=BATCH_BREAKDOWN_COLUMNS
+        )
+        for freq in freqs
+    }
+    return pd.DataFrame(rows, columns=BATCH_COLUMNS), errors, breakdowns
@@ -0,0 +1,177 @@
+"""
+Moduł zawierający obliczanie stref taryfowych z linii poleceń (bez interfejsu Streamlit)
+
+Przykład:
+    python -m src.zones profile/ --tariffs ENERGA_B22_C22a TAURON_C22b --format csv --breakdown M
+"""
+import argparse
+import datetime
+import os
+import sys
+import unicodedata
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+from src.core.config import get_config_value
+from .batch import BATCH_COLUMNS, summarize_profiles
+from .engine import TARIFS
+from .export import build_workbook
+from .summary import BREAKDOWN_PERIODS
+from .tariffs import get_tariffs, get_zones_file
+
+# Rozszerzenia plików z profilami
+PROFILE_SUFFIXES = (".xls", ".xlsx")
+
+# Formaty plików wynikowych
+OUTPUT_FORMATS = ("xlsx", "csv")
+
+
+def list_profiles(paths: List[str]) -> List[str]:
+    """
+    Zwraca pliki z profilami podane wprost lub zapisane w podanych katalogach.
+
+    Args:
+        paths: Ścieżki plików lub katalogów
+
+    Returns:
+        Lista ścieżek plików (pliki z katalogów posortowane po nazwie)
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(
+                os.path.join(path, name) for name in os.listdir(path)
+                if name.lower().endswith(PROFILE_SUFFIXES) and not name.startswith("~$")
+            ))
+        else:
+            files.append(path)
+    return files
+
+
+def read_files(paths: List[str]) -> List[Tuple[str, bytes]]:
+    """
+    Odczytuje zawartość plików z profilami.
+
+    Args:
+        paths: Ścieżki plików
+
+    Returns:
+        Lista krotek (nazwa pliku, zawartość pliku)
+    """
+    files = []
+    for path in paths:
+        with open(path, "rb") as f:
+            files.append((os.path.basename(path), f.read()))
+    return files
+
+
+def write_results(tables: Dict[str, pd.DataFrame], output_dir: str, output_format: str) -> List[str]:
+    """
+    Zapisuje tabele wyników jako pliki csv (jeden plik na tabelę) lub jeden plik xlsx (arkusz na tabelę).
+
+    Args:
+        tables: Słownik {nazwa tabeli: tabela}
+        output_dir: Katalog wynikowy
+        output_format: 'xlsx' lub 'csv'
+
+    Returns:
+        Lista ścieżek zapisanych plików
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+    if output_format == "xlsx":
+        path = os.path.join(output_dir, f"strefy_{timestamp}.xlsx")
+        with open(path, "wb") as f:
+            f.write(build_workbook(tables))
+        return [path]
+
+    written = []
+    for table_name, df in tables.items():
+        # Nazwa pliku bez polskich znaków: "Miesiące" -> "_miesiace"
+        stem = unicodedata.normalize("NFKD", table_name).encode("ascii", "ignore").decode().lower()
+        suffix = "" if table_name == "Strefy" else f"_{stem}"
+        path = os.path.join(output_dir, f"strefy{suffix}_{timestamp}.csv")
+        df.to_csv(path, index=False)
+        written.append(path)
+    return written
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Tworzy parser argumentów linii poleceń.
+
+    Returns:
+        Obiekt ArgumentParser
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m src.zones",
+        description="Obliczanie zużycia energii w strefach taryfowych dla plików z profilami."
+    )
+    parser.add_argument("profiles", nargs="+", help="Pliki xls/xlsx z profilami lub katalogi z takimi plikami")
+    parser.add_argument(
+        "-t", "--tariffs", nargs="+", choices=TARIFS, metavar="TARYFA", default=TARIFS,
+        help="Obliczane taryfy (domyślnie wszystkie)"
+    )
+    parser.add_argument("-o", "--output", default=".", help="Katalog wynikowy (domyślnie bieżący)")
+    parser.add_argument("-f", "--format", choices=OUTPUT_FORMATS, default="xlsx", help="Format wyników")
+    parser.add_argument(
+        "-b", "--breakdown", choices=list(BREAKDOWN_PERIODS), action="append", default=[],
+        help="Dodaj sumy stref w miesiącach (M) lub dniach (D); można podać kilka razy"
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, default=get_config_value("ZONES_WORKERS", 1),
+        help="Liczba procesów obliczających strefy (domyślnie ZONES_WORKERS)"
+    )
+    parser.add_argument("-q", "--quiet", action="store_true", help="Nie wypisuj postępu")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Uruchamia obliczenia stref.
+
+    Args:
+        argv: Argumenty linii poleceń (domyślnie sys.argv)
+
+    Returns:
+        Kod wyjścia procesu
+    """
+    args = build_parser().parse_args(argv)
+    missing = [path for path in args.profiles if not os.path.exists(path)]
+    if missing:
+        print(f"Nie znaleziono: {', '.join(missing)}", file=sys.stderr)
+        return 2
+    zones_file = get_zones_file()
+    if not os.path.isfile(zones_file):
+        print(f"Nie znaleziono pliku stref: {zones_file} (ustaw ZONES_FILE)", file=sys.stderr)
+        return 2
+
+    paths = list_profiles(args.profiles)
+    if not paths:
+        print("Nie znaleziono plików z profilami.", file=sys.stderr)
+        return 1
+
+    def report(done, total):
+        print(f"Przetworzono {done} z {total} plików", file=sys.stderr)
+
+    names = list(dict.fromkeys(args.tariffs))
+    files = read_files(paths)
+    # Sumy stref w okresach są obliczane razem z wynikami, bez ponownego wczytywania plików
+    result, errors, breakdowns = summarize_profiles(
+        files,
+        get_tariffs(),
+        names,
+        workers=max(1, min(args.workers, len(files))),
+        progress_callback=None if args.quiet else report,
+        freqs=args.breakdown
+    )
+    for point, error in errors:
+        print(f"Nie udało się obliczyć stref dla {point}: {error}", file=sys.stderr)
+    if result.empty:
+        return 1
+
+    tables = {"Strefy": result[BATCH_COLUMNS]}
+    for freq, breakdown in breakdowns.items():
+        tables[BREAKDOWN_PERIODS[freq]] = breakdown
+    for path in write_results(tables, args.output, args.format):
+        print(path)
+    return 0
@@ -0,0 +1,144 @@
+"""
+Moduł zawierający wektorowe przypisywanie stref taryfowych do godzin profilu
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, Sequence
+from src.core.config import get_config_value
+from .holidays import is_day_off, is_holiday
+
+TARIFS = [
+    'ENERGA_A23_B23_C23',
+    'ENERGA_B22_C22a',
+    'ENERGA_C22b',
+    'TAURON_A23_B23_C23_C13_G13',
+    'TAURON_B22_C22a',
+    'TAURON_C22b',
+    'PGE_A23_B23_C23',
+    'PGE_B22_C22a',
+    'PGE_C22b',
+    'ENEA_A23_B23',
+    'ENEA_B22_C22a',
+    'ENEA_B12',
+    'ENEA_C22b',
+    'PGE_ENERGETYKA_KOLEJOWA_B23',
+    'PGE_ENERGETYKA_KOLEJOWA_B22_C22',
+    'PGE_ENERGETYKA_KOLEJOWA_C22b',
+    'ARCELORMITTAL_B23',
+    'ARCELORMITTAL_C22a',
+    'ARCELORMITTAL_C22b'
+]
+
+TARIFS_WITH_HOLIDAYS = [
+    'ENERGA_A23_B23_C23',
+    'TAURON_A23_B23_C23_C13_G13',
+    'PGE_A23_B23_C23',
+    'ENEA_A23_B23',
+    'PGE_ENERGETYKA_KOLEJOWA_B23',
+    'ARCELORMITTAL_B23',
+]
+
+# Nazwy stref; kod strefy to indeks w tej krotce powiększony o 1
+ZONE_LABELS = ('S1', 'S2', 'S3')
+
+# Kod strefy przypisywanej w święta (taryfy z TARIFS_WITH_HOLIDAYS)
+HOLIDAY_ZONE = 3
+
+
+def zone_table(zone_df: pd.DataFrame) -> np.ndarray:
+    """
+    Zamienia arkusz stref taryfy na tablicę kodów stref (godzina x miesiąc).
+
+    Wiersz i tablicy opisuje godzinę zakończoną o (i + 1):00, więc ostatni
+    wiersz (24:00) odpowiada godzinie 0 znacznika czasu.
+
+    Args:
+        zone_df: Arkusz stref (kolumna z godziną i kolumny miesięcy 1-12)
+
+    Returns:
+        Tablica kodów stref (1-3) o wymiarach 24 x 12
+    """
+    labels = zone_df.iloc[:, 1:13].to_numpy()
+    codes = np.zeros(labels.shape, dtype=np.int8)
+    for code, label in enumerate(ZONE_LABELS, start=1):
+        codes[labels == label] = code
+    return codes
+
+
+def assign_zones_batch(timestamps: pd.DatetimeIndex, tables: np.ndarray, holidays: Sequence[bool]) -> np.ndarray:
+    """
+    Przypisuje kody stref wielu taryf naraz (taryfa x godzina) jedną operacją na tablicach.
+
+    Indeksy godzin, miesięcy i świąt są wyznaczane raz dla wszystkich taryf.
+
+    Args:
+        timestamps: Znaczniki czasu godzin profilu
+        tables: Tablice kodów stref taryf (taryfa x godzina x miesiąc)
+        holidays: Dla każdej taryfy: czy w święta obowiązuje strefa S3 (przy ZONES_WEEKENDS_S3
+            również w soboty i niedziele)
+
+    Returns:
+        Tablica kodów stref (taryfa x godzina)
+    """
+    timestamps = pd.DatetimeIndex(timestamps)
+    hours = timestamps.hour.to_numpy()
+    months = timestamps.month.to_numpy()
+    codes = tables[:, (hours - 1) % 24, months - 1]
+    holidays = np.asarray(holidays, dtype=bool)
+    if holidays.any():
+        # Domyślnie soboty i niedziele zachowują strefy z tabeli taryfy (tylko święta z kalendarza dają S3)
+        days = timestamps.to_numpy().astype('datetime64[D]')
+        days_off = is_day_off(days) if get_config_value("ZONES_WEEKENDS_S3", False) else is_holiday(days)
+        codes = np.where(holidays[:, None] & days_off[None, :], HOLIDAY_ZONE, codes).astype(np.int8)
+    return codes
+
+
+def assign_zones(timestamps: pd.DatetimeIndex, table: np.ndarray, holidays: bool = False) -> np.ndarray:
+    """
+    Przypisuje kody stref do znaczników czasu jedną operacją na tablicach.
+
+    Args:
+        timestamps: Znaczniki czasu godzin profilu
+        table: Tablica kodów stref (godzina x miesiąc) z zone_table
+        holidays: Czy w święta obowiązuje strefa S3
+
+    Returns:
+        Tablica kodów stref
+    """
+    return assign_zones_batch(timestamps, table[None], [holidays])[0]
+
+
+def zone_labels(codes: np.ndarray) -> np.ndarray:
+    """
+    Zamienia kody stref na nazwy (S1, S2, S3).
+
+    Args:
+        codes: Tablica kodów stref
+
+    Returns:
+        Tablica nazw stref
+    """
+    return np.array((None,) + ZONE_LABELS, dtype=object)[codes]
+
+
+def create_zone_dataframe(start_date, end_date, zone_name: str, tariffs: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """
+    Tworzy tabelę godzin z zakresu dat z przypisaną strefą taryfy.
+
+    Args:
+        start_date: Początek zakresu (pierwsza godzina)
+        end_date: Koniec zakresu (ostatnia godzina, włącznie)
+        zone_name: Nazwa taryfy
+        tariffs: Słownik {nazwa taryfy: tablica kodów stref}, np. z get_tariffs
+
+    Returns:
+        DataFrame z kolumnami Timestamp i Zone
+    """
+    if zone_name not in tariffs:
+        raise ValueError(f"Zone '{zone_name}' not found in zones.")
+
+    date_range = pd.date_range(start=start_date, end=end_date, freq='h')
+    df = pd.DataFrame(date_range, columns=['Timestamp'])
+    holidays = zone_name in TARIFS_WITH_HOLIDAYS
+    df['Zone'] = zone_labels(assign_zones(date_range, tariffs[zone_name], holidays))
+    return df
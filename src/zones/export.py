@@ -0,0 +1,23 @@
+"""
+Moduł zawierający eksport wyników kalkulatora stref do plików Excel
+"""
+import io
+import pandas as pd
+from typing import Dict
+
+
+def build_workbook(sheets: Dict[str, pd.DataFrame]) -> bytes:
+    """
+    Tworzy plik xlsx z tabelami wyników, każda w osobnym arkuszu.
+
+    Args:
+        sheets: Słownik {nazwa arkusza: tabela}
+
+    Returns:
+        Zawartość pliku xlsx
+    """
+    output = io.BytesIO()
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        for sheet_name, df in sheets.items():
+            df.to_excel(writer, sheet_name=sheet_name, index=False)
+    return output.getvalue()
@@ -0,0 +1,107 @@
+"""
+Moduł zawierający kalendarz dni wolnych współdzielony przez obliczenia stref
+"""
+import datetime
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from workalendar.europe import Poland
+
+# Rodzaje dni; kod rodzaju to indeks w tej krotce
+DAY_TYPES = ('Dzień roboczy', 'Święto', 'Sobota', 'Niedziela')
+WORKDAY, HOLIDAY, SATURDAY, SUNDAY = range(len(DAY_TYPES))
+
+_calendar = Poland()
+
+
+@lru_cache(maxsize=None)
+def year_day_types(year: int) -> np.ndarray:
+    """
+    Zwraca rodzaj każdego dnia roku (obliczany raz na rok i współdzielony przez wszystkie sesje).
+
+    Święto ma pierwszeństwo przed sobotą i niedzielą.
+
+    Args:
+        year: Rok
+
+    Returns:
+        Tablica kodów rodzaju dnia (indeks 0 to 1 stycznia), tylko do odczytu
+    """
+    first_day = np.datetime64(f"{year}-01-01", 'D')
+    days = np.arange(first_day, np.datetime64(f"{year + 1}-01-01", 'D'))
+    # 1970-01-01 był czwartkiem, więc (dni od epoki + 3) % 7 to dzień tygodnia (0 = poniedziałek)
+    weekday = (days.astype(np.int64) + 3) % 7
+
+    types = np.full(len(days), WORKDAY, dtype=np.int8)
+    types[weekday == 5] = SATURDAY
+    types[weekday == 6] = SUNDAY
+    holidays = np.array([day for day, _ in _calendar.holidays(year)], dtype='datetime64[D]')
+    types[(holidays - first_day).astype(np.int64)] = HOLIDAY
+    types.flags.writeable = False
+    return types
+
+
+def day_types(days: np.ndarray) -> np.ndarray:
+    """
+    Zwraca rodzaje dni dla dowolnej tablicy dat.
+
+    Args:
+        days: Tablica dat (datetime64[D])
+
+    Returns:
+        Tablica kodów rodzaju dnia
+    """
+    days = np.asarray(days, dtype='datetime64[D]')
+    if days.size == 0:
+        return np.empty(0, dtype=np.int8)
+    years = days.astype('datetime64[Y]').astype(np.int64) + 1970
+    types = np.empty(days.shape, dtype=np.int8)
+    for year in np.unique(years):
+        in_year = years == year
+        offsets = (days[in_year] - np.datetime64(f"{year}-01-01", 'D')).astype(np.int64)
+        types[in_year] = year_day_types(int(year))[offsets]
+    return types
+
+
+def is_day_off(days: np.ndarray) -> np.ndarray:
+    """
+    Sprawdza, które dni są wolne od pracy (święto, sobota lub niedziela).
+
+    Args:
+        days: Tablica dat (datetime64[D])
+
+    Returns:
+        Tablica logiczna
+    """
+    return day_types(days) != WORKDAY
+
+
+def is_holiday(days: np.ndarray) -> np.ndarray:
+    """
+    Sprawdza, które dni są świętami (również święta przypadające w sobotę lub niedzielę).
+
+    Args:
+        days: Tablica dat (datetime64[D])
+
+    Returns:
+        Tablica logiczna
+    """
+    return day_types(days) == HOLIDAY
+
+
+def day_calendar(start_date: datetime.date, end_date: datetime.date) -> pd.Series:
+    """
+    Zwraca kalendarz rodzajów dni z zakresu dat.
+
+    Args:
+        start_date: Pierwszy dzień
+        end_date: Ostatni dzień (włącznie)
+
+    Returns:
+        Seria kategorii DAY_TYPES indeksowana datą
+    """
+    days = np.arange(np.datetime64(start_date, 'D'), np.datetime64(end_date, 'D') + 1)
+    return pd.Series(
+        pd.Categorical.from_codes(day_types(days), categories=list(DAY_TYPES)),
+        index=pd.DatetimeIndex(days, name='Data')
+    )
@@ -0,0 +1,130 @@
+"""
+Moduł zawierający łączenie profilu zużycia z godzinami stref taryfowych
+"""
+import pandas as pd
+from datetime import datetime, timedelta
+from typing import Iterable, List
+
+# Format kolumn z datami w przekształconym profilu
+PROFILE_DATE_FORMAT = '%d.%m.%Y'
+
+# Etykiety godzin profilu: 01:00 ... 24:00 (24:00 to godzina 0 tej samej daty)
+_HOUR_LABEL_PATTERN = r'^(\d{2}):00$'
+
+
+def profile_labels(values: Iterable) -> List[str]:
+    """
+    Zamienia wartości pierwszej kolumny arkusza na nazwy kolumn profilu.
+
+    Pusta komórka to etykieta Time, a pełna data z godziną (yyyy-mm-dd hh:mm:ss)
+    jest zamieniana na dd.mm.yyyy.
+
+    Args:
+        values: Wartości pierwszej kolumny arkusza
+
+    Returns:
+        Lista nazw kolumn profilu
+    """
+    labels = ['Time' if pd.isna(value) or value == '' else str(value) for value in values]
+    return [f"{label[8:10]}.{label[5:7]}.{label[0:4]}" if len(label) > 10 else label for label in labels]
+
+
+def hour_numbers(labels: pd.Series) -> pd.Series:
+    """
+    Zwraca numery godzin etykiet HH:00 (1-24).
+
+    Args:
+        labels: Etykiety godzin profilu
+
+    Returns:
+        Numery godzin (NaN dla innych etykiet, np. dodatkowej godziny zmiany czasu)
+    """
+    hours = pd.to_numeric(labels.where(labels.map(type) == str).str.extract(_HOUR_LABEL_PATTERN)[0])
+    return hours.where((hours >= 1) & (hours <= 24))
+
+
+def prepare_profile(raw: pd.DataFrame) -> pd.DataFrame:
+    """
+    Przekształca arkusz profilu (dni w wierszach) do postaci godzina x data.
+
+    Args:
+        raw: Arkusz profilu wczytany przez pd.read_excel
+
+    Returns:
+        Profil z kolumną Time (etykiety godzin) i kolumnami dat dd.mm.yyyy
+    """
+    profil = raw.drop(columns=['P,O,B'])
+    profil = profil.drop(columns=['Unnamed: 27'])
+    profil = profil.transpose()
+    profil.reset_index(drop=True, inplace=True)
+    profil = profil.iloc[:, :-3]
+    profil.columns = profile_labels(profil.iloc[0])
+    profil = profil[1:]
+    return profil
+
+
+def read_profile(source, sheet_name=0) -> pd.DataFrame:
+    """
+    Wczytuje profil z pliku xls/xlsx.
+
+    Args:
+        source: Ścieżka lub plik z profilem
+        sheet_name: Nazwa lub numer arkusza
+
+    Returns:
+        Profil z kolumną Time i kolumnami dat dd.mm.yyyy
+    """
+    return prepare_profile(pd.read_excel(source, sheet_name=sheet_name))
+
+
+def profile_timestamps(profil: pd.DataFrame) -> pd.DatetimeIndex:
+    """
+    Zwraca godziny od pierwszego dnia profilu do północy po ostatnim dniu (włącznie).
+
+    Args:
+        profil: Profil z kolumną Time i kolumnami dat dd.mm.yyyy
+
+    Returns:
+        Znaczniki czasu kolejnych godzin
+    """
+    start_date = datetime.strptime(profil.columns[1], PROFILE_DATE_FORMAT)
+    end_date = datetime.strptime(profil.columns[-1], PROFILE_DATE_FORMAT) + timedelta(days=1)
+    return pd.date_range(start=start_date, end=end_date, freq='h')
+
+
+def melt_profile(profil: pd.DataFrame) -> pd.DataFrame:
+    """
+    Zamienia profil (godzina x data) na serię wartości ze znacznikami czasu.
+
+    Etykieta HH:00 daty D daje znacznik D HH:00, a etykieta 24:00 znacznik
+    D 00:00. Wiersze o innych etykietach (np. dodatkowa godzina zmiany czasu)
+    są pomijane.
+
+    Args:
+        profil: Profil z kolumną Time (etykiety godzin) i kolumnami dat dd.mm.yyyy
+
+    Returns:
+        DataFrame z kolumnami Timestamp i ECP
+    """
+    hours = hour_numbers(profil['Time'])
+    long = profil.assign(Hour=hours.values).dropna(subset=['Hour'])
+    long = long.melt(id_vars=['Time', 'Hour'], var_name='Date', value_name='ECP')
+    dates = pd.to_datetime(long['Date'], format=PROFILE_DATE_FORMAT, errors='coerce')
+    long['Timestamp'] = dates + pd.to_timedelta(long['Hour'] % 24, unit='h')
+    long = long.dropna(subset=['Timestamp'])
+    # Przy powtórzonej etykiecie godziny obowiązuje pierwsza wartość
+    return long.drop_duplicates(subset='Timestamp', keep='first')[['Timestamp', 'ECP']]
+
+
+def join_profile(zone_df: pd.DataFrame, profil: pd.DataFrame) -> pd.DataFrame:
+    """
+    Dołącza wartości profilu do tabeli godzin stref jednym złączeniem.
+
+    Args:
+        zone_df: Tabela z kolumnami Timestamp i Zone
+        profil: Profil z kolumną Time i kolumnami dat dd.mm.yyyy
+
+    Returns:
+        Tabela z kolumnami Timestamp, Zone i ECP (NaN dla godzin spoza profilu)
+    """
+    return zone_df.merge(melt_profile(profil), on='Timestamp', how='left')
@@ -0,0 +1,432 @@
+"""
+Moduł zawierający szybkie wczytywanie profili zużycia z plików xlsx
+"""
+import datetime
+import hashlib
+import io
+import json
+import os
+import time
+import uuid
+import zipfile
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+from openpyxl import load_workbook
+from src.core.config import PROJECT_ROOT, get_config_value
+from .profile import PROFILE_DATE_FORMAT, hour_numbers, melt_profile, prepare_profile, profile_labels, profile_timestamps
+from .summary import extra_hour_value
+
+# Kolumny arkusza pomijane przy wczytywaniu profilu (tak jak w prepare_profile)
+DROPPED_COLUMNS = ('P,O,B', 'Unnamed: 27')
+
+# Liczba końcowych wierszy arkusza pomijanych przy wczytywaniu profilu
+TRAILING_ROWS = 3
+
+# Błędy zgłaszane dla uszkodzonych lub nietypowych plików profili
+PROFILE_ERRORS = (KeyError, ValueError, IndexError, TypeError, zipfile.BadZipFile)
+
+# Wersja formatu plików pamięci podręcznej (zmiana unieważnia zapisane pliki)
+CACHE_VERSION = "3"
+
+
+@dataclass
+class ProfileSeries:
+    """
+    Profil zużycia jako seria wartości godzinowych (kWh) ze znacznikami czasu.
+    """
+    values: pd.Series
+    start: pd.Timestamp
+    end: pd.Timestamp
+    extra_value: float
+    extra_date: Optional[pd.Timestamp] = None
+
+    def timestamps(self) -> pd.DatetimeIndex:
+        """
+        Zwraca godziny od pierwszego dnia profilu do północy po ostatnim dniu (włącznie).
+
+        Returns:
+            Znaczniki czasu kolejnych godzin (jak profile_timestamps)
+        """
+        return pd.date_range(start=self.start, end=self.end, freq='h')
+
+    def hourly_values(self, timestamps: pd.DatetimeIndex) -> np.ndarray:
+        """
+        Zwraca wartości profilu dla kolejnych godzin zakresu (NaN dla godzin spoza profilu).
+
+        Args:
+            timestamps: Znaczniki czasu godzin
+
+        Returns:
+            Tablica wartości (jak profile_values)
+        """
+        return self.values.reindex(timestamps).to_numpy(dtype=np.float64)
+
+
+@dataclass
+class ProfileWorkbook:
+    """
+    Profile wszystkich arkuszy pliku wraz z błędami i czasem wczytywania.
+    """
+    profiles: Dict[str, ProfileSeries] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    sheet_names: List[str] = field(default_factory=list)
+    read_seconds: float = 0.0
+    cached: bool = False
+
+    def sheet(self, sheet_name=0) -> ProfileSeries:
+        """
+        Zwraca profil arkusza o podanej nazwie lub numerze.
+
+        Args:
+            sheet_name: Nazwa lub numer arkusza
+
+        Returns:
+            Obiekt ProfileSeries
+
+        Raises:
+            ValueError: Gdy arkusza nie udało się wczytać jako profilu
+        """
+        if isinstance(sheet_name, int):
+            sheet_name = self.sheet_names[sheet_name]
+        if sheet_name in self.errors:
+            raise ValueError(self.errors[sheet_name])
+        return self.profiles[sheet_name]
+
+
+def _missing(frame: pd.DataFrame) -> np.ndarray:
+    """
+    Zwraca maskę pustych komórek (puste teksty pd.read_excel również zamienia na NaN).
+    """
+    return (frame.isna() | frame.eq('')).to_numpy()
+
+
+def _label_date(label) -> Optional[pd.Timestamp]:
+    """
+    Zwraca datę kolumny profilu dd.mm.yyyy (None dla innych nazw, np. Time).
+    """
+    try:
+        return pd.Timestamp(datetime.datetime.strptime(str(label), PROFILE_DATE_FORMAT))
+    except ValueError:
+        return None
+
+
+def _isoformat(value: Optional[pd.Timestamp]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def parse_rows(rows: Sequence[Sequence]) -> ProfileSeries:
+    """
+    Buduje serię profilu bezpośrednio z wierszy arkusza (dni w wierszach).
+
+    Wynik odpowiada przekształceniu prepare_profile i melt_profile,
+    ale bez transpozycji i zmiany nazw kolumn. Tak jak pd.read_excel,
+    pomijane są tylko puste kolumny i wiersze na końcu arkusza, a puste
+    wiersze wewnątrz arkusza (również w stopce) są zachowywane.
+
+    Args:
+        rows: Wiersze arkusza (pierwszy wiersz to nagłówek)
+
+    Returns:
+        Obiekt ProfileSeries
+    """
+    frame = pd.DataFrame(list(rows), dtype=object)
+    missing = _missing(frame)
+    filled_rows = np.flatnonzero(~missing.all(axis=1))
+    if not len(filled_rows):
+        raise ValueError("Arkusz profilu jest pusty.")
+    filled_columns = np.flatnonzero(~missing.all(axis=0))
+    frame = frame.iloc[:filled_rows[-1] + 1, :filled_columns[-1] + 1]
+
+    names = [f"Unnamed: {i}" if pd.isna(name) or name == '' else name for i, name in enumerate(frame.iloc[0])]
+    for column in DROPPED_COLUMNS:
+        if column not in names:
+            raise KeyError(f"['{column}'] not found in axis")
+    frame = frame.drop(columns=[frame.columns[names.index(column)] for column in DROPPED_COLUMNS])
+
+    data = frame.iloc[1:len(frame) - TRAILING_ROWS]
+    labels = profile_labels(data.iloc[:, 0])
+    if 'Time' not in labels:
+        raise KeyError('Time')
+    hours = hour_numbers(data.iloc[labels.index('Time'), 1:])
+    hour_columns = np.flatnonzero(hours.notna().to_numpy())
+
+    days = pd.to_datetime(pd.Series(labels), format=PROFILE_DATE_FORMAT, errors='coerce').to_numpy()
+    day_rows = np.flatnonzero(~np.isnat(days))
+    block = data.iloc[day_rows, hour_columns + 1].apply(pd.to_numeric, errors='coerce')
+    offsets = pd.to_timedelta(hours.to_numpy()[hour_columns].astype(np.int64) % 24, unit='h').to_numpy()
+    index = pd.DatetimeIndex((days[day_rows][:, None] + offsets[None, :]).ravel(), name='Timestamp')
+    series = pd.Series(block.to_numpy(dtype=np.float64).ravel(), index=index, name='ECP')
+    # Przy powtórzonej etykiecie godziny obowiązuje pierwsza wartość
+    series = series[~index.duplicated(keep='first')]
+
+    extra_rows = np.flatnonzero(~_missing(data.iloc[:, [-1]])[:, 0])
+    extra = data.iat[extra_rows[-1], data.shape[1] - 1]
+    start = datetime.datetime.strptime(labels[1], PROFILE_DATE_FORMAT)
+    end = datetime.datetime.strptime(labels[-1], PROFILE_DATE_FORMAT) + datetime.timedelta(days=1)
+    return ProfileSeries(
+        values=series,
+        start=pd.Timestamp(start),
+        end=pd.Timestamp(end),
+        extra_value=float(extra) if isinstance(extra, (int, float, np.number)) else extra,
+        extra_date=_label_date(labels[extra_rows[-1]])
+    )
+
+
+def from_profile(profil: pd.DataFrame) -> ProfileSeries:
+    """
+    Buduje serię z profilu przekształconego przez prepare_profile.
+
+    Args:
+        profil: Profil z kolumną Time i kolumnami dat dd.mm.yyyy
+
+    Returns:
+        Obiekt ProfileSeries
+    """
+    timestamps = profile_timestamps(profil)
+    long = melt_profile(profil)
+    series = pd.Series(
+        pd.to_numeric(long['ECP'], errors='coerce').to_numpy(dtype=np.float64),
+        index=pd.DatetimeIndex(long['Timestamp'], name='Timestamp'),
+        name='ECP'
+    )
+    return ProfileSeries(
+        series, timestamps[0], timestamps[-1], extra_hour_value(profil),
+        _label_date(profil.iloc[-1].dropna().index[-1])
+    )
+
+
+def _read_workbook(data: bytes) -> ProfileWorkbook:
+    """
+    Wczytuje wszystkie arkusze pliku z profilami.
+
+    Pliki xlsx są odczytywane strumieniowo (openpyxl w trybie tylko do odczytu),
+    a pozostałe (xls) przez pd.read_excel i prepare_profile.
+
+    Args:
+        data: Zawartość pliku xls/xlsx
+
+    Returns:
+        Obiekt ProfileWorkbook
+    """
+    result = ProfileWorkbook()
+    if zipfile.is_zipfile(io.BytesIO(data)):
+        workbook = load_workbook(io.BytesIO(data), read_only=True, data_only=True)
+        try:
+            for sheet in workbook.worksheets:
+                result.sheet_names.append(sheet.title)
+                # Wymiary zapisane w pliku bywają nieaktualne (tak samo postępuje pd.read_excel)
+                sheet.reset_dimensions()
+                try:
+                    result.profiles[sheet.title] = parse_rows(list(sheet.iter_rows(values_only=True)))
+                except PROFILE_ERRORS as e:
+                    result.errors[sheet.title] = str(e)
+        finally:
+            workbook.close()
+    else:
+        for sheet_name, raw in pd.read_excel(io.BytesIO(data), sheet_name=None).items():
+            result.sheet_names.append(sheet_name)
+            try:
+                result.profiles[sheet_name] = from_profile(prepare_profile(raw))
+            except PROFILE_ERRORS as e:
+                result.errors[sheet_name] = str(e)
+    return result
+
+
+def get_cache_dir() -> str:
+    """
+    Zwraca katalog pamięci podręcznej wczytanych profili.
+
+    Returns:
+        Ścieżka katalogu ZONES_CACHE_DIR (domyślnie data/zones w katalogu projektu)
+    """
+    return get_config_value("ZONES_CACHE_DIR", os.path.join(PROJECT_ROOT, "data", "zones"))
+
+
+def prune_cache(cache_dir: str, max_bytes: int, max_age: float) -> List[str]:
+    """
+    Usuwa z katalogu pamięci podręcznej pliki starsze niż max_age oraz
+    najdawniej używane pliki ponad limit max_bytes.
+
+    Data modyfikacji pliku jest odświeżana przy każdym odczycie, więc
+    usuwane są profile, z których najdłużej nikt nie korzystał. Usuwane są
+    też pozostawione pliki tymczasowe i pliki starszych wersji formatu.
+
+    Args:
+        cache_dir: Katalog pamięci podręcznej
+        max_bytes: Maksymalny łączny rozmiar plików (0 oznacza brak ograniczenia)
+        max_age: Maksymalny czas od ostatniego użycia w sekundach (0 oznacza brak ograniczenia)
+
+    Returns:
+        Lista usuniętych plików
+    """
+    try:
+        entries = [entry for entry in os.scandir(cache_dir) if entry.name.endswith(('.arrow', '.tmp')) and entry.is_file()]
+    except OSError:
+        return []
+    files = []
+    for entry in entries:
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        files.append((stat.st_mtime, stat.st_size, entry.path))
+    files.sort(reverse=True)
+
+    now = time.time()
+    total = 0
+    removed = []
+    for mtime, size, path in files:
+        total += size
+        if (max_age and now - mtime > max_age) or (max_bytes and total > max_bytes):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            removed.append(path)
+            total -= size
+    return removed
+
+
+def _cache_path(data: bytes, cache_dir: str) -> str:
+    key = hashlib.blake2b(data, digest_size=16).hexdigest()
+    return os.path.join(cache_dir, f"{key}-v{CACHE_VERSION}.arrow")
+
+
+def _save_cache(workbook: ProfileWorkbook, path: str) -> None:
+    """
+    Zapisuje profile pliku w formacie Arrow (Feather) z opisem arkuszy w metadanych.
+
+    Args:
+        workbook: Wczytane profile
+        path: Ścieżka pliku pamięci podręcznej
+    """
+    sheets = list(workbook.profiles)
+    table = pa.table({
+        'sheet': pa.array(np.repeat(
+            np.arange(len(sheets), dtype=np.int32),
+            [len(workbook.profiles[sheet].values) for sheet in sheets]
+        )),
+        'Timestamp': pa.array(
+            np.concatenate([p.values.index.to_numpy() for p in workbook.profiles.values()])
+            if sheets else np.empty(0, dtype='datetime64[ns]')
+        ),
+        'ECP': pa.array(
+            np.concatenate([p.values.to_numpy() for p in workbook.profiles.values()])
+            if sheets else np.empty(0, dtype=np.float64)
+        )
+    })
+    meta = {
+        'sheet_names': workbook.sheet_names,
+        'errors': workbook.errors,
+        'profiles': [
+            {
+                'sheet': sheet,
+                'start': workbook.profiles[sheet].start.isoformat(),
+                'end': workbook.profiles[sheet].end.isoformat(),
+                'extra_value': workbook.profiles[sheet].extra_value,
+                'extra_date': _isoformat(workbook.profiles[sheet].extra_date)
+            }
+            for sheet in sheets
+        ]
+    }
+    table = table.replace_schema_metadata({'profiles': json.dumps(meta)})
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Zapis do pliku tymczasowego i zamiana nazwy, żeby inne sesje nie czytały niepełnego pliku
+    temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    feather.write_feather(table, temp_path, compression='uncompressed')
+    os.replace(temp_path, path)
+
+
+def _load_cache(path: str) -> ProfileWorkbook:
+    """
+    Odczytuje profile pliku zapisane przez _save_cache.
+
+    Args:
+        path: Ścieżka pliku pamięci podręcznej
+
+    Returns:
+        Obiekt ProfileWorkbook
+    """
+    table = feather.read_table(path, memory_map=True)
+    meta = json.loads(table.schema.metadata[b'profiles'])
+    sheet_ids = table.column('sheet').to_numpy()
+    timestamps = table.column('Timestamp').to_numpy()
+    values = table.column('ECP').to_numpy()
+    bounds = np.searchsorted(sheet_ids, np.arange(len(meta['profiles']) + 1))
+
+    result = ProfileWorkbook(sheet_names=meta['sheet_names'], errors=meta['errors'], cached=True)
+    for i, profile in enumerate(meta['profiles']):
+        rows = slice(bounds[i], bounds[i + 1])
+        result.profiles[profile['sheet']] = ProfileSeries(
+            values=pd.Series(values[rows], index=pd.DatetimeIndex(timestamps[rows], name='Timestamp'), name='ECP'),
+            start=pd.Timestamp(profile['start']),
+            end=pd.Timestamp(profile['end']),
+            extra_value=profile['extra_value'],
+            extra_date=pd.Timestamp(profile['extra_date']) if profile['extra_date'] else None
+        )
+    return result
+
+
+def load_profiles(data: bytes, cache: bool = True, cache_dir: Optional[str] = None) -> ProfileWorkbook:
+    """
+    Wczytuje profile wszystkich arkuszy pliku, korzystając z pamięci podręcznej Arrow.
+
+    Wczytany plik jest zapisywany w katalogu pamięci podręcznej pod skrótem
+    zawartości, więc ponowne wczytanie tego samego pliku (np. przy kolejnym
+    uruchomieniu skryptu Streamlit) pomija odczyt arkusza. Po każdym zapisie
+    katalog jest ograniczany do ZONES_CACHE_MB i ZONES_CACHE_DAYS (prune_cache).
+    Czas wczytywania jest zapisywany w polu read_seconds wyniku.
+
+    Args:
+        data: Zawartość pliku xls/xlsx
+        cache: Czy korzystać z pamięci podręcznej
+        cache_dir: Katalog pamięci podręcznej (domyślnie ZONES_CACHE_DIR)
+
+    Returns:
+        Obiekt ProfileWorkbook
+    """
+    started = time.perf_counter()
+    cache_dir = cache_dir or get_cache_dir()
+    path = _cache_path(data, cache_dir) if cache else None
+    result = None
+    if path and os.path.exists(path):
+        try:
+            result = _load_cache(path)
+            # Odświeżenie daty modyfikacji: prune_cache usuwa najdawniej używane pliki
+            os.utime(path)
+        except (OSError, KeyError, ValueError, pa.ArrowException):
+            result = None
+    if result is None:
+        result = _read_workbook(data)
+        if path:
+            try:
+                _save_cache(result, path)
+            except OSError:
+                pass
+            prune_cache(
+                cache_dir,
+                get_config_value("ZONES_CACHE_MB", 256) * 1024 * 1024,
+                get_config_value("ZONES_CACHE_DAYS", 7) * 24 * 3600
+            )
+    result.read_seconds = time.perf_counter() - started
+    return result
+
+
+def load_profile(data: bytes, sheet_name=0, cache: bool = True, cache_dir: Optional[str] = None) -> ProfileSeries:
+    """
+    Wczytuje profil jednego arkusza pliku (jak read_profile, ale jako serię wartości).
+
+    Args:
+        data: Zawartość pliku xls/xlsx
+        sheet_name: Nazwa lub numer arkusza
+        cache: Czy korzystać z pamięci podręcznej
+        cache_dir: Katalog pamięci podręcznej (domyślnie ZONES_CACHE_DIR)
+
+    Returns:
+        Obiekt ProfileSeries
+    """
+    return load_profiles(data, cache=cache, cache_dir=cache_dir).sheet(sheet_name)
@@ -0,0 +1,193 @@
+"""
+Moduł zawierający sumowanie zużycia energii w strefach taryfowych
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Sequence
+from .engine import TARIFS_WITH_HOLIDAYS, ZONE_LABELS, assign_zones_batch
+from .profile import join_profile
+
+# Kolumny tabeli sum stref w okresach (miesiącach lub dniach)
+BREAKDOWN_COLUMNS = ['Taryfa', 'Okres', 'S1', 'S2', 'S3', 'Suma']
+
+# Okresy podziału wyników: {kod częstotliwości: nazwa}
+BREAKDOWN_PERIODS = {'M': 'Miesiące', 'D': 'Dni'}
+
+
+def extra_hour_value(profil: pd.DataFrame) -> float:
+    """
+    Zwraca wartość z ostatniego wiersza profilu (ostatnia wartość różna od NaN).
+
+    Wartość ta nie jest przypisana do żadnej godziny zakresu, więc jest
+    doliczana do sumy całkowitej oraz do strefy S3 (taryfy z dniami wolnymi)
+    lub S2 (pozostałe taryfy).
+
+    Args:
+        profil: Profil z kolumną Time i kolumnami dat
+
+    Returns:
+        Wartość dodatkowa
+    """
+    return profil.iloc[-1].dropna().tolist()[-1]
+
+
+def profile_values(timestamps: pd.DatetimeIndex, profil: pd.DataFrame) -> np.ndarray:
+    """
+    Zwraca wartości profilu dla kolejnych godzin zakresu (NaN dla godzin spoza profilu).
+
+    Args:
+        timestamps: Znaczniki czasu godzin
+        profil: Profil z kolumną Time i kolumnami dat
+
+    Returns:
+        Tablica wartości
+    """
+    joined = join_profile(pd.DataFrame({'Timestamp': timestamps}), profil)
+    return pd.to_numeric(joined['ECP'], errors='coerce').to_numpy(dtype=np.float64)
+
+
+def zone_sums(codes: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """
+    Sumuje wartości w strefach dla każdej taryfy.
+
+    Args:
+        codes: Kody stref (taryfa x godzina)
+        values: Wartości godzin (NaN traktowane jak 0)
+
+    Returns:
+        Tablica sum (taryfa x strefa S1-S3)
+    """
+    values = np.nan_to_num(values)
+    return np.stack(
+        [np.where(codes == code, values, 0.0).sum(axis=-1) for code in range(1, len(ZONE_LABELS) + 1)],
+        axis=-1
+    )
+
+
+def summarize(tariff: str, sums: Sequence[float], total: float, extra_value: float) -> Dict:
+    """
+    Wyznacza sumy i udziały stref taryfy, doliczając wartość dodatkową.
+
+    Args:
+        tariff: Nazwa taryfy
+        sums: Sumy wartości w strefach S1, S2, S3
+        total: Suma wszystkich wartości profilu
+        extra_value: Wartość dodatkowa z extra_hour_value
+
+    Returns:
+        Słownik z kluczami Taryfa, S1, S2, S3, Suma, S1 %, S2 %, S3 %
+    """
+    s1, s2, s3 = (float(value) for value in sums)
+    holidays = tariff in TARIFS_WITH_HOLIDAYS
+    total_sum = round(total + extra_value, 2)
+    s1_sum = round(s1, 2)
+    s2_sum = round(s2, 2) if holidays else round(s2 + extra_value, 2)
+    s3_sum = round(s3 + extra_value, 2) if holidays else 0
+    return {
+        'Taryfa': tariff,
+        'S1': s1_sum,
+        'S2': s2_sum,
+        'S3': s3_sum,
+        'Suma': total_sum,
+        'S1 %': round(s1_sum / total_sum * 100, 2) if total_sum else 0,
+        'S2 %': round(s2_sum / total_sum * 100, 2) if total_sum else 0,
+        'S3 %': round(s3_sum / total_sum * 100, 2) if total_sum else 0
+    }
+
+
+def compare_tariffs(
+    timestamps: pd.DatetimeIndex,
+    values: np.ndarray,
+    extra_value: float,
+    tariffs: Dict[str, np.ndarray],
+    names: Sequence[str]
+) -> List[Dict]:
+    """
+    Oblicza sumy stref wielu taryf dla tego samego profilu w jednym przebiegu.
+
+    Args:
+        timestamps: Znaczniki czasu godzin
+        values: Wartości godzin z profile_values
+        extra_value: Wartość dodatkowa z extra_hour_value
+        tariffs: Słownik {nazwa taryfy: tablica kodów stref}
+        names: Nazwy porównywanych taryf
+
+    Returns:
+        Lista słowników z summarize, w kolejności names
+    """
+    tables = np.stack([tariffs[name] for name in names])
+    holidays = [name in TARIFS_WITH_HOLIDAYS for name in names]
+    sums = zone_sums(assign_zones_batch(timestamps, tables, holidays), values)
+    total = float(np.nansum(values))
+    return [summarize(name, tariff_sums, total, extra_value) for name, tariff_sums in zip(names, sums)]
+
+
+def zone_breakdown(
+    timestamps: pd.DatetimeIndex,
+    values: np.ndarray,
+    extra_value: float,
+    tariffs: Dict[str, np.ndarray],
+    names: Sequence[str],
+    freq: str = 'M',
+    extra_date: Optional[pd.Timestamp] = None
+) -> pd.DataFrame:
+    """
+    Oblicza sumy stref taryf w kolejnych miesiącach lub dniach profilu.
+
+    Sumy są wyznaczane jednym grupowaniem po kategoriach (taryfa, okres, strefa).
+    Okresy bez żadnej wartości profilu są pomijane.
+    Wartość dodatkowa jest doliczana do okresu zawierającego extra_date
+    (lub do ostatniego okresu), tak jak w summarize, więc sumy okresów
+    zgadzają się z wynikiem dla całego profilu.
+
+    Args:
+        timestamps: Znaczniki czasu godzin
+        values: Wartości godzin z profile_values
+        extra_value: Wartość dodatkowa z extra_hour_value
+        tariffs: Słownik {nazwa taryfy: tablica kodów stref}
+        names: Nazwy taryf
+        freq: 'M' (miesiące) lub 'D' (dni)
+        extra_date: Dzień, do którego należy wartość dodatkowa
+
+    Returns:
+        DataFrame z kolumnami BREAKDOWN_COLUMNS
+    """
+    names = list(dict.fromkeys(names))
+    tables = np.stack([tariffs[name] for name in names])
+    holidays = np.array([name in TARIFS_WITH_HOLIDAYS for name in names])
+    codes = assign_zones_batch(timestamps, tables, holidays)
+    period_codes, periods = pd.factorize(timestamps.to_period(freq))
+    # Okresy bez wartości profilu (np. północ po ostatnim dniu) są pomijane
+    filled = np.bincount(period_codes, weights=~np.isnan(values), minlength=len(periods)) > 0
+    values = np.nan_to_num(values)
+
+    frame = pd.DataFrame({
+        'Taryfa': pd.Categorical.from_codes(np.repeat(np.arange(len(names)), len(timestamps)), categories=names),
+        'Okres': pd.Categorical.from_codes(np.tile(period_codes, len(names)), categories=periods.astype(str)),
+        'Strefa': pd.Categorical.from_codes(codes.ravel().astype(np.int64) - 1, categories=list(ZONE_LABELS)),
+        'ECP': np.tile(values, len(names))
+    })
+    sums = frame.groupby(['Taryfa', 'Okres', 'Strefa'], observed=False)['ECP'].sum().unstack('Strefa')
+    sums = sums.reindex(columns=list(ZONE_LABELS), fill_value=0.0).to_numpy(copy=True)
+    sums = sums.reshape(len(names), len(periods), len(ZONE_LABELS))
+    totals = np.bincount(period_codes, weights=values, minlength=len(periods))
+
+    extra_period = len(periods) - 1
+    if extra_date is not None:
+        matches = np.flatnonzero(periods == pd.Timestamp(extra_date).to_period(freq))
+        if len(matches):
+            extra_period = matches[0]
+    # Wartość dodatkowa trafia do S3 (taryfy z dniami wolnymi) lub S2 (pozostałe), a S3 pozostałych taryf to 0
+    sums[holidays, extra_period, 2] += extra_value
+    sums[~holidays, extra_period, 1] += extra_value
+    sums[~holidays, :, 2] = 0.0
+    totals[extra_period] += extra_value
+    filled[extra_period] = True
+
+    result = pd.DataFrame({
+        'Taryfa': np.repeat(names, len(periods)),
+        'Okres': np.tile(periods.astype(str), len(names)),
+        **{label: sums[:, :, i].ravel() for i, label in enumerate(ZONE_LABELS)},
+        'Suma': np.tile(totals, len(names))
+    })
+    return result[np.tile(filled, len(names))].reset_index(drop=True).round(2)
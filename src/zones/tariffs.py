@@ -0,0 +1,67 @@
+"""
+Moduł zawierający wczytywanie definicji stref taryfowych z pliku strefy_new.xlsx
+"""
+import os
+import threading
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Tuple
+from src.core.config import PROJECT_ROOT, get_config_value
+from .engine import zone_table
+
+# Wymiary tablicy stref: godziny doby x miesiące
+TABLE_SHAPE = (24, 12)
+
+_tariffs: Dict[str, np.ndarray] = {}
+_tariffs_key: Optional[Tuple[str, int]] = None
+_tariffs_lock = threading.Lock()
+
+
+def read_tariffs(path: str) -> Dict[str, np.ndarray]:
+    """
+    Wczytuje wszystkie arkusze pliku stref jako tablice kodów stref.
+
+    Args:
+        path: Ścieżka pliku xlsx z arkuszami stref (jeden arkusz na taryfę)
+
+    Returns:
+        Słownik {nazwa taryfy: tablica kodów stref 24 x 12}
+    """
+    tariffs = {}
+    for sheet_name, zone_df in pd.read_excel(path, sheet_name=None).items():
+        table = zone_table(zone_df)
+        if table.shape != TABLE_SHAPE or not table.all():
+            raise ValueError(f"Arkusz '{sheet_name}' nie zawiera pełnej tabeli stref 24 x 12 (S1, S2, S3).")
+        table.flags.writeable = False
+        tariffs[sheet_name] = table
+    return tariffs
+
+
+def get_zones_file() -> str:
+    """
+    Zwraca ścieżkę pliku stref z konfiguracji (domyślnie input/strefy_new.xlsx w katalogu projektu).
+
+    Returns:
+        Ścieżka pliku stref
+    """
+    return get_config_value("ZONES_FILE", os.path.join(PROJECT_ROOT, "input", "strefy_new.xlsx"))
+
+
+def get_tariffs(path: Optional[str] = None) -> Dict[str, np.ndarray]:
+    """
+    Zwraca definicje stref, wczytując plik ponownie tylko po zmianie daty jego modyfikacji.
+
+    Args:
+        path: Ścieżka pliku stref (domyślnie ZONES_FILE)
+
+    Returns:
+        Słownik {nazwa taryfy: tablica kodów stref 24 x 12}
+    """
+    global _tariffs, _tariffs_key
+    path = path or get_zones_file()
+    key = (os.path.abspath(path), os.stat(path).st_mtime_ns)
+    with _tariffs_lock:
+        if key != _tariffs_key:
+            _tariffs = read_tariffs(path)
+            _tariffs_key = key
+        return _tariffs
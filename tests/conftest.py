@@ -0,0 +1,101 @@
+"""
+Wspólne dane testowe: pliki pomiarowe PTPiREE (.dat) i pliki z profilami w układzie arkuszy operatora
+"""
+import datetime
+import io
+import os
+import random
+import sys
+import pytest
+from openpyxl import Workbook
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.config import CONFIG  # noqa: E402
+
+
+def build_dat_file(
+    values,
+    date: str = "01-03-2024",
+    point: str = "PL0000000000000001",
+    channel: str = "CP",
+    newline: bytes = b"\n"
+) -> bytes:
+    """
+    Tworzy plik .dat: sześć linii nagłówka (data w piątej), wartości ze znacznikiem statusu i dwie linie stopki.
+
+    Args:
+        values: Wartości profilu (liczby lub gotowe linie bajtowe, np. uszkodzone)
+        date: Data profilu dd-mm-yyyy
+        point: Kod punktu poboru
+        channel: Kanał pomiarowy
+        newline: Znak końca linii
+
+    Returns:
+        Zawartość pliku .dat
+    """
+    header = [b"PTPIREE", f"{point}_{channel}".encode(), b"A+", b"kWh", date.encode(), b"15"]
+    lines = [value if isinstance(value, bytes) else f"{value:10.3f} A".encode() for value in values]
+    return newline.join(header + lines + [b"KONIEC", b""])
+
+
+def random_values(count: int, seed: int = 0):
+    """
+    Zwraca losowe wartości profilu z dokładnością do 0.001 kWh.
+    """
+    rnd = random.Random(seed)
+    return [rnd.randint(0, 5000) / 1000 for _ in range(count)]
+
+
+def build_profile_workbook(
+    start: datetime.date = datetime.date(2024, 10, 1),
+    days: int = 40,
+    seed: int = 0,
+    blank_rows=()
+) -> bytes:
+    """
+    Tworzy plik xlsx z profilem: nagłówek, wiersz etykiet godzin, dni w wierszach i trzy wiersze stopki.
+
+    Dzień zmiany czasu z 25 godzinami ma wartość dodatkowej godziny w kolumnie H25.
+
+    Args:
+        start: Pierwszy dzień profilu
+        days: Liczba dni
+        seed: Ziarno generatora wartości
+        blank_rows: Numery wierszy arkusza (od 1), które mają zostać puste
+
+    Returns:
+        Zawartość pliku xlsx
+    """
+    rnd = random.Random(seed)
+    rows = [
+        ["Data", "P,O,B"] + [f"H{i}" for i in range(1, 26)] + [None],
+        [None, None] + [f"{hour:02d}:00" for hour in range(1, 25)] + ["02a:00", "-"]
+    ]
+    for offset in range(days):
+        day = start + datetime.timedelta(days=offset)
+        extra = rnd.randint(0, 500) / 10 if day.month == 10 and day.day >= 25 and day.weekday() == 6 else None
+        values = [rnd.randint(0, 500) / 10 for _ in range(24)]
+        rows.append([datetime.datetime.combine(day, datetime.time()), "P"] + values + [extra, None])
+    rows.append(["Suma", None] + [1] * 24 + [None, None])
+    rows.append(["Min", None] + [0] * 24 + [None, None])
+    rows.append(["Max", None] + [2] * 24 + [None, None])
+
+    workbook = Workbook()
+    sheet = workbook.active
+    for number, row in enumerate(rows, start=1):
+        sheet.append([None] * len(row) if number in blank_rows else row)
+    output = io.BytesIO()
+    workbook.save(output)
+    return output.getvalue()
+
+
+@pytest.fixture(autouse=True)
+def zones_cache_dir(tmp_path, monkeypatch):
+    """Pamięć podręczna profili stref w katalogu tymczasowym testu zamiast w katalogu projektu."""
+    monkeypatch.setitem(CONFIG, "ZONES_CACHE_DIR", str(tmp_path / "zones"))
+
+
+@pytest.fixture
+def profile_workbook():
+    return build_profile_workbook
@@ -0,0 +1,74 @@
+import datetime
+import multiprocessing
+import os
+import numpy as np
+import pyarrow.dataset as ds
+from conftest import build_dat_file, random_values
+from src.ptpiree import parse_files
+from src.ptpiree.archive import PARTITIONING, _to_table, archive_points, load_parsed, save_parsed
+
+
+def build_parsed(points=("PL0", "PL1"), days=range(1, 6), month=4, tag="a"):
+    files = [
+        (f"{point}_CP_2024{month:02d}{day:02d}.dat", build_dat_file(random_values(96, seed=day), f"{day:02d}-{month:02d}-2024", point))
+        for point in points for day in days
+    ]
+    parsed = parse_files(files)
+    for parsed_file in parsed:
+        parsed_file.content_hash = f"{tag}-{parsed_file.name}"
+    return parsed
+
+
+def partition_files(root):
+    return sorted(
+        os.path.relpath(os.path.join(path, name), root)
+        for path, _, names in os.walk(root) for name in names if not name.startswith(".")
+    )
+
+
+def save_in_process(root, points, tag):
+    return save_parsed(build_parsed(points=points, tag=tag), root)
+
+
+def test_saves_keep_one_file_per_partition_and_skip_duplicates(tmp_path):
+    root = str(tmp_path / "archive")
+
+    assert save_parsed(build_parsed(days=range(1, 3)), root) == 4
+    assert save_parsed(build_parsed(days=range(1, 6)), root) == 6
+    assert save_parsed(build_parsed(month=5), root) == 10
+    assert save_parsed(build_parsed(), root) == 0
+
+    assert partition_files(root) == [
+        os.path.join(f"point={point}", f"month=2024-{month:02d}", "part-0.parquet")
+        for point in ("PL0", "PL1") for month in (4, 5)
+    ]
+    assert archive_points(root) == ["PL0", "PL1"]
+    loaded = load_parsed(root, points=["PL1"], date_from=datetime.date(2024, 4, 2), date_to=datetime.date(2024, 4, 3))
+    assert [f.name for f in loaded] == ["PL1_CP_20240402.dat", "PL1_CP_20240403.dat"]
+    np.testing.assert_array_equal(loaded[0].values, build_parsed(points=("PL1",), days=[2])[0].values)
+
+
+def test_fragmented_partition_is_compacted(tmp_path):
+    root = str(tmp_path / "archive")
+    for day in (1, 2):
+        # Zapis w dotychczasowym układzie: osobny plik dla każdego zapisu
+        ds.write_dataset(
+            _to_table(build_parsed(points=("PL0",), days=[day])), root, format="parquet",
+            partitioning=PARTITIONING, basename_template=f"old{day}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore"
+        )
+
+    assert save_parsed(build_parsed(points=("PL0",), days=range(1, 4)), root) == 1
+    assert partition_files(root) == [os.path.join("point=PL0", "month=2024-04", "part-0.parquet")]
+    assert [f.name for f in load_parsed(root)] == [f"PL0_CP_2024040{day}.dat" for day in (1, 2, 3)]
+
+
+def test_saves_from_several_processes_are_not_lost(tmp_path):
+    root = str(tmp_path / "archive")
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(4) as pool:
+        saved = pool.starmap(save_in_process, [(root, ("PL0", "PL1"), f"p{i}") for i in range(4)])
+
+    assert saved == [10, 10, 10, 10]
+    assert len(load_parsed(root)) == 40
+    assert len(partition_files(root)) == 2
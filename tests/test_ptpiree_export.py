@@ -0,0 +1,128 @@
+import datetime
+import io
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+from conftest import build_dat_file, random_values
+from src.ptpiree import ProfileStore, parse_files
+from src.ptpiree.export import SUMMARY_TITLES, build_profiles_workbook, build_summary_workbook
+
+DAYS = [datetime.date(2024, 3, 30), datetime.date(2024, 3, 28), datetime.date(2024, 3, 31), datetime.date(2024, 3, 29)]
+
+
+def build_files():
+    """Pliki dwóch punktów w kanałach CP i CO, wgrane w kolejności innej niż kolejność dat."""
+    files = []
+    for point in range(2):
+        for channel in ("CP", "CO"):
+            for i, day in enumerate(DAYS):
+                count = 92 if day == datetime.date(2024, 3, 31) else 96
+                data = build_dat_file(random_values(count, seed=point * 10 + i), f"{day:%d-%m-%Y}", f"PL{point}", channel)
+                files.append((f"PL{point}_{channel}_{day:%Y%m%d}.dat", data))
+    return files
+
+
+def old_profiles_workbook(store: ProfileStore) -> bytes:
+    """Plik z profilami tworzony jak w pierwotnej stronie kalkulatora (DataFrame.to_excel dla każdej grupy)."""
+    output = io.BytesIO()
+    with pd.ExcelWriter(output, engine="openpyxl") as writer:
+        for group_name, channel in zip(store.groups, store.group_channels):
+            rows = store.group_rows(channel, group_name)
+            max_length = int(store.lengths[rows].max())
+            data = []
+            for row in rows:
+                profile = store.profile(row).tolist()
+                row_data = {"Nazwa pliku": store.file_key(row), "Data profilu": store.date_labels[row]}
+                for i, value in enumerate(profile + [None] * (max_length - len(profile))):
+                    row_data[f"{i+1}"] = value
+                data.append(row_data)
+            profiles_df = pd.DataFrame(data)
+            profiles_df["Data profilu"] = pd.to_datetime(profiles_df["Data profilu"], format="%d-%m-%Y", errors="coerce")
+            profiles_df = profiles_df.sort_values(by="Data profilu", ascending=True, na_position="last")
+            profiles_df["Data profilu"] = profiles_df["Data profilu"].dt.strftime("%d-%m-%Y")
+            profiles_df.to_excel(writer, sheet_name=group_name, index=False, startrow=2)
+            ws = writer.sheets[group_name]
+            ws.cell(row=1, column=1, value=f"Profile plików PTPiREE - {group_name}")
+            for row in range(4, len(profiles_df) + 4):
+                for col in range(2, max_length + 3):
+                    ws.cell(row=row, column=col).number_format = "0.000"
+            ws.cell(row=len(profiles_df) + 5, column=1, value="Data wygenerowania")
+            ws.cell(row=len(profiles_df) + 5, column=2, value=datetime.datetime.now()).number_format = "YYYY-MM-DD HH:MM:SS"
+    return output.getvalue()
+
+
+def old_summary_workbook(df: pd.DataFrame, title: str) -> bytes:
+    """Raport zbiorczy tworzony jak w pierwotnej stronie kalkulatora."""
+    df_to_excel = df.drop(columns=["Profil"], errors="ignore")
+    output = io.BytesIO()
+    with pd.ExcelWriter(output, engine="openpyxl") as writer:
+        writer.sheets["Sheet1"] = writer.book.create_sheet("Sheet1")
+        writer.sheets["Sheet1"].cell(row=1, column=2, value=title)
+        df_to_excel.to_excel(writer, sheet_name="Sheet1", index=False, startrow=2)
+        ws = writer.sheets["Sheet1"]
+        suma_col = list(df_to_excel.columns).index("Suma") + 1
+        for row in range(4, len(df_to_excel) + 4):
+            ws.cell(row=row, column=suma_col).number_format = "0.000"
+        last_row = len(df_to_excel) + 5
+        ws.cell(row=last_row, column=2, value="Ilość plików sumarycznie")
+        ws.cell(row=last_row, column=3, value=int(df_to_excel["Pliki"].sum())).number_format = "0"
+        ws.cell(row=last_row + 1, column=2, value="Całkowity wolumen")
+        ws.cell(row=last_row + 1, column=3, value=float(df_to_excel["Suma"].sum())).number_format = "0.000"
+        ws.cell(row=last_row + 2, column=2, value="Data wykonania raportu")
+        ws.cell(row=last_row + 2, column=3, value=datetime.datetime.now()).number_format = "YYYY-MM-DD HH:MM:SS"
+    return output.getvalue()
+
+
+def sheet_cells(ws):
+    """Wartości i formaty niepustych komórek arkusza (bez daty wygenerowania pliku)."""
+    cells = {}
+    for row in ws.iter_rows():
+        for cell in row:
+            if cell.value is None or isinstance(cell.value, datetime.datetime):
+                continue
+            cells[cell.coordinate] = (cell.value, cell.number_format if isinstance(cell.value, (int, float)) else None)
+    return cells
+
+
+def assert_same_layout(data: bytes, expected: bytes):
+    workbook, expected_workbook = load_workbook(io.BytesIO(data)), load_workbook(io.BytesIO(expected))
+    assert workbook.sheetnames == expected_workbook.sheetnames
+    for name in workbook.sheetnames:
+        ws, expected_ws = workbook[name], expected_workbook[name]
+        assert sheet_cells(ws) == sheet_cells(expected_ws)
+        assert ws.max_row == expected_ws.max_row
+        generated = [cell for row in ws.iter_rows() for cell in row if isinstance(cell.value, datetime.datetime)]
+        expected_generated = [cell for row in expected_ws.iter_rows() for cell in row if isinstance(cell.value, datetime.datetime)]
+        assert [cell.coordinate for cell in generated] == [cell.coordinate for cell in expected_generated]
+
+
+def test_profiles_workbook_layout_matches_old_export():
+    store = ProfileStore.from_parsed(parse_files(build_files()))
+    data = build_profiles_workbook(store)
+
+    assert_same_layout(data, old_profiles_workbook(store))
+    ws = load_workbook(io.BytesIO(data))["PL0_CP"]
+    assert [ws.cell(row=row, column=2).value for row in range(4, 8)] == [f"{day:%d-%m-%Y}" for day in sorted(DAYS)]
+    assert ws.cell(row=3, column=1).font.bold
+
+
+@pytest.mark.parametrize("channel", ["CP", "CO"])
+def test_summary_workbook_layout_matches_old_export(channel):
+    store = ProfileStore.from_parsed(parse_files(build_files()))
+    summary = store.summary(channel)
+
+    assert_same_layout(
+        build_summary_workbook(summary, SUMMARY_TITLES[channel]),
+        old_summary_workbook(summary, SUMMARY_TITLES[channel])
+    )
+
+
+def test_group_name_shared_by_channels_gets_one_sheet_per_channel():
+    files = [
+        (f"PL9_20240401_{channel}_.dat", build_dat_file(random_values(24), "01-04-2024", "PL9", channel))
+        for channel in ("CP", "CO")
+    ]
+    workbook = load_workbook(io.BytesIO(build_profiles_workbook(ProfileStore.from_parsed(parse_files(files)))))
+
+    assert workbook.sheetnames == ["PL9 CP", "PL9 CO"]
+    assert workbook["PL9 CO"].cell(row=1, column=1).value == "Profile plików PTPiREE - PL9 CO"
@@ -0,0 +1,108 @@
+import os
+import numpy as np
+import pytest
+from conftest import build_dat_file, random_values
+from src.ptpiree import parse_dat, parse_dat_batch, parse_files, get_channel, get_group_name
+
+# Pliki .dat w układzie plików operatora: nagłówek, wartości ze znacznikiem statusu i stopka
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "ptpiree")
+
+# Oczekiwana liczba wartości każdego pliku korpusu
+CORPUS_LENGTHS = {
+    "PL0000000000000001_CP_20240301.dat": 96,
+    "PL0000000000000001_CO_20240301.dat": 96,
+    "PL0000000000000001_CPP_20240301.dat": 96,
+    "PL0000000000000002_CP_20240301.dat": 24,
+    "PL0000000000000001_CP_20240331.dat": 92,
+    "PL0000000000000001_CP_20241027.dat": 100,
+    "PL0000000000000003_CP_20240302.dat": 96,
+    "PL0000000000000004_CP_20240302.dat": 92,
+    "PL0000000000000005_CO_20240302.dat": 0,
+}
+
+
+def read_corpus():
+    files = []
+    for name in sorted(os.listdir(CORPUS_DIR)):
+        with open(os.path.join(CORPUS_DIR, name), "rb") as f:
+            files.append((name, f.read()))
+    return files
+
+
+def old_profile(data: bytes):
+    """Odczyt wartości pliku tak jak w pierwotnej stronie kalkulatora (float() dla każdej linii)."""
+    profile = []
+    for line in data.decode("utf-8").split("\n")[6:-2]:
+        try:
+            profile.append(float(line.strip()[:-2]))
+        except ValueError:
+            continue
+    return profile
+
+
+def test_corpus_is_complete():
+    assert sorted(name for name, _ in read_corpus()) == sorted(CORPUS_LENGTHS)
+
+
+@pytest.mark.parametrize("name, data", read_corpus())
+def test_corpus_file_matches_float_per_line(name, data):
+    values = parse_dat(data)
+
+    assert len(values) == CORPUS_LENGTHS[name]
+    np.testing.assert_array_equal(values, np.array(old_profile(data), dtype=np.float64))
+
+
+def test_corpus_batch_matches_single_files():
+    files = read_corpus()
+    parsed = parse_files(files)
+
+    for parsed_file, (name, data) in zip(parsed, files):
+        assert parsed_file.name == name
+        np.testing.assert_array_equal(parsed_file.values, parse_dat(data))
+
+
+def test_corpus_metadata():
+    parsed = {p.name: p for p in parse_files(read_corpus())}
+
+    assert parsed["PL0000000000000001_CPP_20240301.dat"].channel == "CPP"
+    assert parsed["PL0000000000000001_CO_20240301.dat"].group == "PL0000000000000001_CO"
+    assert parsed["PL0000000000000001_CP_20241027.dat"].date == "27-10-2024"
+    assert parsed["PL0000000000000003_CP_20240302.dat"].date == "02-03-2024"
+    assert parsed["PL0000000000000005_CO_20240302.dat"].date is None
+
+
+@pytest.mark.parametrize("lines", [
+    [b"1.5  A", b"   2.25 E", b"3 A", b"1_000 A", b"-0.5 A"],
+    [b"nan A", b"inf A", b"-inf E", b"1e3 A"],
+    [b"1.5 A", b"", b"   ", b"bad A", b"1,5 A", b"A", b"2.5 A"],
+])
+def test_edge_case_lines_match_float_per_line(lines):
+    data = build_dat_file(lines)
+    np.testing.assert_array_equal(parse_dat(data), np.array(old_profile(data), dtype=np.float64))
+
+
+def test_malformed_file_does_not_change_other_files_in_batch():
+    clean = build_dat_file([b"1.5 A", b"2.5 A", b"nan A"])
+    broken = build_dat_file([b"x A", b"3.5 A"])
+    values, offsets = parse_dat_batch([clean, broken, clean])
+
+    np.testing.assert_array_equal(values[offsets[0]:offsets[1]], parse_dat(clean))
+    np.testing.assert_array_equal(values[offsets[1]:offsets[2]], [3.5])
+    np.testing.assert_array_equal(values[offsets[2]:offsets[3]], parse_dat(clean))
+
+
+def test_parse_files_keeps_input_order():
+    files = [(f"PL{i}_CO_20240301.dat", build_dat_file(random_values(24, seed=i), channel="CO")) for i in range(5)]
+
+    assert [p.name for p in parse_files(files)] == [name for name, _ in files]
+
+
+@pytest.mark.parametrize("name, group, channel", [
+    ("PL1_CP_20240301.dat", "PL1_CP", "CP"),
+    ("PL1_CO_20240301.dat", "PL1_CO", "CO"),
+    ("PL1_CPP_20240301.dat", "PL1_CPP", "CPP"),
+    ("PL1_20240301.dat", "PL1", None),
+])
+def test_group_and_channel(name, group, channel):
+    assert get_group_name(name) == group
+    assert get_channel(name) == channel
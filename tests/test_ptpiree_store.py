@@ -0,0 +1,145 @@
+import datetime
+import zlib
+import numpy as np
+import pytest
+from conftest import build_dat_file, random_values
+from src.ptpiree import ProfileStore, expected_hours, matrix_to_hourly, parse_files
+
+# Doby zmiany czasu w 2024 roku: 31 marca (23 godziny) i 27 października (25 godzin)
+SPRING = datetime.date(2024, 3, 31)
+AUTUMN = datetime.date(2024, 10, 27)
+
+
+def day_length(day: datetime.date) -> int:
+    return {SPRING: 92, AUTUMN: 100}.get(day, 96)
+
+
+def build_files(points=3, days=(SPRING, datetime.date(2024, 4, 1), AUTUMN), channels=("CP", "CO", "CPP")):
+    """Pliki kilku punktów i kanałów; punkt PL1 ma profile godzinowe zamiast piętnastominutowych."""
+    files = []
+    for point in range(points):
+        for channel in channels:
+            for day in days:
+                count = day_length(day) // 4 if point == 1 else day_length(day)
+                name = f"PL{point}_{channel}_{day:%Y%m%d}.dat"
+                data = build_dat_file(random_values(count, seed=zlib.crc32(name.encode())), f"{day:%d-%m-%Y}", f"PL{point}", channel)
+                files.append((name, data))
+    return files
+
+
+def old_summary(files, channel):
+    """Tabela zbiorcza kanału obliczana jak w pierwotnej stronie kalkulatora (pętla po plikach)."""
+    selected = [(name, data) for name, data in files if f"_{channel}_" in name and "_CPP_" not in name]
+    groups = {}
+    for name, data in selected:
+        groups.setdefault(name.split("_2")[0], []).append(data)
+    rows = []
+    for group, group_files in groups.items():
+        total, profile, date = 0, [], None
+        for data in group_files:
+            lines = data.decode("utf-8").split("\n")
+            values = []
+            for line in lines[6:-2]:
+                try:
+                    values.append(float(line.strip()[:-2]))
+                except ValueError:
+                    continue
+            if len(values) > 25:
+                values = [sum(values[i:i + 4]) for i in range(0, len(values), 4)]
+            date = lines[4].strip()
+            total += sum(values)
+            profile.extend(values)
+        rows.append((group, date, total, len(group_files), profile))
+    return rows
+
+
+def test_expected_hours_on_dst_days():
+    dates = np.array([SPRING, AUTUMN, datetime.date(2024, 4, 1), "NaT"], dtype="datetime64[D]")
+    np.testing.assert_array_equal(expected_hours(dates), [23, 25, 24, 0])
+
+
+def test_matrix_to_hourly_maps_92_96_100_intervals():
+    lengths = np.array([92, 96, 100, 24])
+    matrix = np.full((4, 100), np.nan)
+    for row, length in enumerate(lengths):
+        matrix[row, :length] = 1.0
+    dates = np.array([SPRING, "2024-04-01", AUTUMN, "2024-04-01"], dtype="datetime64[D]")
+
+    hourly, hours, unmapped = matrix_to_hourly(matrix, lengths, dates)
+
+    np.testing.assert_array_equal(hours, [23, 24, 25, 24])
+    assert not unmapped.any()
+    assert np.nansum(hourly, axis=1).tolist() == [92.0, 96.0, 100.0, 24.0]
+    assert np.isnan(hourly[0, 23:]).all() and np.isnan(hourly[1, 24:]).all()
+
+
+def test_day_length_not_matching_date_is_reported():
+    files = [
+        ("PL0_CP_20240331.dat", build_dat_file(random_values(96), "31-03-2024", "PL0")),
+        ("PL0_CP_20241027.dat", build_dat_file(random_values(25), "27-10-2024", "PL0")),
+        ("PL0_CP_20240401.dat", build_dat_file(random_values(50), "01-04-2024", "PL0"))
+    ]
+    store = ProfileStore.from_parsed(parse_files(files))
+    report = store.unmapped_report()
+
+    assert report["Nazwa pliku"].tolist() == ["PL0_CP_20240331.dat", "PL0_CP_20240401.dat"]
+    assert report["Liczba wartości"].tolist() == [96, 50]
+    assert report["Oczekiwana liczba godzin"].tolist() == [23, 24]
+
+
+@pytest.mark.parametrize("channel", ["CP", "CO"])
+def test_summary_matches_old_loop(channel):
+    files = build_files()
+    store = ProfileStore.from_parsed(parse_files(files))
+    summary = store.summary(channel)
+    expected = old_summary(files, channel)
+
+    assert summary["Lp"].tolist() == list(range(1, len(expected) + 1))
+    assert summary["Nazwa"].tolist() == [group for group, *_ in expected]
+    assert summary["Data"].tolist() == [date for _, date, *_ in expected]
+    np.testing.assert_allclose(summary["Suma"], [total for _, _, total, *_ in expected], rtol=1e-12)
+    assert summary["Pliki"].tolist() == [count for *_, count, _ in expected]
+    for group, *_, profile in expected:
+        np.testing.assert_allclose(store.group_profile(channel, group), profile, rtol=1e-12)
+    assert store.channel_max(channel) == pytest.approx(max(max(profile) for *_, profile in expected))
+
+
+def test_incremental_append_matches_single_batch():
+    files = build_files()
+    parsed = parse_files(files)
+    whole = ProfileStore.from_parsed(parsed)
+    incremental = ProfileStore()
+    for start in range(0, len(parsed), 4):
+        incremental.append(parsed[start:start + 4])
+
+    for channel in ("CP", "CO"):
+        assert incremental.summary(channel).equals(whole.summary(channel))
+    for group, channel in zip(whole.groups, whole.group_channels):
+        np.testing.assert_array_equal(incremental.group_profile(channel, group), whole.group_profile(channel, group))
+
+
+def test_duplicate_content_is_skipped():
+    parsed = parse_files(build_files(points=1, channels=("CP",)))
+    for i, parsed_file in enumerate(parsed):
+        parsed_file.content_hash = str(i)
+    store = ProfileStore()
+
+    assert store.append(parsed) == 3
+    assert store.append(parsed[:2]) == 0
+    assert store.summary("CP")["Pliki"].tolist() == [3]
+
+
+def test_channels_sharing_a_group_name_stay_separate():
+    files = [
+        (f"PL9_2024040{day}_{channel}_.dat", build_dat_file(random_values(24, seed=day), f"0{day}-04-2024", "PL9", channel))
+        for channel in ("CP", "CO") for day in (1, 2)
+    ]
+    parsed = parse_files(files)
+    store = ProfileStore.from_parsed(parsed)
+
+    assert {f.group for f in parsed} == {"PL9"}
+    for channel in ("CP", "CO"):
+        expected = np.concatenate([f.values for f in parsed if f.channel == channel])
+        assert store.summary(channel)[["Nazwa", "Pliki"]].values.tolist() == [["PL9", 2]]
+        assert store.summary(channel)["Suma"].iloc[0] == pytest.approx(expected.sum())
+        np.testing.assert_array_equal(store.group_profile(channel, "PL9"), expected)
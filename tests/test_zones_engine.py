@@ -0,0 +1,69 @@
+from datetime import timedelta
+import numpy as np
+import pandas as pd
+import pytest
+from workalendar.europe import Poland
+from src.core.config import CONFIG
+from src.zones import TARIFS, TARIFS_WITH_HOLIDAYS, create_zone_dataframe, get_tariffs, get_zones_file
+
+
+def old_zone_dataframe(start_date, end_date, zone_name):
+    """Pierwotne create_zone_dataframe ze strony kalkulatora stref (pętla po godzinach i liście świąt)."""
+    df = pd.DataFrame(pd.date_range(start=start_date, end=end_date, freq='h'), columns=['Timestamp'])
+    start_date = pd.to_datetime(start_date)
+    end_date = pd.to_datetime(end_date) + timedelta(days=1)
+    holidays = []
+    for year in range(start_date.year, end_date.year + 1):
+        holidays += Poland().holidays(year)
+    current_date = start_date
+    while current_date <= end_date:
+        if current_date.weekday() == 5:
+            holidays.append((current_date, 'Sobota'))
+        elif current_date.weekday() == 6:
+            holidays.append((current_date, 'Niedziela'))
+        current_date += timedelta(days=1)
+
+    zone_df = pd.read_excel(get_zones_file(), sheet_name=zone_name)
+    zone_data = []
+    for timestamp in df['Timestamp']:
+        zone_value = zone_df.iloc[timestamp.hour - 1, timestamp.month]
+        if zone_name in TARIFS_WITH_HOLIDAYS:
+            for holiday in holidays:
+                if holiday[0] == timestamp.date():
+                    zone_value = "S3"
+                    break
+        zone_data.append(zone_value)
+    df['Zone'] = zone_data
+    return df
+
+
+# Wielkanoc i zmiana czasu na letni oraz Wszystkich Świętych i weekendy wokół
+RANGES = [("2024-03-25", "2024-04-08"), ("2024-10-28", "2024-11-05")]
+
+
+@pytest.mark.parametrize("start_date, end_date", RANGES)
+@pytest.mark.parametrize("zone_name", [TARIFS_WITH_HOLIDAYS[0], TARIFS_WITH_HOLIDAYS[1], TARIFS[1]])
+def test_zones_match_original_loop(start_date, end_date, zone_name):
+    expected = old_zone_dataframe(start_date, end_date, zone_name)
+    result = create_zone_dataframe(start_date, end_date, zone_name, get_tariffs())
+
+    pd.testing.assert_series_equal(result['Timestamp'], expected['Timestamp'])
+    assert result['Zone'].tolist() == expected['Zone'].tolist()
+
+
+def test_weekends_keep_tariff_zones():
+    result = create_zone_dataframe("2024-04-06", "2024-04-07 23:00", TARIFS_WITH_HOLIDAYS[0], get_tariffs())
+
+    assert (result['Zone'] != 'S3').any()
+    assert np.isin(result['Zone'].unique(), ['S1', 'S2', 'S3']).all()
+
+
+def test_weekends_in_s3_when_enabled(monkeypatch):
+    monkeypatch.setitem(CONFIG, "ZONES_WEEKENDS_S3", True)
+    weekend = create_zone_dataframe("2024-04-06", "2024-04-07 23:00", TARIFS_WITH_HOLIDAYS[0], get_tariffs())
+    workday = create_zone_dataframe("2024-04-08", "2024-04-08 23:00", TARIFS_WITH_HOLIDAYS[0], get_tariffs())
+    other = create_zone_dataframe("2024-04-06", "2024-04-07 23:00", TARIFS[1], get_tariffs())
+
+    assert (weekend['Zone'] == 'S3').all()
+    assert (workday['Zone'] != 'S3').any()
+    assert (other['Zone'] != 'S3').any()
@@ -0,0 +1,103 @@
+import io
+import os
+import time
+import numpy as np
+import pytest
+from src.core.config import CONFIG
+from src.zones import load_profiles, read_profile, profile_timestamps, profile_values, extra_hour_value
+from src.zones.reader import prune_cache
+
+# Wiersze arkusza z 40 dniami: nagłówek, etykiety godzin, dni 3-42, stopka 43-45
+FOOTER_ROWS = (43, 44, 45)
+
+
+def page_result(data: bytes):
+    """Wynik wczytania profilu tak jak na stronie kalkulatora (pd.read_excel i prepare_profile)."""
+    profil = read_profile(io.BytesIO(data))
+    timestamps = profile_timestamps(profil)
+    return timestamps, profile_values(timestamps, profil), extra_hour_value(profil)
+
+
+def reader_result(data: bytes):
+    profile = load_profiles(data, cache=False).sheet(0)
+    timestamps = profile.timestamps()
+    return timestamps, profile.hourly_values(timestamps), profile.extra_value
+
+
+@pytest.mark.parametrize("blank_rows", [(), (FOOTER_ROWS[0],), (FOOTER_ROWS[1],), (FOOTER_ROWS[2],)])
+def test_reader_matches_page(profile_workbook, blank_rows):
+    data = profile_workbook(blank_rows=blank_rows)
+    expected_timestamps, expected_values, expected_extra = page_result(data)
+    timestamps, values, extra = reader_result(data)
+
+    assert timestamps.equals(expected_timestamps)
+    np.testing.assert_array_equal(values, expected_values)
+    assert extra == expected_extra
+
+
+def test_blank_footer_row_keeps_last_day(profile_workbook):
+    data = profile_workbook(blank_rows=(FOOTER_ROWS[1],))
+    timestamps, values, _ = reader_result(data)
+
+    last_day = timestamps.normalize() == timestamps[-2].normalize()
+    assert len(timestamps) == 40 * 24 + 1
+    assert not np.isnan(values[last_day & (timestamps.hour > 0)]).any()
+
+
+def test_blank_header_is_reported_as_sheet_error(profile_workbook):
+    workbook = load_profiles(profile_workbook(blank_rows=(1,)), cache=False)
+
+    assert workbook.profiles == {}
+    assert "P,O,B" in workbook.errors["Sheet"]
+
+
+def test_cache_hit_returns_same_profile(profile_workbook, tmp_path):
+    data = profile_workbook()
+    first = load_profiles(data, cache_dir=str(tmp_path))
+    second = load_profiles(data, cache_dir=str(tmp_path))
+
+    assert not first.cached and second.cached
+    assert second.sheet(0).values.equals(first.sheet(0).values)
+    assert second.sheet(0).extra_value == first.sheet(0).extra_value
+
+
+def write_file(path, size, age, now):
+    path.write_bytes(b"x" * size)
+    os.utime(path, (now - age, now - age))
+
+
+def test_prune_cache_removes_old_and_least_recently_used_files(tmp_path):
+    now = time.time()
+    write_file(tmp_path / "new.arrow", 400, 10, now)
+    write_file(tmp_path / "used.arrow", 400, 20, now)
+    write_file(tmp_path / "lru.arrow", 400, 30, now)
+    write_file(tmp_path / "old.arrow", 10, 9 * 24 * 3600, now)
+    write_file(tmp_path / "crashed.arrow.abc.tmp", 10, 8 * 24 * 3600, now)
+    write_file(tmp_path / "other.txt", 10, 9 * 24 * 3600, now)
+
+    removed = prune_cache(str(tmp_path), max_bytes=1000, max_age=7 * 24 * 3600)
+
+    assert sorted(os.path.basename(path) for path in removed) == ["crashed.arrow.abc.tmp", "lru.arrow", "old.arrow"]
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["new.arrow", "other.txt", "used.arrow"]
+
+
+def test_load_profiles_keeps_cache_within_limit(profile_workbook, tmp_path, monkeypatch):
+    monkeypatch.setitem(CONFIG, "ZONES_CACHE_MB", 0)
+    monkeypatch.setitem(CONFIG, "ZONES_CACHE_DAYS", 0)
+    # Zawartość pliku xlsx zawiera czas zapisu, więc każdy plik jest tworzony raz
+    files = [profile_workbook(seed=seed) for seed in range(4)]
+    for data in files[:3]:
+        load_profiles(data, cache_dir=str(tmp_path))
+    assert len(list(tmp_path.iterdir())) == 3
+    # Starsze daty modyfikacji, żeby kolejność użycia nie zależała od rozdzielczości zegara systemu plików
+    now = time.time()
+    for path in tmp_path.iterdir():
+        os.utime(path, (now - 60, now - 60))
+
+    size = max(path.stat().st_size for path in tmp_path.iterdir())
+    monkeypatch.setitem(CONFIG, "ZONES_CACHE_MB", 2 * size / (1024 * 1024))
+    load_profiles(files[0], cache_dir=str(tmp_path))
+    load_profiles(files[3], cache_dir=str(tmp_path))
+
+    assert len(list(tmp_path.iterdir())) == 2
+    assert load_profiles(files[0], cache_dir=str(tmp_path)).cached
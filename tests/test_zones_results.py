@@ -0,0 +1,122 @@
+import io
+from datetime import datetime, timedelta
+import pandas as pd
+import pytest
+from workalendar.europe import Poland
+from conftest import build_profile_workbook
+from src.zones import (
+    TARIFS_WITH_HOLIDAYS, compare_tariffs, extra_hour_value, get_tariffs, get_zones_file, load_profiles,
+    profile_timestamps, profile_values, read_profile, summarize_profiles, zone_breakdown
+)
+
+# Taryfa bez świąt i taryfa, w której święta należą do strefy S3
+TARIFFS = ['ENERGA_B22_C22a', 'TAURON_A23_B23_C23_C13_G13']
+
+
+def old_results(data: bytes, tariff: str) -> dict:
+    """
+    Sumy stref obliczane jak w pierwotnej stronie kalkulatora: pętla po godzinach i wyszukiwanie wartości w profilu.
+
+    Strefę S3 dają tylko święta z kalendarza; soboty i niedziele zachowują strefy z tabeli taryfy.
+    """
+    profil = pd.read_excel(io.BytesIO(data))
+    profil = profil.drop(columns=['P,O,B']).drop(columns=['Unnamed: 27']).transpose()
+    profil.reset_index(drop=True, inplace=True)
+    profil = profil.iloc[:, :-3]
+    profil.columns = profil.iloc[0].tolist()
+    profil = profil[1:]
+    profil.columns = ['Time' if pd.isna(col) else col for col in profil.columns]
+    profil.columns = [f"{col[8:10]}.{col[5:7]}.{col[0:4]}" if len(col) > 10 else col for col in profil.columns.astype(str)]
+
+    zone_df = pd.read_excel(get_zones_file(), sheet_name=tariff)
+    start_date = datetime.strptime(profil.columns[1], '%d.%m.%Y')
+    end_date = datetime.strptime(profil.columns[-1], '%d.%m.%Y') + timedelta(days=1)
+    # Soboty i niedziele pierwotna strona zapisywała jako pd.Timestamp, które nigdy nie były równe datom godzin
+    holidays = []
+    for year in range(start_date.year, end_date.year + 1):
+        holidays += [day for day, _ in Poland().holidays(year)]
+
+    rows = []
+    for timestamp in pd.date_range(start=start_date, end=end_date, freq='h'):
+        zone = zone_df.iloc[timestamp.hour - 1, timestamp.month]
+        if tariff in TARIFS_WITH_HOLIDAYS and timestamp.date() in holidays:
+            zone = "S3"
+        hour = f"{timestamp.hour or 24:02d}:00"
+        try:
+            value = profil.loc[profil['Time'] == hour, f"{timestamp:%d.%m.%Y}"].values[0]
+        except (KeyError, IndexError):
+            value = None
+        rows.append((zone, value))
+    frame = pd.DataFrame(rows, columns=['Zone', 'ECP'])
+    frame['ECP'] = pd.to_numeric(frame['ECP'], errors='coerce')
+
+    extra = profil.iloc[-1].dropna().tolist()[-1]
+    sums = {zone: frame.loc[frame['Zone'] == zone, 'ECP'].sum() for zone in ('S1', 'S2', 'S3')}
+    total = round(frame['ECP'].sum() + extra, 2)
+    holidays_tariff = tariff in TARIFS_WITH_HOLIDAYS
+    s1 = round(sums['S1'], 2)
+    s2 = round(sums['S2'], 2) if holidays_tariff else round(sums['S2'] + extra, 2)
+    s3 = round(sums['S3'] + extra, 2) if holidays_tariff else 0
+    return {
+        'Taryfa': tariff, 'S1': s1, 'S2': s2, 'S3': s3, 'Suma': total,
+        'S1 %': round(s1 / total * 100, 2), 'S2 %': round(s2 / total * 100, 2), 'S3 %': round(s3 / total * 100, 2)
+    }
+
+
+@pytest.fixture(scope="module")
+def expected():
+    data = build_profile_workbook()
+    return data, [old_results(data, tariff) for tariff in TARIFFS]
+
+
+def test_compare_tariffs_matches_old_page(expected):
+    data, results = expected
+    profil = read_profile(io.BytesIO(data))
+    timestamps = profile_timestamps(profil)
+
+    assert compare_tariffs(timestamps, profile_values(timestamps, profil), extra_hour_value(profil), get_tariffs(), TARIFFS) == results
+
+
+def test_batch_results_match_old_page(expected):
+    data, results = expected
+    frame, errors, _ = summarize_profiles([("profil.xlsx", data), ("uszkodzony.xlsx", b"nie xlsx")], get_tariffs(), TARIFFS)
+
+    assert [point for point, _ in errors] == ["uszkodzony.xlsx"]
+    assert frame.drop(columns='Punkt').to_dict('records') == results
+    assert (frame['Punkt'] == "profil.xlsx").all()
+
+
+@pytest.mark.parametrize("freq", ["M", "D"])
+def test_breakdown_adds_up_to_whole_profile(expected, freq):
+    data, results = expected
+    profile = load_profiles(data, cache=False).sheet(0)
+    timestamps = profile.timestamps()
+    breakdown = zone_breakdown(
+        timestamps, profile.hourly_values(timestamps), profile.extra_value, get_tariffs(), TARIFFS, freq,
+        profile.extra_date
+    )
+
+    for result in results:
+        periods = breakdown[breakdown['Taryfa'] == result['Taryfa']]
+        for column in ('S1', 'S2', 'S3', 'Suma'):
+            assert periods[column].sum() == pytest.approx(result[column], abs=0.01 * len(periods))
+    assert breakdown['Okres'].nunique() == (2 if freq == "M" else 40)
+
+
+def test_batch_breakdowns_match_single_profile(expected):
+    data, _ = expected
+    profile = load_profiles(data, cache=False).sheet(0)
+    timestamps = profile.timestamps()
+    _, errors, breakdowns = summarize_profiles(
+        [("profil.xlsx", data), ("uszkodzony.xlsx", b"nie xlsx")], get_tariffs(), TARIFFS, freqs=["M", "D", "M"]
+    )
+
+    assert [point for point, _ in errors] == ["uszkodzony.xlsx"]
+    assert list(breakdowns) == ["M", "D"]
+    for freq, breakdown in breakdowns.items():
+        single = zone_breakdown(
+            timestamps, profile.hourly_values(timestamps), profile.extra_value, get_tariffs(), TARIFFS, freq,
+            profile.extra_date
+        )
+        assert (breakdown['Punkt'] == "profil.xlsx").all()
+        pd.testing.assert_frame_equal(breakdown.drop(columns='Punkt'), single)